@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+
+##########################################################################################
+#
+#  bench_issue_memory.py - memory retained per JiraIssue instance
+#
+#    before : the former layout, each issue holding its own references to the proxy and
+#             field information, its own std_display_for_sys and special dicts, an
+#             updated_keys list and its own copy of every status, priority, user name, etc.
+#    after  : slotted JiraIssue instances referencing a shared per project and issue type
+#             descriptor, repeated names and values interned
+#
+#  Runs offline against synthetic metadata and search pages, usage:
+#      python benchmarks/bench_issue_memory.py [issue_count]
+#
+##########################################################################################
+
+import sys, os
+import gc
+import json
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from jirpa import jiraissue
+from jirpa.jiraissue    import JiraIssue
+from jirpa.fieldcatalog import FieldCatalog
+from jirpa.mutelogger   import MuteLogger
+
+##########################################################################################
+
+STANDARD = [('Summary', 'summary', 'string'), ('Description', 'description', 'string'),
+            ('Issue Type', 'issuetype', 'issuetype'), ('Priority', 'priority', 'priority'),
+            ('Assignee', 'assignee', 'user'), ('Reporter', 'reporter', 'user'),
+            ('Labels', 'labels', 'array'), ('Fix Version/s', 'fixVersions', 'array'),
+            ('Component/s', 'components', 'array')]
+CUSTOM_COUNT = 40
+PAGE_SIZE    = 100
+
+def field_info():
+    standard_fields = {name : {'create' : {'name' : name, 'schema' : {'type' : kind, 'system' : system}}}
+                       for name, system, kind in STANDARD}
+    custom_fields = {f'Custom {cf}' : {'create' : {'name' : f'Custom {cf}',
+                                                   'schema' : {'type' : 'option', 'customId' : 10100 + cf,
+                                                               'custom' : 'select'}}}
+                     for cf in range(CUSTOM_COUNT)}
+    return standard_fields, custom_fields
+
+
+class StandInVersion:
+    version = '8.5.0'
+
+
+class StandInProxy:
+    """
+        supplies what JiraIssue takes from a JiraProxy
+    """
+    def __init__(self):
+        self.jira_version           = StandInVersion()
+        self.logger                 = MuteLogger()
+        self.issue_type_id_for_name = {'Story' : '10001'}
+        self.priority_value_for_id  = {'3' : 'Medium'}
+        self.catalog = FieldCatalog(*field_info())
+
+    def fieldCatalog(self, project_key, issue_type):
+        return self.catalog
+
+
+def synthetic_issue(ix):
+    fields = {"summary"     : f"Synthetic issue number {ix}",
+              "description" : f"Description of synthetic issue {ix}",
+              "issuetype"   : {"id" : "10001", "name" : "Story"},
+              "status"      : {"id" : str(ix % 4), "name" : ["Open", "In Progress", "Review", "Done"][ix % 4]},
+              "priority"    : {"id" : "3", "name" : "Medium"},
+              "assignee"    : {"name" : f"user{ix % 17}", "displayName" : f"User {ix % 17}"},
+              "reporter"    : {"name" : "reporter", "displayName" : "Reporter Person"},
+              "created"     : "2021-03-04T10:22:33.000-0700",
+              "updated"     : "2021-03-05T11:22:33.000-0700",
+              "labels"      : ["alpha", "beta"],
+              "fixVersions" : [{"id" : "100", "name" : "1.0"}],
+              "components"  : [{"id" : "200", "name" : "Front End"}],
+             }
+    for cf in range(CUSTOM_COUNT):
+        fields[f"customfield_{10100 + cf}"] = None if cf % 3 else {"id" : str(cf), "value" : f"option {cf % 5}"}
+    return {"id" : str(100000 + ix), "key" : f"BENCH-{ix}", "fields" : fields}
+
+
+def search_pages(issue_count):
+    """
+        the json text of each page of issues, as it arrives from Jira
+    """
+    return [json.dumps([synthetic_issue(ix) for ix in range(start, min(start + PAGE_SIZE, issue_count))])
+            for start in range(0, issue_count, PAGE_SIZE)]
+
+
+class LegacyIssue:
+    """
+        an issue laid out as JiraIssue instances used to be, the attribute values are
+        the same but each instance holds its own copies in its __dict__
+    """
+    def __init__(self, jira_item, proxy):
+        interned, jiraissue.interned = jiraissue.interned, (lambda value: value)
+        try:
+            issue = JiraIssue(jira_item, proxy)
+        finally:
+            jiraissue.interned = interned
+        catalog = proxy.fieldCatalog('BENCH', 'Story')
+        self.__dict__.update(
+            attribute             = issue.attribute,
+            updated_keys          = [],
+            version               = proxy.jira_version.version,
+            id                    = jira_item['id'],
+            key                   = jira_item['key'],
+            project_key           = jira_item['key'].split('-')[0],
+            issue_type            = jira_item['fields']['issuetype']['name'],
+            issue_type_id         = proxy.issue_type_id_for_name['Story'],
+            logger                = proxy.logger,
+            standard_fields       = catalog.standard_fields,
+            custom_fields         = catalog.custom_fields,
+            standard_field_names  = catalog.standard_field_names,
+            custom_field_names    = catalog.custom_field_names,
+            std_display_for_sys   = dict(catalog.std_display_for_sys),
+            priority_value_for_id = proxy.priority_value_for_id,
+            special               = dict(jiraissue.SPECIAL_FIELDS))
+
+
+def retained_per_issue(issue_class, pages, proxy):
+    """
+        memory still in use once every page has been decoded into issues
+        and the decoded pages have been let go
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    issues = []
+    for page in pages:
+        issues.extend(issue_class(item, proxy) for item in json.loads(page))
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return retained / len(issues)
+
+##########################################################################################
+
+def main(args):
+    issue_count = int(args[0]) if args else 5000
+    proxy = StandInProxy()
+    pages = search_pages(issue_count)
+    JiraIssue(json.loads(pages[0])[0], proxy)   # the shared descriptor isn't part of any one issue's cost
+    print(f'{issue_count} issues in pages of {PAGE_SIZE}, {len(synthetic_issue(0)["fields"])} fields each\n')
+
+    before = retained_per_issue(LegacyIssue, pages, proxy)
+    after  = retained_per_issue(JiraIssue,   pages, proxy)
+    print(f'{"layout":<10} {"bytes/issue":>12} {"saved":>8}')
+    print(f'{"before":<10} {before:>12.0f} {"":>8}')
+    print(f'{"after":<10} {after:>12.0f} {(1 - after / before) * 100:>7.0f}%')
+
+##########################################################################################
+##########################################################################################
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+##########################################################################################
+#
+#  bench_json_pipeline.py - CPU cost of turning one JQL search page into Python data
+#
+#    before : response.json() + json.dumps(..., indent=4) in executeRequest and
+#             another response.json() in parseResponse
+#    after  : a single JiraComm.decodeResponse with each available json codec
+#
+#  Runs offline against a synthetic page of issues, usage:
+#      python benchmarks/bench_json_pipeline.py [issues_per_page] [rounds]
+#
+##########################################################################################
+
+import sys, os
+import json
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import requests
+
+from jirpa.jsoncodec import JSON_CODECS
+
+##########################################################################################
+
+def synthetic_issue(ix):
+    fields = {"summary"     : f"Synthetic issue number {ix} with a reasonably long summary",
+              "description" : "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20,
+              "issuetype"   : {"id" : "10001", "name" : "Story", "subtask" : False,
+                               "self" : "https://jira.example.com/rest/api/2/issuetype/10001"},
+              "project"     : {"id" : "10000", "key" : "BENCH", "name" : "Benchmark"},
+              "status"      : {"id" : "3", "name" : "In Progress",
+                               "statusCategory" : {"id" : 4, "key" : "indeterminate"}},
+              "priority"    : {"id" : "3", "name" : "Medium"},
+              "assignee"    : {"name" : f"user{ix % 17}", "displayName" : f"User {ix % 17}",
+                               "emailAddress" : f"user{ix % 17}@example.com", "active" : True},
+              "reporter"    : {"name" : "reporter", "displayName" : "Reporter Person", "active" : True},
+              "created"     : "2021-03-04T10:22:33.000-0700",
+              "updated"     : "2021-03-05T11:22:33.000-0700",
+              "labels"      : ["alpha", "beta", "gamma"],
+              "fixVersions" : [{"id" : "100", "name" : "1.0"}, {"id" : "101", "name" : "1.1"}],
+              "components"  : [{"id" : "200", "name" : "Front End"}],
+             }
+    for cf in range(40):
+        fields[f"customfield_{10100 + cf}"] = None if cf % 3 else {"id" : str(cf), "value" : f"option {cf}"}
+    return {"id" : str(100000 + ix), "key" : f"BENCH-{ix}",
+            "self" : f"https://jira.example.com/rest/api/2/issue/{100000 + ix}",
+            "fields" : fields}
+
+
+def synthetic_response(issue_count):
+    page = {"startAt" : 0, "maxResults" : issue_count, "total" : issue_count,
+            "issues" : [synthetic_issue(ix) for ix in range(issue_count)]}
+    response = requests.models.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = 'application/json;charset=UTF-8'
+    response._content = json.dumps(page).encode('UTF-8')
+    return response
+
+
+def before(response):
+    payload = json.dumps(response.json(), indent=4)   # what executeRequest used to do
+    return response.json()                            # what parseResponse used to do
+
+
+def timed(func, rounds):
+    start = time.process_time()
+    for _ in range(rounds):
+        func()
+    return (time.process_time() - start) / rounds
+
+##########################################################################################
+
+def main(args):
+    issue_count = int(args[0]) if args else 1000
+    rounds      = int(args[1]) if len(args) > 1 else 5
+    response = synthetic_response(issue_count)
+    print(f'search page of {issue_count} issues, {len(response.content) / 1024 / 1024:.1f} MB of JSON, '
+          f'{rounds} rounds\n')
+
+    baseline = timed(lambda: before(response), rounds)
+    print(f'{"pipeline":<28} {"CPU ms/page":>12} {"saved":>8}')
+    print(f'{"before (3 passes)":<28} {baseline * 1000:>12.1f} {"":>8}')
+    for name, codec_class in JSON_CODECS.items():
+        try:
+            codec = codec_class()
+        except ImportError:
+            print(f'{"after, " + name:<28} {"not installed":>12}')
+            continue
+        cost = timed(lambda: codec.loads(response.content), rounds)
+        print(f'{"after, " + name:<28} {cost * 1000:>12.1f} {(1 - cost / baseline) * 100:>7.0f}%')
+
+##########################################################################################
+##########################################################################################
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+
+##########################################################################################
+#
+#  bench_result_modes.py - issues per second turned into search results in each result mode
+#
+#    issues       : JiraProxy.makeIssueInstances (JiraIssue instances)
+#    issues, lazy : the same with the lazy_issues config item
+#    rows         : tuples of a few named fields, no JiraIssue and no createmeta / editmeta
+#    raw          : the issue dicts as decoded from the search response
+#
+#  Runs offline, the JiraProxy is given synthetic metadata instead of contacting Jira, usage:
+#      python benchmarks/bench_result_modes.py [issue_count] [rounds]
+#
+##########################################################################################
+
+import sys, os
+import json
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from jirpa import JiraProxy
+from jirpa.mutelogger import MuteLogger
+
+##########################################################################################
+
+STANDARD = [('Summary', 'summary', 'string'), ('Description', 'description', 'string'),
+            ('Issue Type', 'issuetype', 'issuetype'), ('Priority', 'priority', 'priority'),
+            ('Assignee', 'assignee', 'user'), ('Reporter', 'reporter', 'user'),
+            ('Labels', 'labels', 'array'), ('Fix Version/s', 'fixVersions', 'array'),
+            ('Component/s', 'components', 'array')]
+CUSTOM_COUNT = 40
+ROW_FIELDS   = ['key', 'Summary', 'Status', 'Assignee', 'Custom 0']
+
+class StandInVersion:
+    version = '8.5.0'
+
+
+def offline_proxy():
+    """
+        a JiraProxy holding the metadata for project BENCH, issue type Story,
+        made without the connection and bootstrap requests of JiraProxy.__init__
+    """
+    standard_fields = {name : {mode : {'name' : name, 'schema' : {'type' : kind, 'system' : system}}
+                               for mode in ['create', 'edit']}
+                       for name, system, kind in STANDARD}
+    custom_fields = {f'Custom {cf}' : {mode : {'name' : f'Custom {cf}',
+                                               'schema' : {'type' : 'option', 'customId' : 10100 + cf,
+                                                           'custom' : 'select'}}
+                                       for mode in ['create', 'edit']}
+                     for cf in range(CUSTOM_COUNT)}
+    field_ids_for_name = {name : [system] for name, system, kind in STANDARD}
+    field_ids_for_name['Status'] = ['status']
+    field_ids_for_name.update({f'Custom {cf}' : [f'customfield_{10100 + cf}'] for cf in range(CUSTOM_COUNT)})
+
+    proxy = JiraProxy.__new__(JiraProxy)
+    proxy.__dict__.update(logger=MuteLogger(), jira_version=StandInVersion(),
+                          standard_fields={'BENCH' : {'Story' : standard_fields}},
+                          custom_fields={'BENCH' : {'Story' : custom_fields}},
+                          field_catalogs={}, field_ids_for_name=field_ids_for_name,
+                          issue_type_id_for_name={'Story' : '10001'}, priority_value_for_id={'3' : 'Medium'},
+                          mirror=None, lazy_issues=False)
+    return proxy
+
+
+def synthetic_issue(ix):
+    fields = {"summary"     : f"Synthetic issue number {ix}",
+              "description" : "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 10,
+              "issuetype"   : {"id" : "10001", "name" : "Story"},
+              "status"      : {"id" : str(ix % 4), "name" : ["Open", "In Progress", "Review", "Done"][ix % 4]},
+              "priority"    : {"id" : "3", "name" : "Medium"},
+              "assignee"    : {"name" : f"user{ix % 17}", "displayName" : f"User {ix % 17}"},
+              "reporter"    : {"name" : "reporter", "displayName" : "Reporter Person"},
+              "created"     : "2021-03-04T10:22:33.000-0700",
+              "updated"     : "2021-03-05T11:22:33.000-0700",
+              "labels"      : ["alpha", "beta"],
+              "fixVersions" : [{"id" : "100", "name" : "1.0"}],
+              "components"  : [{"id" : "200", "name" : "Front End"}],
+             }
+    for cf in range(CUSTOM_COUNT):
+        fields[f"customfield_{10100 + cf}"] = None if cf % 3 else {"id" : str(cf), "value" : f"option {cf % 5}"}
+    return {"id" : str(100000 + ix), "key" : f"BENCH-{ix}", "fields" : fields}
+
+
+def throughput(func, items, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(items)
+    return len(items) * rounds / (time.perf_counter() - start)
+
+##########################################################################################
+
+def main(args):
+    issue_count = int(args[0]) if args else 5000
+    rounds      = int(args[1]) if len(args) > 1 else 3
+    items = json.loads(json.dumps([synthetic_issue(ix) for ix in range(issue_count)]))
+    proxy = offline_proxy()
+    fields_value, rows = proxy._resultMaker('rows', ROW_FIELDS)
+    lazy_proxy = offline_proxy()
+    lazy_proxy.lazy_issues = True
+
+    modes = [('issues',       proxy.makeIssueInstances),
+             ('issues, lazy', lazy_proxy.makeIssueInstances),
+             ('rows',         rows),
+             ('raw',          lambda items: list(items)),
+            ]
+    print(f'{issue_count} issues, {len(items[0]["fields"])} fields each, rows of {ROW_FIELDS}, '
+          f'{rounds} rounds\n')
+    print(f'{"result mode":<14} {"issues/sec":>12} {"vs issues":>10}')
+    baseline = None
+    for name, func in modes:
+        rate = throughput(func, items, rounds)
+        baseline = baseline or rate
+        print(f'{name:<14} {rate:>12,.0f} {rate / baseline:>9.1f}x')
+
+##########################################################################################
+##########################################################################################
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
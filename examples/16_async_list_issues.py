@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# Copyright 2021 Broadcom. All Rights Reserved.
+
+##########################################################################################
+#
+#  16_async_list_issues.py - retrieve issues with AsyncJiraProxy from an asyncio event loop
+#
+##########################################################################################
+
+import sys
+import asyncio
+
+from jirpa  import AsyncJiraProxy, JiraProxyError
+
+##########################################################################################
+
+SERVER_INSTANCE   = "http://10.23.22.11:8080"
+
+JIRA_REGULAR_USER_CONFIG = \
+    {
+     'user'            :  "testuser",
+     'password'        :  "jiradev",
+     'url'             :  SERVER_INSTANCE,
+     'max_concurrency' :  50
+    }
+
+SIMPLE_PROJECT_QUERY = "project = JEST ORDER BY key ASC"
+
+##########################################################################################
+
+async def list_issues():
+    async with await AsyncJiraProxy.connect(JIRA_REGULAR_USER_CONFIG) as jira:
+        issues = await jira.getIssuesWithJql(SIMPLE_PROJECT_QUERY)
+        print(f'{"Index":<5} : {"Issue Key":<10} : {"Type":<8} : {"Summary"}')
+        print("-" * 60)
+        for ix, issue in enumerate(issues[:10]):
+            print(f' {ix+1:>4} : {issue.key:<10} : {issue.issue_type:<8} : {issue.Summary}')
+
+        # all of these are in flight at the same time
+        keys = [issue.key for issue in issues[:25]]
+        transitions = await asyncio.gather(*[jira.getTransitions(key) for key in keys])
+        for key, trans in zip(keys, transitions):
+            print(f'{key:<10} : {", ".join(trans.keys())}')
+
+def main(args):
+    try:
+        asyncio.run(list_issues())
+    except JiraProxyError as exc:
+        print(f'Error while attempting to retrieve Jira issues: {exc.args[0]}')
+        sys.exit(2)
+
+##########################################################################################
+##########################################################################################
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+    sys.exit(0)
@@ -25,6 +25,8 @@ JIRA_REGULAR_USER_CONFIG = \
 PROJECT_KEY           = 'AGL'
 TARGET_AGILE_BOARD    = 'AGL board' # has
 TARGET_AGILE_BOARD_ID = 1
+TARGET_SPRINT         = 'AGL Sprint 1'
+SPRINT_ISSUE_FIELDS   = ['Summary', 'Status', 'Assignee']
 
 
 """
@@ -165,18 +167,14 @@ STATUS 404Returned if the board does not exist or the user does not have permiss
 def main(args):
     jira = JiraProxy(JIRA_REGULAR_USER_CONFIG)
 
-    boards = jira.getSprintIssues(board, sprint)
+    issues = jira.getSprintIssues(PROJECT_KEY, TARGET_AGILE_BOARD, TARGET_SPRINT,
+                                  fields=SPRINT_ISSUE_FIELDS)
     print("\n")
-    print(f'{"BoardID":>7} {"Board Name":<24} {"Type":<5}  Board URL')
+    print(f'{"Key":<10} {"Status":<12} {"Assignee":<16}  Summary')
 
-    for board in boards:
-        print(f'{board.id:>7} {board.name:<24.24} {board.type:<5}  {board.url}')
-
-    print(f"\n\n Boards for a specific project: {PROJECT_KEY} ....\n")
-    boards = jira.getAgileBoards(PROJECT_KEY)
-    print(f'{"BoardID":>7} {"Board Name":<24} {"Type":<5}  Board URL')
-    for board in boards:
-        print(f'{board.id:>7} {board.name:<24.24} {board.type:<5}  {board.url}')
+    for issue in issues:
+        assignee = issue.Assignee or ""
+        print(f'{issue.key:<10} {issue.Status:<12.12} {assignee:<16.16}  {issue.Summary}')
 
 ##########################################################################################
 ##########################################################################################
@@ -5,3 +5,6 @@ from .jiracomm  import JiraComm, JiraCommError
 from .jiraproxy import JiraProxy, JiraProxyError
 from .entities  import JiraFieldSchema, JiraUser
 from .jiraissue import JiraIssue, JiraIssueError
+from .asyncjira import AsyncJiraComm, AsyncJiraProxy
+from .deltasync import DeltaSync, DeltaSyncError
+from .issueframe import IssueFrame, IssueFrameError
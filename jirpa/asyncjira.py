@@ -0,0 +1,284 @@
+# asyncjira file for jirpa package
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from .mutelogger import MuteLogger
+from .jiracomm   import JiraComm
+from .jiraproxy  import JiraProxy, JiraProxyError
+from .entities   import JiraAttachmentMeta, JiraAgileBoard, JiraAgileSprint
+
+###################################################################################
+
+DEFAULT_MAX_CONCURRENCY = 32
+
+def asyncConfig(config):
+    """
+        size the JiraComm connection pool to match the number of requests that
+        can be in flight, unless pool_maxsize has been explicitly configured
+    """
+    config = dict(config)
+    config.setdefault('pool_maxsize', int(config.get('max_concurrency', DEFAULT_MAX_CONCURRENCY)))
+    return config
+
+class AsyncJiraComm:
+    """
+        asyncio flavored front end to a JiraComm instance.
+        Every request is driven through the JiraComm transport (so auth, proxies,
+        timeouts and response parsing are identical to the blocking client) on a
+        bounded executor, letting many requests be in flight from a single event loop.
+        Each request method is a coroutine returning the usual (status, result, errors).
+        This is not an asynchronous transport: each request in flight occupies an
+        executor thread for its duration, so no more than max_concurrency (default 32)
+        requests are ever in flight at once and the rest wait for a thread.
+    """
+    def __init__(self, config, jira_comm=None, executor=None):
+        self.max_concurrency = int(config.get('max_concurrency', DEFAULT_MAX_CONCURRENCY))
+        self.logger    = config.get('logger', MuteLogger())
+        self.jira_comm = jira_comm if jira_comm else JiraComm(asyncConfig(config))
+        self.executor  = executor
+        self._owns_executor = False
+        if not self.executor:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                               thread_name_prefix='jirpa-async')
+            self._owns_executor = True
+
+    @classmethod
+    async def connect(cls, config):
+        """
+            construct an instance without blocking the event loop on the initial 'user' probe
+        """
+        loop = asyncio.get_running_loop()
+        jira_comm = await loop.run_in_executor(None, JiraComm, asyncConfig(config))
+        return cls(config, jira_comm=jira_comm)
+
+    def __getattr__(self, name):
+        # url, user, on_demand, jira_url_prefix, etc come straight from the wrapped JiraComm,
+        # before it is in place (eg., while copying or unpickling) there is nothing to pass on to
+        if 'jira_comm' not in self.__dict__:
+            raise AttributeError(f"'AsyncJiraComm' object has no attribute '{name}'")
+        return getattr(self.__dict__['jira_comm'], name)
+
+    async def run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def executeRequest(self, method, target, payload=None, extra_headers=None, **option):
+        return await self.run(self.jira_comm.executeRequest, method, target,
+                              payload=payload, extra_headers=extra_headers, **option)
+
+    async def getRequest(self, target, **option):
+        return await self.run(self.jira_comm.getRequest, target, **option)
+
+    async def postRequest(self, target, data, extra_headers=None):
+        return await self.run(self.jira_comm.postRequest, target, data, extra_headers=extra_headers)
+
+    async def putRequest(self, target, data, extra_headers=None):
+        return await self.run(self.jira_comm.putRequest, target, data, extra_headers=extra_headers)
+
+    async def deleteRequest(self, target, **option):
+        return await self.run(self.jira_comm.deleteRequest, target, **option)
+
+    async def getAttachment(self, att_info):
+        return await self.run(self.jira_comm.getAttachment, att_info)
+
+    async def downloadAttachment(self, att_info, destination, chunk_size=None, checksum=None):
+        return await self.run(self.jira_comm.downloadAttachment, att_info, destination,
+                              chunk_size=chunk_size, checksum=checksum)
+
+    async def postAttachment(self, issue_key, att_info):
+        return await self.run(self.jira_comm.postAttachment, issue_key, att_info)
+
+    def close(self):
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+        self.jira_comm.conn.close()
+
+###################################################################################
+
+class AsyncJiraProxy:
+    """
+        Coroutine counterpart of JiraProxy.
+        The project / issue type metadata, the reference tables (issue types, statuses,
+        priorities, resolutions) and JiraIssue construction all come from an ordinary
+        JiraProxy instance held in self.proxy, so issues obtained here are the same
+        JiraIssue instances the blocking JiraProxy produces.
+    """
+    def __init__(self, config={}, jira_proxy=None):
+        self.proxy     = jira_proxy if jira_proxy else JiraProxy(asyncConfig(config))
+        self.logger    = self.proxy.logger
+        self.jira_comm = AsyncJiraComm(config, jira_comm=self.proxy.jira_comm)
+
+    @classmethod
+    async def connect(cls, config={}):
+        """
+            construct an instance with the JiraProxy bootstrap round trips run off the event loop
+        """
+        loop = asyncio.get_running_loop()
+        jira_proxy = await loop.run_in_executor(None, JiraProxy, asyncConfig(config))
+        return cls(config, jira_proxy=jira_proxy)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+    def close(self):
+        self.jira_comm.close()
+
+    async def _makeIssues(self, jira_items):
+        # metadata retrieval (createmeta/editmeta) may happen in here, so keep it off the loop
+        return await self.jira_comm.run(self.proxy.makeIssueInstances, jira_items)
+
+    async def _results(self, make, jira_items):
+        if make is None:
+            return jira_items
+        return await self.jira_comm.run(make, jira_items)
+
+    async def getIssue(self, issue_key, fields=None):
+        endpoint = f'issue/{issue_key}'
+        options = {}
+        if fields is not None:
+            options['fields'] = await self.jira_comm.run(self.proxy.projectFields, fields)
+        status, jira_item, errors = await self.jira_comm.getRequest(endpoint, **options)
+        self.logger.debug(f"getIssue({issue_key}) returned status of {status}")
+        if errors:
+            self.logger.error(f'getIssue({issue_key}) returned {errors}')
+            raise JiraProxyError(errors)
+
+        jira_issue = None
+        if 200 <= status <= 299:
+            jira_issues = await self._makeIssues([jira_item])
+            jira_issue = jira_issues[0]
+        return jira_issue
+
+    async def getIssues(self, issue_keys, fields=None):
+        """
+            convenience method to obtain a number of issues concurrently,
+            result is a list of JiraIssue instances in the same order as issue_keys
+        """
+        if fields is not None:
+            fields = await self.jira_comm.run(self.proxy.projectFields, fields)
+        return list(await asyncio.gather(*[self.getIssue(key, fields) for key in issue_keys]))
+
+    async def getIssuesWithJql(self, jql_query, fields=None, start_at=0, limit=1000, params=None,
+                                     result='issues'):
+        """
+            After the first page comes back the remaining pages (up to limit)
+            are all requested concurrently, issues are returned in result order.
+            result is one of 'issues', 'raw' or 'rows' as for JiraProxy.getIssuesWithJql
+        """
+        search_options, make = await self.jira_comm.run(self.proxy.searchSetup, jql_query, fields,
+                                                        start_at, params, result)
+
+        async def page(offset, remaining):
+            # GET or POST (per the search_method config item) as for JiraProxy
+            options = self.proxy.pageOptions(search_options, offset, remaining)
+            return await self.jira_comm.run(self.proxy.searchPage, options)
+
+        first = await page(start_at, limit)
+        page_size = first["maxResults"] or len(first["issues"]) or 1
+        end = min(first["total"], start_at + limit)
+        others = await asyncio.gather(*[page(offset, end - offset)
+                                        for offset in range(start_at + page_size, end, page_size)])
+        jira_items = []
+        for found in [first] + list(others):
+            jira_items.extend(found["issues"])
+        return await self._results(make, jira_items)
+
+    async def createIssue(self, project, issue_type, work_item):
+        # the project and issue type lookups may fetch reference tables (lazy bootstrap)
+        project_key, postable_issue_data = await self.jira_comm.run(self.proxy.prepareCreate,
+                                                                    project, issue_type, work_item)
+        status, issue, errors = await self.jira_comm.postRequest("issue", postable_issue_data)
+        return self.proxy.createdIssueKey(project_key, issue_type, issue, errors)
+
+    async def updateIssue(self, issue):
+        putable_data = await self.jira_comm.run(self.proxy.prepareUpdate, issue)
+        if putable_data is None:
+            return True
+        status, result, errors = await self.jira_comm.putRequest(f"issue/{issue.key}", putable_data)
+        self.proxy.completeUpdate(issue, putable_data, errors)
+        return True
+
+    async def deleteIssue(self, issue_key):
+        options = {'deleteSubtasks' :  True}
+        status, result, errors = await self.jira_comm.deleteRequest(f"issue/{issue_key}", **options)
+        if errors:
+            problem = f'Error deleting issue {issue_key} : {errors}'
+            raise JiraProxyError(problem)
+        return True
+
+    async def getTransitions(self, issue_key):
+        endpoint = f'issue/{issue_key}/transitions'
+        status, result, errors = await self.jira_comm.getRequest(endpoint)
+        if errors:
+            raise JiraProxyError(errors)
+        return self.proxy.transitionMap(result)
+
+    async def getIssueAttachmentsInfo(self, issue_key):
+        options = {"fields" :  "attachment"}
+        endpoint = f'issue/{issue_key}'
+        status, result, errors = await self.jira_comm.getRequest(endpoint, **options)
+        if errors:
+            raise JiraProxyError(errors)
+        return [JiraAttachmentMeta(att) for att in result["fields"]["attachment"]]
+
+    async def getAttachmentContent(self, att_info):
+        status, attachment_content, errors = await self.jira_comm.getAttachment(att_info)
+        if errors:
+            raise JiraProxyError(errors)
+        return attachment_content
+
+    async def downloadAttachment(self, att_info, destination, chunk_size=None, checksum=None):
+        status, info, errors = await self.jira_comm.downloadAttachment(att_info, destination,
+                                                                       chunk_size=chunk_size,
+                                                                       checksum=checksum)
+        if errors:
+            raise JiraProxyError(errors)
+        return info
+
+    async def addAttachmentsToIssue(self, issue_key, attachments):
+        """
+            same contract as JiraProxy.addAttachmentsToIssue, the uploads are done concurrently
+        """
+        status, info, errors = await self.jira_comm.getRequest('attachment/meta')
+        size_limit = self.proxy.attachmentSizeLimit(info)
+
+        async def upload(att_info):
+            # sizing a file_path or file_object touches the file system, keep it off the loop
+            upload_info, outcome = await self.jira_comm.run(self.proxy.prepareAttachment,
+                                                            att_info, size_limit)
+            if upload_info:
+                status, info, errors = await self.jira_comm.postAttachment(issue_key, upload_info)
+                outcome = self.proxy.attachmentOutcome(errors)
+            return att_info['filename'], outcome
+
+        outcomes = await asyncio.gather(*[upload(att_info) for att_info in attachments])
+        return dict(outcomes)
+
+    async def getAgileBoards(self, project_identifier=None):
+        endpoint = self.jira_comm.url + '/rest/agile/1.0/board'
+        option = {'verbatim_url' : True}
+        if project_identifier:
+            option['projectKeyOrId'] = project_identifier
+        status, response, errors = await self.jira_comm.getRequest(endpoint, **option)
+        if errors:
+            raise JiraProxyError(errors)
+        return [JiraAgileBoard(info) for info in response['values']]
+
+    async def getAgileSprints(self, project_identifier, target_board):
+        boards = await self.getAgileBoards(project_identifier)
+        hits = [board.id for board in boards if board.name == target_board ]
+        if not hits:
+            return []
+        boardId = hits[0]
+
+        endpoint = self.jira_comm.url + f'/rest/agile/1.0/board/{boardId}/sprint'
+        option = {'verbatim_url' : True}
+        status, response, errors = await self.jira_comm.getRequest(endpoint, **option)
+        if errors:
+            raise JiraProxyError(errors)
+        return [JiraAgileSprint(info) for info in response['values']]
@@ -0,0 +1,211 @@
+# deltasync file for jirpa package
+
+import os
+import json
+import math
+import time
+import threading
+from datetime import datetime, timedelta
+
+###################################################################################
+
+class DeltaSyncError(Exception): pass
+
+JIRA_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'   # eg., 2021-03-04T15:16:17.000+0000
+
+SYNC_FIELDS = ['created', 'updated']   # always obtained, the watermark is based on them
+
+def parseJiraTimestamp(value):
+    try:
+        return datetime.strptime(value, JIRA_TIMESTAMP_FORMAT)
+    except (TypeError, ValueError):
+        raise DeltaSyncError(f'Unrecognized Jira timestamp: |{value}|')
+
+
+class Watermark:
+    """
+        The most recent updated timestamp seen and the keys of the issues having
+        exactly that timestamp, an issue is new to a sync when it was updated after
+        the timestamp or at the timestamp but isn't one of the keys.
+    """
+    def __init__(self, updated=None, keys=None):
+        self.updated = updated          # Jira timestamp string, None before the first sync
+        self.keys    = sorted(keys or [])
+
+    def isChange(self, updated, key):
+        if self.updated is None:
+            return True
+        updated_at, watermark_at = parseJiraTimestamp(updated), parseJiraTimestamp(self.updated)
+        return updated_at > watermark_at or (updated_at == watermark_at and key not in self.keys)
+
+    def advance(self, changes):
+        """
+            a new Watermark covering this one and changes, a list of (updated, key) tuples
+        """
+        updated, keys = self.updated, set(self.keys)
+        latest = parseJiraTimestamp(updated) if updated else None
+        for change_updated, key in changes:
+            change_at = parseJiraTimestamp(change_updated)
+            if latest is None or change_at > latest:
+                updated, latest, keys = change_updated, change_at, {key}
+            elif change_at == latest:
+                keys.add(key)
+        return Watermark(updated, keys)
+
+    def toDict(self):
+        return {'updated' : self.updated, 'keys' : self.keys}
+
+    @classmethod
+    def fromDict(cls, info):
+        return cls(info.get('updated'), info.get('keys'))
+
+    def __eq__(self, other):
+        return isinstance(other, Watermark) and self.toDict() == other.toDict()
+
+    def __repr__(self):
+        return f'Watermark({self.updated!r}, {self.keys!r})'
+
+
+class WatermarkStore:
+    """
+        json file holding the watermark of each named sync, rewritten atomically
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as wf:
+                return json.load(wf)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            raise DeltaSyncError(f'Unable to read watermark file {self.path}: {exc}')
+
+    def load(self, name):
+        with self.lock:
+            info = self._read().get(name)
+        return Watermark.fromDict(info) if info else Watermark()
+
+    def save(self, name, watermark):
+        with self.lock:
+            watermarks = self._read()
+            watermarks[name] = watermark.toDict()
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            temp_path = f'{self.path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'w') as tf:
+                json.dump(watermarks, tf)
+            os.replace(temp_path, self.path)
+
+###################################################################################
+
+class SyncRecord:
+    """
+        An issue that is new (created since the watermark) or has been updated since the watermark
+    """
+    def __init__(self, action, issue):
+        self.action  = action   # 'created' or 'updated'
+        self.issue   = issue
+        self.key     = issue.key
+        self.updated = issue.Updated
+
+    def __repr__(self):
+        return f'SyncRecord({self.action} {self.key} {self.updated})'
+
+
+class DeltaSync:
+    """
+        Polls for the issues within a jql scope (eg., 'project = JEST') that have
+        changed since the watermark persisted in watermark_file under name
+        (defaulting to the jql scope).
+
+        Jira compares updated at minute granularity in the user's time zone, so the
+        search asks for everything updated in the last N minutes relative to the
+        server's clock (N covering the time since the watermark plus overlap_minutes)
+        and the issues already covered by the watermark are dropped client side.
+        The watermark is only advanced once a poll's records have been handled.
+
+        The search is paged by offset (page_size issues a page, at least 2), each page
+        starting with the last issue of the one before.  When that issue isn't the first
+        one the results have shifted (an issue already obtained was updated again or left
+        the scope while the poll was under way), rather than miss the issue that moved past
+        the page boundary a fresh search is made from the last issue obtained.
+    """
+    def __init__(self, jira_proxy, jql_scope, watermark_file, name=None, fields=None, overlap_minutes=1,
+                       page_size=100):
+        self.proxy     = jira_proxy
+        self.jql_scope = jql_scope
+        self.store     = watermark_file if isinstance(watermark_file, WatermarkStore) \
+                                        else WatermarkStore(watermark_file)
+        self.name      = name or jql_scope
+        self.fields    = fields if fields is None or isinstance(fields, str) \
+                                else list(fields) + [fn for fn in SYNC_FIELDS if fn not in fields]
+        self.overlap_minutes = overlap_minutes
+        self.page_size       = max(int(page_size), 2)
+
+    @property
+    def watermark(self):
+        return self.store.load(self.name)
+
+    def serverClock(self):
+        """
+            a function returning the server's current time, from the server time
+            obtained now and the time elapsed locally since
+        """
+        server_then = parseJiraTimestamp(self.proxy.getServerInfo().server_time)
+        local_then  = time.monotonic()
+        return lambda: server_then + timedelta(seconds=time.monotonic() - local_then)
+
+    def changesQuery(self, watermark, server_now=None):
+        if watermark.updated is None:
+            return f'({self.jql_scope}) ORDER BY updated ASC, key ASC'
+        if server_now is None:
+            server_now = self.serverClock()()
+        elapsed = (server_now - parseJiraTimestamp(watermark.updated)).total_seconds()
+        minutes = max(math.ceil(elapsed / 60), 0) + self.overlap_minutes
+        return f'({self.jql_scope}) AND updated >= -{minutes}m ORDER BY updated ASC, key ASC'
+
+    def changes(self, watermark):
+        """
+            yields a SyncRecord for each issue in scope changed since watermark
+        """
+        created_after = parseJiraTimestamp(watermark.updated) if watermark.updated else None
+        server_now = self.serverClock()
+        cursor   = watermark   # covers the issues obtained so far, one updated again mid-poll is
+                               # obtained again (with a later updated value) by a following page
+        jql_query = self.changesQuery(cursor, server_now() if cursor.updated else None)
+        start_at, last_key = 0, None
+        while True:
+            page = self.proxy.getIssuesWithJql(jql_query, fields=self.fields,
+                                               start_at=start_at, limit=self.page_size)
+            if last_key is not None and (not page or page[0].key != last_key):
+                jql_query = self.changesQuery(cursor, server_now() if cursor.updated else None)
+                start_at, last_key = 0, None
+                continue
+            fresh = [issue for issue in page if cursor.isChange(issue.Updated, issue.key)]
+            for issue in fresh:
+                created = created_after is None or parseJiraTimestamp(issue.Created) > created_after
+                yield SyncRecord('created' if created else 'updated', issue)
+            if fresh:
+                cursor = cursor.advance([(issue.Updated, issue.key) for issue in fresh])
+            if len(page) < self.page_size:
+                return
+            start_at += len(page) - 1
+            last_key  = page[-1].key
+
+    def poll(self, handler=None):
+        """
+            Returns the list of SyncRecords for the issues changed since the last poll.
+            When handler is supplied it is called with that list and the watermark
+            is only advanced if it returns without raising an exception,
+            otherwise the watermark is advanced before the list is returned.
+        """
+        watermark = self.watermark
+        records = list(self.changes(watermark))
+        if handler is not None:
+            handler(records)
+        if records:
+            self.store.save(self.name, watermark.advance([(rec.updated, rec.key) for rec in records]))
+        return records
@@ -0,0 +1,76 @@
+# fieldcatalog file for jirpa package
+
+###################################################################################
+
+CUSTOM_FIELD_PREFIX = 'customfield_'
+
+class FieldCatalog:
+    """
+        Lookup tables for the field information (display name -> {'create': ..., 'edit': ...})
+        of one project and issue type, computed once when the field information is recorded
+        and shared by every JiraIssue of that project and issue type.
+
+          std_display_for_sys     - standard field system name -> display name
+          standard_display_for    - display name or system name of a standard field -> display name
+          custom_display_for_id   - customfield_NNNNN -> display name
+          display_for_lower       - lower cased display name -> display name (standard and custom)
+    """
+    def __init__(self, standard_fields, custom_fields):
+        self.standard_fields      = standard_fields
+        self.custom_fields        = custom_fields
+        self.standard_field_names = standard_fields.keys()
+        self.custom_field_names   = custom_fields.keys()
+
+        self.std_display_for_sys  = {}
+        self.standard_display_for = {}
+        for display_name, tub in standard_fields.items():
+            operation = 'create' if 'create' in tub else 'edit'
+            self.std_display_for_sys[tub[operation]['schema']['system']] = display_name
+            # the first field (in metadata order) having the name or system name wins
+            self.standard_display_for.setdefault(display_name, display_name)
+            for mode in ['create', 'edit']:
+                if mode in tub:
+                    self.standard_display_for.setdefault(str(tub[mode]['schema']['system']), display_name)
+        self.standard_attr_names = set(self.std_display_for_sys) | set(standard_fields)
+
+        self.custom_display_for_id = {}
+        for display_name, tub in custom_fields.items():
+            mode = 'create' if 'create' in tub else 'edit'
+            if mode in tub:
+                custom_id = tub[mode]['schema']['customId']
+                self.custom_display_for_id[f'{CUSTOM_FIELD_PREFIX}{custom_id}'] = display_name
+
+        self.display_for_lower = {name.lower() : name for name in standard_fields}
+        self.custom_lower      = {name.lower() : name for name in custom_fields}
+        self.display_for_lower.update(self.custom_lower)
+
+        self.issue_descriptor = None   # the jiraissue.IssueTypeDescriptor built from this catalog
+
+    def describes(self, standard_fields, custom_fields):
+        """
+            True when this catalog was computed from these very field information dicts
+        """
+        return self.standard_fields is standard_fields and self.custom_fields is custom_fields
+
+    def fieldExists(self, field_name):
+        return field_name.lower() in self.display_for_lower
+
+    def isCustomField(self, field_name):
+        return field_name.lower() in self.custom_lower
+
+    def displayName(self, field_name):
+        """
+            the display name for field_name regardless of case, None if there's no such field
+        """
+        return self.display_for_lower.get(field_name.lower())
+
+    def fieldInfo(self, field_name):
+        """
+            returns a tuple of the field information for field_name and whether it's a custom field
+        """
+        if self.isCustomField(field_name):
+            return self.custom_fields[self.custom_lower[field_name.lower()]], True
+        display_name = self.displayName(field_name)
+        if display_name is None:
+            raise KeyError(field_name)
+        return self.standard_fields[display_name], False
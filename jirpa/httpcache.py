@@ -0,0 +1,252 @@
+# httpcache file for jirpa package
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+###################################################################################
+
+# targets (relative to /rest/api/2) whose payloads rarely change and are worth revalidating
+CACHEABLE_TARGETS = ['serverInfo', 'issuetype', 'status', 'priority', 'resolution',
+                     'project', 'field', 'issue/createmeta', 'attachment/meta']
+
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+class CacheEntry:
+    """
+        A response body along with the validators needed to revalidate it
+    """
+    def __init__(self, body, etag=None, last_modified=None, content_type=None, stored_at=None):
+        self.body          = body
+        self.etag          = etag
+        self.last_modified = last_modified
+        self.content_type  = content_type
+        self.stored_at     = stored_at or time.time()
+
+    @property
+    def size(self):
+        return len(self.body)
+
+    def meta(self):
+        return {'etag'          : self.etag,
+                'last_modified' : self.last_modified,
+                'content_type'  : self.content_type,
+                'stored_at'     : self.stored_at,
+               }
+
+###################################################################################
+
+class MemoryCacheStore:
+    """
+        Least recently used entries are evicted once the bodies exceed max_bytes
+    """
+    def __init__(self, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries   = OrderedDict()
+        self.size      = 0
+        self.evictions = 0
+        self.lock      = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        if entry.size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key).size
+            self.entries[key] = entry
+            self.size += entry.size
+            while self.size > self.max_bytes:
+                old_key, old_entry = self.entries.popitem(last=False)
+                self.size -= old_entry.size
+                self.evictions += 1
+
+    def delete(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key).size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+class DiskCacheStore:
+    """
+        Entries are kept as a body file and a json metadata file per key in directory,
+        so they survive from one process to the next.  The least recently used
+        entries (by file modification time) are evicted once the bodies exceed max_bytes.
+    """
+    def __init__(self, directory, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.lock      = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self.size = sum(os.path.getsize(path) for path in self._bodyFiles())
+
+    def _paths(self, key):
+        digest = hashlib.sha256(key.encode('UTF-8')).hexdigest()
+        base = os.path.join(self.directory, digest)
+        return f'{base}.body', f'{base}.json'
+
+    def _bodyFiles(self):
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                                                    if name.endswith('.body')]
+
+    def get(self, key):
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r') as mf:
+                meta = json.load(mf)
+            with open(body_path, 'rb') as bf:
+                body = bf.read()
+            os.utime(body_path)  # mark as recently used
+        except (OSError, ValueError):
+            return None
+        if meta.get('key') != key:
+            return None
+        return CacheEntry(body, meta['etag'], meta['last_modified'], meta['content_type'], meta['stored_at'])
+
+    def put(self, key, entry):
+        if entry.size > self.max_bytes:
+            return
+        body_path, meta_path = self._paths(key)
+        meta = entry.meta()
+        meta['key'] = key
+        with self.lock:
+            if os.path.exists(body_path):
+                self.size -= os.path.getsize(body_path)
+            self._atomicWrite(body_path, entry.body)
+            self._atomicWrite(meta_path, json.dumps(meta).encode('UTF-8'))
+            self.size += entry.size
+            if self.size > self.max_bytes:
+                self._evict()
+
+    def _atomicWrite(self, path, data):
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'wb') as tf:
+            tf.write(data)
+        os.replace(temp_path, path)
+
+    def _evict(self):
+        body_files = sorted(self._bodyFiles(), key=os.path.getmtime)
+        for body_path in body_files:
+            if self.size <= self.max_bytes:
+                break
+            self.size -= os.path.getsize(body_path)
+            for path in [body_path, body_path[:-len('.body')] + '.json']:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.evictions += 1
+
+    def delete(self, key):
+        with self.lock:
+            body_path, meta_path = self._paths(key)
+            if os.path.exists(body_path):
+                self.size -= os.path.getsize(body_path)
+            for path in [body_path, meta_path]:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def clear(self):
+        with self.lock:
+            for body_path in self._bodyFiles():
+                for path in [body_path, body_path[:-len('.body')] + '.json']:
+                    if os.path.exists(path):
+                        os.remove(path)
+            self.size = 0
+
+###################################################################################
+
+class HttpCache:
+    """
+        Conditional request (ETag / Last-Modified) cache used by JiraComm for GET
+        requests to the CACHEABLE_TARGETS endpoints.  A stored response is revalidated
+        with If-None-Match / If-Modified-Since and a 304 answer is served from the store.
+    """
+    def __init__(self, store=None, targets=None):
+        self.store   = store if store is not None else MemoryCacheStore()
+        self.targets = list(targets) if targets else CACHEABLE_TARGETS[:]
+        self.counts  = {'hits' : 0, 'misses' : 0, 'stores' : 0, 'bytes_saved' : 0}
+        self.lock    = threading.Lock()
+
+    def cacheable(self, method, target):
+        return method.upper() == 'GET' and target.split('?', 1)[0] in self.targets
+
+    def key(self, user, endpoint):
+        return f'{user}@{endpoint}'
+
+    def lookup(self, key):
+        return self.store.get(key)
+
+    def conditionalHeaders(self, entry):
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def record(self, key, response):
+        """
+            store the body of a successful response if it came with validators
+        """
+        etag          = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            self._count('misses')
+            return
+        entry = CacheEntry(response.content, etag, last_modified, response.headers.get('Content-Type'))
+        self.store.put(key, entry)
+        self._count('misses')
+        self._count('stores')
+
+    def hit(self, entry):
+        self._count('hits')
+        self._count('bytes_saved', entry.size)
+
+    def _count(self, name, amount=1):
+        with self.lock:
+            self.counts[name] += amount
+
+    def invalidate(self, key=None):
+        if key is None:
+            self.store.clear()
+        else:
+            self.store.delete(key)
+
+    def statistics(self):
+        with self.lock:
+            stats = dict(self.counts)
+        stats['size']      = self.store.size
+        stats['max_bytes'] = self.store.max_bytes
+        stats['evictions'] = self.store.evictions
+        return stats
+
+
+def makeHttpCache(setting, max_bytes=DEFAULT_CACHE_MAX_BYTES, targets=None):
+    """
+        setting is the http_cache config value:
+          an HttpCache instance, True or 'memory' for an in-memory cache,
+          or the path of a directory for an on-disk cache
+    """
+    if not setting:
+        return None
+    if isinstance(setting, HttpCache):
+        return setting
+    if setting is True or setting == 'memory':
+        return HttpCache(MemoryCacheStore(max_bytes), targets)
+    return HttpCache(DiskCacheStore(setting, max_bytes), targets)
@@ -0,0 +1,241 @@
+# issueframe file for jirpa package
+
+import csv
+from datetime import timezone
+
+from .deltasync import parseJiraTimestamp, DeltaSyncError
+
+###################################################################################
+
+class IssueFrameError(Exception): pass
+
+# how the values of a field are held in an IssueFrame column, by the field's schema type
+NUMBER_TYPES   = ['number']
+DATE_TYPES     = ['date']
+DATETIME_TYPES = ['datetime']
+CATEGORY_TYPES = ['status', 'priority', 'user', 'resolution', 'issuetype', 'project', 'option', 'securitylevel']
+
+NUMBER, DATE, DATETIME, CATEGORY, TEXT = 'number', 'date', 'datetime', 'category', 'text'
+
+NO_CATEGORY = -1   # the code for a field without a value
+
+def requireNumpy():
+    try:
+        import numpy
+    except ImportError:
+        raise IssueFrameError('IssueFrame requires the numpy package, install it with: pip install numpy')
+    return numpy
+
+
+def columnKind(field_type):
+    """
+        NUMBER, DATE, DATETIME, CATEGORY or TEXT for a field schema type (None for key and id)
+    """
+    if field_type in NUMBER_TYPES:
+        return NUMBER
+    if field_type in DATE_TYPES:
+        return DATE
+    if field_type in DATETIME_TYPES:
+        return DATETIME
+    if field_type in CATEGORY_TYPES:
+        return CATEGORY
+    return TEXT
+
+
+def utcTimestamp(value):
+    """
+        a Jira timestamp (eg., 2021-03-04T15:16:17.000-0700) as an ISO 8601 UTC
+        timestamp without a zone designator, which numpy.datetime64 accepts
+    """
+    try:
+        moment = parseJiraTimestamp(value).astimezone(timezone.utc)
+    except DeltaSyncError:
+        raise IssueFrameError(f'Unrecognized Jira timestamp: |{value}|')
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+
+
+def categoryLabel(value):
+    # users on Jira Cloud have no name, parseAttributeValue leaves the user object as is
+    if isinstance(value, dict):
+        return value.get('displayName') or value.get('accountId') or value.get('key') or str(value)
+    return value
+
+
+class IssueFrameBuilder:
+    """
+        Accumulates the field values of search result rows (tuples of the field values
+        in column order, see resultrows.RowProjection) column by column, number values as
+        floats, dates and datetimes as ISO 8601 text and category values (status, priority,
+        user, ...) as integer codes into the labels seen, and makes an IssueFrame of them.
+    """
+    def __init__(self, columns, kinds):
+        self.columns = list(columns)
+        self.kinds   = list(kinds)
+        self.values  = [[] for column in self.columns]
+        self.codes   = [{} for column in self.columns]   # per category column, label -> code
+
+    def addRow(self, row):
+        for ix, value in enumerate(row):
+            kind = self.kinds[ix]
+            if kind == CATEGORY:
+                if value is None:
+                    value = NO_CATEGORY
+                else:
+                    codes = self.codes[ix]
+                    label = categoryLabel(value)
+                    value = codes.get(label)
+                    if value is None:
+                        value = codes[label] = len(codes)
+            elif kind == NUMBER:
+                value = float('nan') if value is None else float(value)
+            elif kind == DATETIME:
+                value = 'NaT' if value is None else utcTimestamp(value)
+            elif kind == DATE:
+                value = 'NaT' if value is None else value
+            self.values[ix].append(value)
+
+    def addRows(self, rows):
+        for row in rows:
+            self.addRow(row)
+
+    def frame(self):
+        numpy = requireNumpy()
+        arrays = {}
+        labels = {}
+        for column, kind, values, codes in zip(self.columns, self.kinds, self.values, self.codes):
+            if kind == NUMBER:
+                arrays[column] = numpy.array(values, dtype=numpy.float64)
+            elif kind == DATE:
+                arrays[column] = numpy.array(values, dtype='datetime64[D]')
+            elif kind == DATETIME:
+                arrays[column] = numpy.array(values, dtype='datetime64[ms]')
+            elif kind == CATEGORY:
+                arrays[column] = numpy.array(values, dtype=numpy.int32)
+                labels[column] = list(codes)
+            else:
+                arrays[column] = numpy.array(values, dtype=object)
+        return IssueFrame(arrays, labels)
+
+
+class IssueFrame:
+    """
+        Issue field values held column-wise in numpy arrays: float64 for number fields,
+        datetime64 for date and datetime fields (datetimes in UTC), int32 codes for
+        category fields (status, priority, user, ...) whose labels are in labels[column]
+        (NO_CATEGORY for no value), and object arrays for anything else.
+        Filtering, grouping and summing operate on whole columns.
+    """
+    def __init__(self, arrays, labels=None):
+        self.arrays = arrays
+        self.labels = labels or {}
+
+    def __len__(self):
+        for array in self.arrays.values():
+            return len(array)
+        return 0
+
+    @property
+    def columns(self):
+        return list(self.arrays)
+
+    def _array(self, column):
+        if column not in self.arrays:
+            raise IssueFrameError(f'No {column} column, the columns are: {", ".join(self.arrays)}')
+        return self.arrays[column]
+
+    def __getitem__(self, column):
+        """
+            the array for column, for a category column the label of each value
+        """
+        array = self._array(column)
+        if column not in self.labels:
+            return array
+        numpy = requireNumpy()
+        labels = numpy.array(self.labels[column] + [None], dtype=object)
+        return labels[array]   # NO_CATEGORY (-1) picks the trailing None
+
+    def isIn(self, column, values):
+        """
+            boolean mask of the rows whose column value is one of values
+        """
+        numpy = requireNumpy()
+        array = self._array(column)
+        if column in self.labels:
+            wanted = [code for code, label in enumerate(self.labels[column]) if label in values]
+            return numpy.isin(array, wanted)
+        return numpy.isin(array, list(values))
+
+    def filter(self, mask):
+        """
+            a new IssueFrame with the rows where mask (a boolean array) is True
+        """
+        return IssueFrame({column : array[mask] for column, array in self.arrays.items()}, self.labels)
+
+    def sum(self, column):
+        """
+            the sum of a number column, ignoring rows without a value
+        """
+        numpy = requireNumpy()
+        return float(numpy.nansum(self._array(column)))
+
+    def groupBy(self, column):
+        return IssueFrameGroups(self, column)
+
+    def toCsv(self, destination):
+        """
+            write the frame to destination (a file path or an open text file) as CSV with a header row
+        """
+        if isinstance(destination, str):
+            with open(destination, 'w', newline='') as csv_file:
+                return self.toCsv(csv_file)
+        numpy = requireNumpy()
+        columns = []
+        for column, array in self.arrays.items():
+            if column in self.labels:
+                array = self[column]
+            elif array.dtype.kind == 'M':
+                array = numpy.where(numpy.isnat(array), '', numpy.datetime_as_string(array))
+            elif array.dtype.kind == 'f':
+                array = numpy.where(numpy.isnan(array), '', array.astype(str))
+            columns.append(array.tolist())
+        writer = csv.writer(destination)
+        writer.writerow(self.columns)
+        writer.writerows(zip(*columns))
+
+
+class IssueFrameGroups:
+    """
+        the rows of an IssueFrame grouped by the values of a column
+    """
+    def __init__(self, frame, column):
+        numpy = requireNumpy()
+        self.frame = frame
+        array = frame._array(column)
+        if column in frame.labels:
+            # the codes index the labels already, no value (-1) becomes a trailing None group
+            self.keys    = frame.labels[column] + [None]
+            self.inverse = numpy.where(array == NO_CATEGORY, len(self.keys) - 1, array)
+        elif array.dtype == object:
+            codes = {}
+            try:
+                self.inverse = numpy.array([codes.setdefault(value, len(codes)) for value in array.tolist()],
+                                           dtype=numpy.intp)
+            except TypeError:
+                raise IssueFrameError(f'Cannot group by the values of the {column} column')
+            self.keys = list(codes)
+        else:
+            unique, self.inverse = numpy.unique(array, return_inverse=True)
+            self.keys = unique.tolist()
+        self.sizes = numpy.bincount(self.inverse, minlength=len(self.keys)).tolist()
+
+    def count(self):
+        return {key : size for key, size in zip(self.keys, self.sizes) if size}
+
+    def sum(self, column):
+        """
+            the sum of a number column for each group, ignoring rows without a value
+        """
+        numpy = requireNumpy()
+        values = numpy.nan_to_num(self.frame._array(column), nan=0.0)
+        totals = numpy.bincount(self.inverse, weights=values, minlength=len(self.keys)).tolist()
+        return {key : total for key, total, size in zip(self.keys, totals, self.sizes) if size}
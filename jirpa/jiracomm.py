@@ -1,22 +1,100 @@
 # jiracomm file for jirpa package
 
 import os
-import json
+import copy
 import re
+import socket
+import threading
+import time
+import hashlib
+import mmap
+import weakref
 from requests.utils import requote_uri
 import base64  # is this needed for attachments?  maybe not here but in jiraproxy.py
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from collections import deque
 
-from .mutelogger import MuteLogger
+from .mutelogger import MuteLogger, debugEnabled
+from .retry      import RetryPolicy, RetryRecord
+from .jsoncodec  import getJsonCodec, JsonCodecError
+from .httpcache  import makeHttpCache, DEFAULT_CACHE_MAX_BYTES
+from .singleflight import SingleFlight
 
 ###################################################################################
 
 class JiraCommError(Exception): pass
 
+DEFAULT_POOL_CONNECTIONS = 10   # number of distinct hosts for which a pool is kept
+DEFAULT_POOL_MAXSIZE     = 10   # number of connections kept per host pool
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+class JiraHTTPAdapter(HTTPAdapter):
+    """
+        HTTPAdapter that optionally turns on TCP keep-alive probing for its sockets
+        and keeps track of the urllib3 connection pools it hands out so that
+        connection creation vs. connection reuse can be reported.  The pools are
+        only weakly referenced, a pool the pool manager evicts goes away (and out
+        of the statistics) as it would otherwise.
+    """
+    def __init__(self, socket_options=None, **kwargs):
+        self.socket_options = socket_options
+        self._pools   = weakref.WeakValueDictionary()
+        self._retired = {'connections_created' : 0, 'requests' : 0}
+        self._pool_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self.socket_options:
+            pool_kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        if self.socket_options:
+            proxy_kwargs['socket_options'] = self.socket_options
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+    def _track(self, pool):
+        with self._pool_lock:
+            self._pools[id(pool)] = pool
+        return pool
+
+    def get_connection(self, url, proxies=None):
+        return self._track(super().get_connection(url, proxies))
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        # requests >= 2.32 obtains connection pools through this method
+        pool = super().get_connection_with_tls_context(request, verify, proxies=proxies, cert=cert)
+        return self._track(pool)
+
+    def statistics(self):
+        with self._pool_lock:
+            created  = self._retired['connections_created']
+            requests = self._retired['requests']
+            pools = list(self._pools.values())
+        for pool in pools:
+            created  += pool.num_connections
+            requests += pool.num_requests
+        return {'pools'               : len(pools),
+                'connections_created' : created,
+                'requests'            : requests,
+                'connections_reused'  : max(requests - created, 0)
+               }
+
+    def close(self):
+        with self._pool_lock:
+            for pool in self._pools.values():
+                self._retired['connections_created'] += pool.num_connections
+                self._retired['requests']            += pool.num_requests
+            self._pools = weakref.WeakValueDictionary()
+        super().close()
+
+
 class JiraComm:
 
-    def __init__(self, config):
+    def __init__(self, config, check_connection=True):
         self.url            = config.get('url')  # like http://<IPADDR||SERVER>{:<PORT>}
         self.user           = config.get('user')
         self.accountId      = config.get('accountId')
@@ -52,18 +130,81 @@ class JiraComm:
                 else:
                     log.info("Proxy password has been configured")
 
-        self.conn = requests.Session()
+        # connection pooling / keep-alive tuning
+        #   pool_connections  - number of per-host pools to keep
+        #   pool_maxsize      - max number of connections kept open per host
+        #   pool_block        - when True, callers wait for a free connection
+        #                       instead of opening (and later discarding) an extra one
+        #   keep_alive        - turn on TCP keep-alive probes for pooled sockets
+        #   keep_alive_interval - seconds of idleness before/between TCP keep-alive probes
+        #   pool_idle_timeout - seconds after which idle pooled connections are
+        #                       dropped and re-established on next use
+        self.pool_connections    = int(config.get('pool_connections', DEFAULT_POOL_CONNECTIONS))
+        self.pool_maxsize        = int(config.get('pool_maxsize', DEFAULT_POOL_MAXSIZE))
+        self.pool_block          = bool(config.get('pool_block', False))
+        self.keep_alive          = bool(config.get('keep_alive', False))
+        self.keep_alive_interval = int(config.get('keep_alive_interval', 60))
+        self.pool_idle_timeout   = config.get('pool_idle_timeout', None)
+        self._last_activity      = time.monotonic()   # when the last request completed
+        self._in_flight          = 0
+        self._pool_refreshes     = 0
+        self._activity_lock      = threading.Lock()
+
+        # retries of throttled (429/503) and transiently failed requests, see retry.RetryPolicy
+        self.retry_policy  = RetryPolicy(config)
+        self.retry_history = deque(maxlen=int(config.get('retry_history_size', 1000)))
+        self._retry_lock   = threading.Lock()
+        self._retry_totals = {'retries' : 0, 'throttle_seconds' : 0.0, 'by_status' : {}}
+        self._sleep        = time.sleep
+
+        # optional conditional request cache for slowly changing reference data, see httpcache.py
+        #   http_cache           - True or 'memory', a directory path, or an HttpCache instance
+        #   http_cache_max_bytes - size limit for the stored bodies
+        self.http_cache = makeHttpCache(config.get('http_cache', None),
+                                        int(config.get('http_cache_max_bytes', DEFAULT_CACHE_MAX_BYTES)))
+
+        self.download_chunk_size = int(config.get('download_chunk_size', DEFAULT_DOWNLOAD_CHUNK_SIZE))
+
+        # collapse concurrent identical GET requests into one round trip, each caller
+        # gets its own copy of the decoded result as callers may modify what they get
+        self.single_flight = SingleFlight(share=copy.deepcopy) if config.get('single_flight', True) else None
+
+        # json_codec is one of json (default), orjson, ujson or auto, used for
+        # encoding request payloads and (once per response) decoding response bodies
+        try:
+            self.json_codec = getJsonCodec(config.get('json_codec', 'json'))
+        except JsonCodecError as exc:
+            raise JiraCommError(str(exc))
 
-        options = {'username' : self.user, 'password' : self.password}
+        self.conn = requests.Session()
+        self.adapter = JiraHTTPAdapter(socket_options=self._socketOptions(),
+                                       pool_connections=self.pool_connections,
+                                       pool_maxsize=self.pool_maxsize,
+                                       pool_block=self.pool_block)
+        self.conn.mount('https://', self.adapter)
+        self.conn.mount('http://',  self.adapter)
+
+        self.connect_options = {'username' : self.user, 'password' : self.password}
         if re.search(r'\.atlassian\.net', self.url, re.IGNORECASE):
             if self.accountId is None or not self.accountId:
                 problem = (f'Jira OnDemand REST API requires the use '
                            f'of the accountId of the target user')
                 raise JiraCommError(problem)
             self.on_demand = True
-            options = {'accountId' : self.accountId}
+            self.connect_options = {'accountId' : self.accountId}
 
-        status, result, errors = self.getRequest('user', **options)
+        self.status, self.result, self.errors = None, None, None
+        if check_connection:
+            self.checkConnection()
+
+
+    def checkConnection(self):
+        """
+            Verify the url and credentials with a request for the configured user,
+            raises a JiraCommError if that doesn't work out.
+            Done by __init__ unless the check_connection arg is False.
+        """
+        status, result, errors = self.getRequest('user', **self.connect_options)
         self.status = status
         self.result = result
         self.errors = errors
@@ -71,6 +212,49 @@ class JiraComm:
             raise JiraCommError(f'Unable to connect to {self.url}')
 
 
+    def _socketOptions(self):
+        if not self.keep_alive:
+            return None
+        options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        for name in ['TCP_KEEPIDLE', 'TCP_KEEPINTVL']:
+            if hasattr(socket, name):  # not available on all platforms
+                options.append((socket.IPPROTO_TCP, getattr(socket, name), self.keep_alive_interval))
+        return options
+
+
+    def _requestStarting(self):
+        """
+            drop the pooled connections if they have been idle longer than pool_idle_timeout,
+            so a connection the server (or a load balancer) has quietly closed isn't reused.
+            Idle means no request in flight since the last one completed, the pool
+            is left alone while other threads have requests in flight.
+        """
+        with self._activity_lock:
+            idle = time.monotonic() - self._last_activity
+            if self.pool_idle_timeout and not self._in_flight and idle > float(self.pool_idle_timeout):
+                self.logger.debug(f'pooled connections idle for more than {self.pool_idle_timeout} seconds, refreshing')
+                self.adapter.close()
+                self._pool_refreshes += 1
+            self._in_flight += 1
+
+
+    def _requestDone(self):
+        with self._activity_lock:
+            self._in_flight -= 1
+            self._last_activity = time.monotonic()
+
+
+    def poolStatistics(self):
+        """
+            Return a dict with information about connection reuse:
+              pools, connections_created, requests, connections_reused, refreshes
+        """
+        stats = self.adapter.statistics()
+        stats['refreshes'] = self._pool_refreshes
+        stats['pool_maxsize'] = self.pool_maxsize
+        return stats
+
+
     def executeRequest(self, method, target, payload=None, extra_headers=None, **option):
         """
             the following have to be used in the executeRequest upon calling
@@ -85,7 +269,8 @@ class JiraComm:
                'http://host.name': 'foo.bar:4012'
               }
         """
-        if option.get('verbatim_url', False):
+        verbatim = option.get('verbatim_url', False)
+        if verbatim:
             endpoint = target
             del option['verbatim_url'] # so this doesn't get appended as query string arg
         else:
@@ -106,26 +291,121 @@ class JiraComm:
             extra_headers['X-Atlassian-Token'] = 'nocheck'
         if extra_headers.get('Content-Type', 'application/json') == 'application/json':
             if payload:
-                payload = json.dumps(payload)
-
-        response = self.conn.request(method, endpoint, auth=self.auth, 
-                                     headers=extra_headers, 
-                                     data=payload,
-                                     timeout=option.get('timeout', 20),
-                                     proxies=self.proxies,
-                                     verify=self.verify_cert
-                                    )
+                payload = self.json_codec.dumps(payload)
+
+        cache_key, cached = None, None
+        if self.http_cache and not verbatim and self.http_cache.cacheable(method, target):
+            cache_key = self.http_cache.key(self.user, endpoint)
+            cached = self.http_cache.lookup(cache_key)
+            if cached:
+                extra_headers.update(self.http_cache.conditionalHeaders(cached))
+
+        response = self._send(method, endpoint, extra_headers, payload,
+                              timeout=option.get('timeout', 20))
+
+        if cache_key:
+            if cached and response.status_code == 304:
+                self.logger.debug(f'{endpoint} not modified, using cached content')
+                self.http_cache.hit(cached)
+                return 200, self.json_codec.loads(cached.body), None
+            self.http_cache.record(cache_key, response)
+
+        result = self.decodeResponse(response)
+        if result is not response and debugEnabled(self.logger):
+            self.logger.debug(self.json_codec.pretty(result))
+
+        return self.parseResponse(endpoint, response, result)
+
+
+    def _send(self, method, endpoint, headers, payload, timeout=20, stream=False, allow_redirects=True):
+        """
+            Issue the request, retrying (within the per-verb budget of self.retry_policy) 
+            when the server throttles us or a gateway fails transiently.
+            Every retry is recorded in self.retry_history.
+            With stream=True the request is still in flight when the response is
+            returned, the caller calls _requestDone once it has closed the response.
+        """
+        attempt = 0
+        self._requestStarting()
         try:
-            payload = json.dumps(response.json(), indent=4)
-            #if payload: self.logger.debug(payload)
-        except Exception as exc:
-            pass
+            while True:
+                response = self.conn.request(method, endpoint, auth=self.auth, 
+                                             headers=headers, 
+                                             data=payload,
+                                             timeout=timeout,
+                                             proxies=self.proxies,
+                                             verify=self.verify_cert,
+                                             stream=stream,
+                                             allow_redirects=allow_redirects
+                                            )
+                delay, reason = self.retry_policy.delayFor(method, response.status_code, 
+                                                           response.headers, attempt)
+                if delay is None:
+                    break
+                attempt += 1
+                self._recordRetry(RetryRecord(method.upper(), endpoint, response.status_code, 
+                                              attempt, delay, reason))
+                response.close()
+                self._sleep(delay)
+        except BaseException:
+            self._requestDone()
+            raise
+        if not stream:
+            self._requestDone()
+        return response
+
+
+    def _recordRetry(self, record):
+        self.logger.info(f'{record.method} {record.endpoint} returned {record.status}, '
+                         f'retry {record.attempt} in {record.delay:.2f} seconds ({record.reason})')
+        with self._retry_lock:
+            self.retry_history.append(record)
+            self._retry_totals['retries'] += 1
+            self._retry_totals['throttle_seconds'] += record.delay
+            by_status = self._retry_totals['by_status']
+            by_status[record.status] = by_status.get(record.status, 0) + 1
+
+
+    def retryStatistics(self):
+        """
+            Return a dict with the number of retries made, the total number of seconds
+            spent waiting on them and the count of retries per HTTP status code.
+        """
+        with self._retry_lock:
+            stats = dict(self._retry_totals)
+            stats['by_status'] = dict(self._retry_totals['by_status'])
+        return stats
+
+
+    def cacheStatistics(self):
+        """
+            Return the hit/miss/size counters of the http cache (None if no http_cache is configured)
+        """
+        if not self.http_cache:
+            return None
+        return self.http_cache.statistics()
+
 
-        return self.parseResponse(endpoint, response)
+    def singleFlightStatistics(self):
+        """
+            Return the number of GETs executed and the number of callers that shared
+            a result of a concurrent identical GET (None if single_flight is turned off)
+        """
+        if not self.single_flight:
+            return None
+        return self.single_flight.statistics()
 
 
     def getRequest(self, target, **option):
-        return self.executeRequest('GET', target, **option)
+        """
+            Identical GETs (same target and query options) that are issued concurrently
+            from different threads share a single round trip, each getting its own copy
+            of the decoded result (unless single_flight was configured as False).
+        """
+        if not self.single_flight:
+            return self.executeRequest('GET', target, **option)
+        key = (target, repr(sorted(option.items())))
+        return self.single_flight.do(key, self.executeRequest, 'GET', target, **option)
 
     def postRequest(self, target, data, extra_headers=None):
         return self.executeRequest('POST', target, payload=data, extra_headers=extra_headers)
@@ -137,16 +417,28 @@ class JiraComm:
         return self.executeRequest('DELETE', target, **option)
 
     
-    def parseResponse(self, endpoint, response):
+    def decodeResponse(self, response):
         """
-            Attempt to pull the JSON out of the response and get it in to a Python dict representation
+            Decode the JSON body of the response into a Python representation,
+            the response itself is returned when there is no body or it isn't JSON
         """
-        result, errors = response, None
-        if response.content:
-            try:
-                result = response.json()
-            except Exception as exc:
-                pass
+        content_type = response.headers.get('Content-Type', 'application/json')
+        if not response.content or 'json' not in content_type:
+            return response
+        try:
+            return self.json_codec.loads(response.content)
+        except Exception as exc:
+            return response
+
+
+    def parseResponse(self, endpoint, response, result=None):
+        """
+            Attempt to pull the JSON out of the response and get it in to a Python dict representation,
+            result is the already decoded body (see decodeResponse) if that has been done
+        """
+        if result is None:
+            result = self.decodeResponse(response)
+        errors = None
         if not 200 <= response.status_code <= 299:
             errors = f'Response code for {endpoint} was {response.status_code} '
         if response.status_code == 401:
@@ -196,14 +488,84 @@ class JiraComm:
         return status, attachment_content, errors
 
 
+    def downloadAttachment(self, att_info, destination, chunk_size=None, checksum=None):
+        """
+            Stream the attachment content into destination, which is either an open
+            binary file object or a file path (written to a .part file that is renamed
+            into place once complete).  The content is never held in memory beyond
+            chunk_size bytes, a redirect to the actual content location is followed
+            before any content is read.  When checksum names a hashlib algorithm 
+            (eg, 'sha256') the digest is computed as the bytes go by.
+
+            Returns status, info, errors where info is a dict with 
+              'bytes', 'checksum' and 'algorithm' keys (None when there are errors)
+        """
+        att_content_url = att_info.content_ref
+        chunk_size = chunk_size or self.download_chunk_size
+        extra_headers = {'X-Atlassian-Token' : 'nocheck'}
+        response = self._send('GET', att_content_url, extra_headers, None, 
+                              timeout=self.timeout, stream=True)
+        status = response.status_code
+        errors = None
+        if not 200 <= status <= 299:
+            errors = f'Response code for {att_content_url} was {status} '
+        if status == 401:
+            errors = f'Response code for {att_content_url} was 401 (Unauthorized) '
+        if status == 404:
+            errors = f'Response code for {att_content_url} was 404 (Not Found) '
+        if errors:
+            response.close()
+            self._requestDone()
+            return status, None, errors
+
+        digest = hashlib.new(checksum) if checksum else None
+        byte_count = 0
+        to_path = isinstance(destination, (str, os.PathLike))
+        try:
+            target = open(f'{destination}.part', 'wb') if to_path else destination
+        except BaseException:
+            response.close()
+            self._requestDone()
+            raise
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                target.write(chunk)
+                byte_count += len(chunk)
+                if digest:
+                    digest.update(chunk)
+        except BaseException:
+            if to_path:
+                target.close()
+                os.remove(f'{destination}.part')
+            raise
+        finally:
+            response.close()
+            self._requestDone()
+        if to_path:
+            target.close()
+            os.replace(f'{destination}.part', destination)
+
+        info = {'bytes'     : byte_count,
+                'checksum'  : digest.hexdigest() if digest else None,
+                'algorithm' : checksum
+               }
+        return status, info, errors
+
+
     def postAttachment(self, issue_key, att_info):
         """
+            POST the attachment as multipart/form-data to the issue.
+            The content comes from the first of these att_info keys that is present:
+              'file_content' - str (sent UTF-8 encoded), bytes, bytearray, memoryview or mmap
+              'file_object'  - a binary mode file object, read from its current position
+              'file_path'    - path of a file that is opened and read
+            The multipart body is produced in chunks as it is sent, the file content
+            is never copied into a single buffer along with the multipart framing.
         """
         import binascii
 
         filename = att_info['filename']
         mimetype = att_info['mimetype']
-        fileio   = att_info['file_content']
         file_base_name = os.path.basename(filename)
 
         boundary = binascii.hexlify(os.urandom(16)).decode('ascii')
@@ -217,18 +579,94 @@ class JiraComm:
         prefix += f'Content-Type: application/octet-stream{separator}{separator}'
         suffix =  f'{separator}--{boundary}--{separator}'
 
-        # convert the prefix and suffix to binary and then join them around the binary contents of the file
-        parts = [part.encode('UTF-8') for part in [prefix, att_info['file_content'], suffix]]
-        payload = b''.join(parts)
-        extra_headers = {'Content-Type'   : f'multipart/form-data; boundary={boundary}',
-                         'Content-Length' : str(len(payload))
-                        }
-        att_url = f'{self.jira_url_prefix}/issue/{issue_key}/attachments'
-        options = {'verbatim_url' : True}
-        status, response, errors \
-            = self.executeRequest('POST', att_url,
-                                  extra_headers=extra_headers,
-                                  payload=payload,
-                                  **options)
+        opened = None
+        if 'file_content' in att_info:
+            content = att_info['file_content']
+            if isinstance(content, str):
+                content = content.encode('UTF-8')
+        elif 'file_object' in att_info:
+            content = att_info['file_object']
+        else:
+            content = opened = open(att_info['file_path'], 'rb')
+
+        try:
+            payload = MultipartStream(prefix.encode('UTF-8'), content, suffix.encode('UTF-8'),
+                                      chunk_size=self.download_chunk_size)
+            extra_headers = {'Content-Type'   : f'multipart/form-data; boundary={boundary}',
+                             'Content-Length' : str(len(payload))
+                            }
+            att_url = f'{self.jira_url_prefix}/issue/{issue_key}/attachments'
+            options = {'verbatim_url' : True}
+            status, response, errors \
+                = self.executeRequest('POST', att_url,
+                                      extra_headers=extra_headers,
+                                      payload=payload,
+                                      **options)
+        finally:
+            if opened:
+                opened.close()
         # contemplate checking status code here and raising exception for non 2xx level code
         return status, response, errors
+
+###################################################################################
+
+class MultipartStream:
+    """
+        Iterable request body made up of a prefix, the content and a suffix.
+        content is either a buffer (bytes, bytearray, memoryview, mmap) which is sent
+        in memoryview slices, or a binary file object which is read chunk_size bytes
+        at a time.  len() gives the total body size so a Content-Length can be sent,
+        and each iteration starts over from the beginning so the body can be re-sent.
+    """
+    def __init__(self, prefix, content, suffix, chunk_size=64*1024):
+        self.prefix     = prefix
+        self.content    = content
+        self.suffix     = suffix
+        self.chunk_size = chunk_size
+        self.is_file    = isFileObject(content)
+        if self.is_file:
+            self.start = content.tell()
+            self.content_length = contentSize(content)
+        else:
+            self.content_length = len(memoryview(content).cast('B'))
+
+    def __len__(self):
+        return len(self.prefix) + self.content_length + len(self.suffix)
+
+    def __iter__(self):
+        yield self.prefix
+        if self.is_file:
+            self.content.seek(self.start)
+            remaining = self.content_length
+            while remaining > 0:
+                chunk = self.content.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            view = memoryview(self.content).cast('B')
+            for offset in range(0, len(view), self.chunk_size):
+                yield view[offset : offset + self.chunk_size]
+        yield self.suffix
+
+
+def isFileObject(content):
+    # an mmap has a read method, but is sent as the buffer it is
+    return hasattr(content, 'read') and not isinstance(content, mmap.mmap)
+
+
+def contentSize(content):
+    """
+        number of bytes from the current position to the end of a binary file object,
+        or the size of a buffer
+    """
+    if not isFileObject(content):
+        return len(memoryview(content).cast('B'))
+    position = content.tell()
+    try:
+        return os.fstat(content.fileno()).st_size - position
+    except (AttributeError, OSError, ValueError):
+        end = content.seek(0, os.SEEK_END)
+        content.seek(position)
+        return end - position
@@ -1,11 +1,17 @@
 #jiraissue file for jirpa package
 
 import re
+import sys
 import copy
+from functools import partial
+from types     import MappingProxyType
+
+from .mutelogger import debugEnabled
 
 ###################################################################################################
 
 CUSTOM_FIELD_PREFIX_PATTERN = re.compile(r'^customfield_(.*)')
+COMMA_SEPARATOR = re.compile(r', ?')
 ISO_8601_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{3}Z?)?$')
 
 class JiraIssueError(Exception):
@@ -15,6 +21,250 @@ class JiraIssueError(Exception):
 
 class JiraIssueFieldError(Exception): pass
 
+# fields whose system names are turned into display names even when they're not in the field info
+SPECIAL_FIELDS = {'status'      : 'Status', 
+                  'resolution'  : 'Resolution', 
+                  'created'     : 'Created', 
+                  'updated'     : 'Updated', 
+                 }
+# what JiraIssue.special gives back, the dict itself can't be changed through it
+SPECIAL_FIELDS_VIEW = MappingProxyType(SPECIAL_FIELDS)
+
+# how the raw value of a field is decoded into an attribute value
+PARSED_VALUE = 'parsed'
+SPRINT_VALUE = 'sprint'
+
+MAX_ATTRIBUTE_PLANS = 32  # per issue type, one for each distinct set of fields seen
+
+###################################################################################################
+
+class IssueTypeDescriptor:
+    """
+        The information a JiraIssue has in common with every other issue of its project
+        and issue type, built once per FieldCatalog and referenced by each of the issues
+    """
+    __slots__ = ('catalog', 'version', 'project_key', 'issue_type', 'issue_type_id',
+                 'logger', 'priority_value_for_id', 'attribute_plans', 'jiralize_plans')
+
+    def __init__(self, catalog, jira_proxy, project_key, issue_type):
+        self.catalog               = catalog
+        self.version               = jira_proxy.jira_version.version
+        self.project_key           = project_key
+        self.issue_type            = issue_type
+        self.issue_type_id         = jira_proxy.issue_type_id_for_name[issue_type]
+        self.logger                = jira_proxy.logger
+        self.priority_value_for_id = jira_proxy.priority_value_for_id
+        self.attribute_plans       = {}
+        self.jiralize_plans        = {}
+
+    def describes(self, jira_proxy):
+        """
+            True when the proxy-wide information held here is still that of jira_proxy
+        """
+        return (self.logger is jira_proxy.logger
+                and self.priority_value_for_id is jira_proxy.priority_value_for_id
+                and self.version == jira_proxy.jira_version.version
+                and self.issue_type_id == jira_proxy.issue_type_id_for_name[self.issue_type])
+
+    @classmethod
+    def forIssue(cls, jira_proxy, project_key, issue_type):
+        catalog = jira_proxy.fieldCatalog(project_key, issue_type)
+        descriptor = catalog.issue_descriptor
+        if descriptor is None or not descriptor.describes(jira_proxy):
+            descriptor = cls(catalog, jira_proxy, project_key, issue_type)
+            catalog.issue_descriptor = descriptor
+        return descriptor
+
+    def attributePlan(self, raw_names):
+        """
+            Returns a dict of attribute name -> (field name in the jira item, PARSED_VALUE or SPRINT_VALUE)
+            in the order the attributes are set for a jira item having the fields in raw_names
+            (a tuple).  The fields are classified as standard, special, custom or unrecognized
+            and a later classification takes precedence over an earlier one for the same name.
+        """
+        plan = self.attribute_plans.get(raw_names)
+        if plan is not None:
+            return plan
+        catalog = self.catalog
+
+        #the standard fields, within the jira_item['fields'] the fields are "system" names
+        std_fields = [attr_name for attr_name in raw_names if attr_name in catalog.standard_attr_names]
+        special_fields = [attr_name for attr_name in raw_names if attr_name in SPECIAL_FIELDS]
+        digit_suffix_custom_fields = [attr_name for attr_name in raw_names
+                                                 if attr_name.startswith('customfield_')]
+        #other custom fields with names
+        other_custom_fields = [attr_name for attr_name in raw_names
+                                          if attr_name     in catalog.custom_field_names
+                                         and attr_name not in digit_suffix_custom_fields]
+        # fields supplied that are not in a known classification
+        unrecognized_fields = [attr_name for attr_name in raw_names
+                                          if attr_name not in catalog.standard_field_names
+                                         and attr_name not in catalog.std_display_for_sys
+                                         and attr_name not in catalog.custom_field_names
+                                         and attr_name not in special_fields
+                                         and attr_name not in digit_suffix_custom_fields
+                                         and attr_name not in other_custom_fields]
+        plan = {}
+        for attr_name in std_fields:
+            # display name of the first standard field whose name or system name is attr_name
+            display_name = catalog.standard_display_for.get(attr_name)
+            plan[display_name or attr_name] = (attr_name, PARSED_VALUE)
+        for attr_name in special_fields:
+            plan[SPECIAL_FIELDS[attr_name]] = (attr_name, PARSED_VALUE)
+        for attr_name in other_custom_fields:
+            plan[attr_name] = (attr_name, PARSED_VALUE)
+        for attr_name in digit_suffix_custom_fields:
+            custom_name = catalog.custom_display_for_id.get(attr_name)
+            # no meta data for a custom field that isn't in the field info, possibly an obsolete custom field
+            if custom_name:
+                # Hack for DE17528
+                plan[custom_name] = (attr_name, SPRINT_VALUE if custom_name == "Sprint" else PARSED_VALUE)
+        # unrecognized fields may get flagged on an attempt to create this Jira
+        for attr_name in unrecognized_fields:
+            plan[sys.intern(attr_name)] = (attr_name, PARSED_VALUE)
+
+        if len(self.attribute_plans) >= MAX_ATTRIBUTE_PLANS:
+            self.attribute_plans.clear()
+        self.attribute_plans[raw_names] = plan
+        return plan
+
+    def jiralizePlan(self, mode):
+        plan = self.jiralize_plans.get(mode)
+        if plan is None:
+            plan = self.jiralize_plans[mode] = JiralizePlan(self.catalog, mode, self.logger)
+        return plan
+
+
+# attributes jiralize leaves out, they're already set or can't be set by the user
+UNPOSTABLE_ATTRIBUTES = ['key', 'Project', 'Status', 'Created', 'Updated']
+
+SKIP_ATTRIBUTE = 'skip'
+ISSUE_TYPE_ATTRIBUTE = 'issue type'
+
+NO_VALUE = object()   # the original value of an attribute the issue didn't have
+
+class FieldEncoder:
+    """
+        How jiralize posts the value of one attribute: the field key to post it as,
+        the field type deciding the shape of the postable value and the allowed values
+        (None when the field info doesn't list allowed values)
+    """
+    __slots__ = ('field_key', 'field_type', 'field_name', 'allowed_values', 'allowed', 'postable')
+
+    def __init__(self, field_key, field_type, field_name, allowed_values=None):
+        self.field_key      = field_key
+        self.field_type     = field_type
+        self.field_name     = field_name
+        self.allowed_values = allowed_values
+        self.allowed        = None if allowed_values is None else frozenset(allowed_values)
+        self.postable       = POSTABLE_VALUE.get(field_type)
+
+    def isAllowed(self, value):
+        return self.allowed is None or isAllowableValue(value, self.allowed)
+
+    def disallowed(self, value):
+        return (f'"{value}" not an allowed value for the {self.field_name} field,'
+                f' the allowed values for {self.field_key} are {repr(self.allowed_values)}')
+
+    def postableValue(self, value):
+        if not self.isAllowed(value):
+            raise JiraIssueError(self.disallowed(value))
+        if self.postable is None:
+            return postableValue(self.field_key, self.field_type, value)  # raises JiraIssueFieldError
+        return self.postable(value)
+
+
+class JiralizePlan:
+    """
+        The treatment by jiralize of each attribute name in one mode (create or edit)
+        for a project and issue type, a FieldEncoder, SKIP_ATTRIBUTE or ISSUE_TYPE_ATTRIBUTE
+        worked out from the field info the first time the attribute name is seen
+    """
+    def __init__(self, catalog, mode, logger):
+        self.catalog  = catalog
+        self.mode     = mode
+        self.logger   = logger
+        self.encoders = {}
+
+    def encoder(self, field_key):
+        encoder = self.encoders.get(field_key)
+        if encoder is None:
+            encoder = self.encoders[field_key] = self._compile(field_key)
+        return encoder
+
+    def _compile(self, field_key):
+        ## TODO Do key, project, status and resolution have display names ?
+        ## TODO Need to Handle multilevel selection/pickers field types.
+        if field_key in UNPOSTABLE_ATTRIBUTES:
+            return SKIP_ATTRIBUTE
+        if field_key == 'Issue Type':
+            # it is possible to transition a Jira issue to a different issue type
+            return ISSUE_TYPE_ATTRIBUTE
+
+        mode = self.mode
+        custom_fields, standard_fields = self.catalog.custom_fields, self.catalog.standard_fields
+        std_field    = False
+        custom_field = False
+        if field_key in custom_fields and mode in custom_fields[field_key]:
+            field_info = custom_fields[field_key][mode]
+            field_type = field_info["schema"]["type"]
+            # <HACK rallyid=DE17528>
+            if field_info['schema']['custom'] == 'com.pyxis.greenhopper.jira:gh-sprint':
+                field_type = 'sprint'
+            # </HACK>
+            post_key = f"customfield_{field_info['schema']['customId']}"
+            custom_field = True
+        elif field_key in standard_fields and mode in standard_fields[field_key]:
+            field_info = standard_fields[field_key][mode]
+            field_type = field_info["schema"]["type"]
+            if field_key.startswith('Affects Version/s'):
+                field_type = 'versions'
+            if field_key.startswith('Fix Version/s'):
+                field_type = 'versions'
+            if field_key.startswith('Component/s'):
+                field_type = 'components'
+            post_key = field_info["schema"]["system"]
+            std_field = True
+        elif field_key == 'issuetype':
+            self.logger.debug("JiraIssue instance detected a field name of 'issuetype', this field is ignored")
+            return SKIP_ATTRIBUTE
+        else:
+            problem = (f"Unrecognized field |{field_key}|, unable to accurately realize "
+                       f"postable data for this field in |{mode}| mode")
+            raise JiraIssueError(problem)
+
+        allowed_values = None
+        if "allowedValues" in field_info:
+            allowed_values = allowedValuesForField(field_type, field_info, std_field)
+            if custom_field and not re.search(r'versions?', field_type):
+                field_type = "select"  
+            if custom_field and re.search(r'.*multiselect$', field_info["schema"]["custom"]):
+                field_type = "multiselect" 
+        return FieldEncoder(post_key, field_type, field_info["name"], allowed_values)
+
+
+def _ownProperty(name, shared):
+    """
+        a property whose value is shared(issue) until the issue is given a value of its own
+    """
+    def getter(self):
+        own = self._own
+        if own is not None and name in own:
+            return own[name]
+        return shared(self)
+
+    def setter(self, value):
+        if self._own is None:
+            self._own = {}
+        self._own[name] = value
+
+    return property(getter, setter)
+
+def _sharedProperty(name, source=None):
+    if source == 'catalog':
+        return _ownProperty(name, lambda self: getattr(self.descriptor.catalog, name))
+    return _ownProperty(name, lambda self: getattr(self.descriptor, name))
+
 ###################################################################################################
 
 class JiraIssue:
@@ -25,203 +275,139 @@ class JiraIssue:
                             'std_display_for_sys', 'priority_value_for_id',
                             'special', 'updated_keys']
 
-    def __init__(self, jira_item, jira_proxy):
-        self.attribute    = {}
-        self.updated_keys = []
-        self.version                = jira_proxy.jira_version.version
-        self.id                     = jira_item.get("id", 0)
-        self.key                    = jira_item["key"]
-        self.project_key            = self.key.split('-')[0]
-        self.issue_type             = jira_item["fields"]["issuetype"]["name"]
-        self.issue_type_id          = jira_proxy.issue_type_id_for_name[self.issue_type]
-        self.logger                 = jira_proxy.logger
-
-        self.standard_fields        = jira_proxy.standard_fields[self.project_key][self.issue_type]
-        self.custom_fields          = jira_proxy.custom_fields[  self.project_key][self.issue_type]
-        self.standard_field_names   = self.standard_fields.keys()
-        self.custom_field_names     = self.custom_fields.keys()
-        self.std_display_for_sys    = {}
-        for display_name, tub in self.standard_fields.items():
-            operation = 'create' if 'create' in tub else 'edit'
-            sys_name = tub[operation]['schema']['system']
-            self.std_display_for_sys[sys_name] = display_name
-        self.priority_value_for_id  = jira_proxy.priority_value_for_id
-
-        self.special = {'status'      : 'Status', 
-                        'resolution'  : 'Resolution', 
-                        'created'     : 'Created', 
-                        'updated'     : 'Updated', 
-                       }
-
-##        print("--\nin JiraIssue ...") 
-##        print(f'here is the incoming jira_item data:\n{repr(jira_item)}')
-##        print('here are all the standard fields for the target issue type:')
-##        for field_name, meta_info in self.standard_fields.items():
-##                print(f"    {field_name}    {meta_info}")
-        
-        ##sfns = "\n    ".join(self.standard_field_names)
-        ##print(f"here are the standard_field_names...\n    {sfns}")  # as Display Name 
-        #jif_keys = "\n    ".join(jira_item["fields"].keys())
-        #print(f'jira_item["fields"] has these keys: {jif_keys}')
-        #print(f"jira_item['fields'] value is: {jira_item['fields']}")
-
-        #extract the standard fields, within the jira_item['fields'] the fields are "system" names
-        std_fields = {attr_name:value for attr_name, value in jira_item["fields"].items()
-                                       if attr_name in self.std_display_for_sys
-                                       or attr_name in self.standard_fields
-                     }
-##
-##        sfns = "\n    ".join(list(std_fields.keys()))
-##        print(f"here are the std_fields that are in the jira_item...\n    {sfns}")
-##
-
-        #extract the special fields
-        special_fields = {attr_name:value for attr_name, value in jira_item["fields"].items()
-                           if attr_name in self.special}
-
-        #extract the custom  fields
-        digit_suffix_custom_fields = {attr_name:value for attr_name, value in jira_item["fields"].items()
-                                       if CUSTOM_FIELD_PREFIX_PATTERN.match(attr_name)}
-       
-        #extract other custom fields with names
-        other_custom_fields = {attr_name:value for attr_name, value in jira_item["fields"].items()
-                                if attr_name     in self.custom_field_names
-                               and attr_name not in digit_suffix_custom_fields}
-
-        # identify fields supplied that are not in a known classification
-        unrecognized_fields = {attr_name:value for attr_name, value in jira_item["fields"].items()
-                                                if attr_name not in self.standard_field_names
-                                               and attr_name not in self.std_display_for_sys
-                                               and attr_name not in self.custom_field_names
-                                               and attr_name not in special_fields
-                                               and attr_name not in digit_suffix_custom_fields
-                                               and attr_name not in other_custom_fields}
-
-        #if unrecognized_fields:
-        #    raise JiraIssueError("Unrecognized fields: " + repr(unrecognized_fields))
-
-        #process the bowls of different classification of field types
-
-        # first process the standard fields
-        for attr_name, value in std_fields.items():
-##            print(f"std_field attr_name: |{attr_name}|")
-            display_name = None
-            for field_name, meta_info in self.standard_fields.items():
-                if field_name == attr_name:
-                    display_name = field_name
-                    break
-                elif 'create' in meta_info and str(meta_info['create']['schema']['system']) == attr_name:
-                    # for reporter
-                    display_name = field_name
-                    break
-                elif 'edit'   in meta_info and str(meta_info['edit'  ]['schema']['system']) == attr_name:
-                    # for reporter
-                    display_name = field_name
-                    break
-
-            end_value = self.parseAttributeValue(value)
-            if display_name:
-                self.attribute[display_name] = end_value
-              ##  print(f"attr_name: {attr_name:<16}   display_name: {display_name:<16}  end_value: {end_value}")
-            else:
-                self.attribute[attr_name]    = end_value
-              ##  print(f"attr_name: {attr_name:<16}   display_name: {'NO DISPLAY NAME':<16}  end_value: {end_value}")
-
-        # next process the special fields
-        for attr_name, value in special_fields.items():
-            display_name = self.special[attr_name]
-            self.attribute[display_name] = self.parseAttributeValue(value)
-
-        # next do the "other" custom fields (easy...)
-        for attr_name, value in other_custom_fields.items():
-            self.attribute[attr_name] = self.parseAttributeValue(value)
-
-        # now do the somewhat more complex digit-suffixed custom fields
-        for attr_name, value in digit_suffix_custom_fields.items():
-            cf_id = attr_name.replace('customfield_', '')
-            custom_name = None
-            for display_name, meta_info in self.custom_fields.items():
-
-                if 'create' in meta_info:
-                    if  str(meta_info['create']['schema']['customId']) == cf_id:
-                      custom_name = display_name
-                elif 'edit' in meta_info:
-                    if  str(meta_info[  'edit']['schema']['customId']) == cf_id:
-                        custom_name = display_name
-
-            if not custom_name:
-                ##TODO: Add logger to JiraIssue
-                #logger.debug("JiraIssue.new: No meta data for #{attr_name}; possible obsolete custom field. ")
-                pass
-            else:
-                ##TODO Check custom field value is a hash (much like for treatment below on standard fields)
+    # only the per issue information is held by an instance, everything
+    # common to the issues of a project and issue type is in the descriptor
+    # (_own holds the values of any of the shared names below that the issue has been given)
+    __slots__ = ('_attribute', 'id', 'key', '_updated_keys', 'descriptor', '_fields', '_plan', '_original',
+                 '_own')
+
+    # names that are set on the instance, any other name set is a Jira field attribute
+    instance_names = frozenset(__slots__) | frozenset(protected_attributes) | {'attribute'}
+
+    special               = _ownProperty('special', lambda self: SPECIAL_FIELDS_VIEW)
+    version               = _sharedProperty('version')
+    project_key           = _sharedProperty('project_key')
+    issue_type            = _sharedProperty('issue_type')
+    issue_type_id         = _sharedProperty('issue_type_id')
+    logger                = _sharedProperty('logger')
+    priority_value_for_id = _sharedProperty('priority_value_for_id')
+    standard_fields       = _sharedProperty('standard_fields',      'catalog')
+    custom_fields         = _sharedProperty('custom_fields',        'catalog')
+    standard_field_names  = _sharedProperty('standard_field_names', 'catalog')
+    custom_field_names    = _sharedProperty('custom_field_names',   'catalog')
+    std_display_for_sys   = _sharedProperty('std_display_for_sys',  'catalog')
+
+    def __init__(self, jira_item, jira_proxy, lazy=False):
+        """
+            With lazy=True the fields of jira_item are kept as is and each attribute is
+            decoded when it is first read, all of them are decoded once the attribute
+            dict is used as a whole (eg., by jiralize, attributeNames, attributeValues).
+        """
+        self._updated_keys = None   # the list is made when first needed
+        self._original    = None # the value of each modified attribute before its first modification
+        self._own         = None
+        self.id           = jira_item.get("id", 0)
+        self.key          = jira_item["key"]
+        project_key       = self.key.split('-')[0]
+        issue_type        = jira_item["fields"]["issuetype"]["name"]
+
+        # the lookup tables for this project and issue type are shared by all its issues
+        self.descriptor = IssueTypeDescriptor.forIssue(jira_proxy, project_key, issue_type)
+        fields = jira_item["fields"]
+        plan   = self.descriptor.attributePlan(tuple(fields))
+        if lazy:
+            self._attribute = {}
+            self._fields    = fields
+            self._plan      = plan
+        else:
+            self._fields    = None
+            self._plan      = None
+            self._attribute = self._decodedAttributes(fields, plan, {})
 
-                # Hack for DE17528
-                if custom_name == "Sprint":
-                    if value is not None:
-                      #value.last =~ /id=(\d+)/
-                      #@attribute["Sprint"] = $1
-                      junk, value = value.split('id=', 1)
-                      self.attribute["Sprint"] = value
-                else:
-                    self.attribute[custom_name] = self.parseAttributeValue(value)
+    def _decodedAttributes(self, fields, plan, attributes):
+        """
+            the attributes of plan decoded from fields in plan order, the values
+            already in attributes are used as is and any others are added at the end
+        """
+        decoded = {}
+        for attr_name, (raw_name, treatment) in plan.items():
+            if attr_name in attributes:
+                decoded[attr_name] = attributes[attr_name]
+                continue
+            value = fields[raw_name]
+            if treatment is SPRINT_VALUE:
+                if value is None:
+                    continue
+                #value.last =~ /id=(\d+)/
+                junk, value = value.split('id=', 1)
+                decoded[attr_name] = value
+            else:
+                decoded[attr_name] = parseAttributeValue(value)
+        for attr_name, value in attributes.items():
+            if attr_name not in decoded:
+                decoded[attr_name] = value
+        return decoded
 
-        # now do the unrecognized fields (which may get flagged on an attempt to create this Jira)
-        for attr_name, value in unrecognized_fields.items():
-            self.attribute[attr_name] = self.parseAttributeValue(value)
+    def _lookup(self, name):
+        """
+            returns a tuple of whether the issue has an attribute for name and its value,
+            a lazily decoded attribute is decoded and retained on its first lookup
+        """
+        attributes = self._attribute
+        if name in attributes:
+            return True, attributes[name]
+        plan = self._plan
+        if plan is None or name not in plan:
+            return False, None
+        raw_name, treatment = plan[name]
+        value = self._fields[raw_name]
+        if treatment is SPRINT_VALUE:
+            if value is None:
+                return False, None
+            junk, value = value.split('id=', 1)
+        else:
+            value = parseAttributeValue(value)
+        attributes[name] = value
+        return True, value
 
+    @property
+    def attribute(self):
+        if self._plan is not None:
+            self._attribute = self._decodedAttributes(self._fields, self._plan, self._attribute)
+            self._fields = self._plan = None
+        return self._attribute
 
-##      print(f'here is JiraIssue instance attribute data:\n{repr(self.attribute)}')
+    @attribute.setter
+    def attribute(self, attributes):
+        self._attribute = attributes
+        self._fields = self._plan = None
 
 
     def parseAttributeValue(self, value):
-        """
-            TODO: Handle parsing of Multilevel selection/pickers field types ...?
-        """
-        parsed_value = value
-        if isinstance(value, dict):
-            if "name" in value:
-                parsed_value = value["name"]
-            elif "value" in value:
-                parsed_value = value["value"]
-        elif isinstance(value, list):
-            if not value:
-                parsed_value = None
-            else:
-                if isinstance(value[0], dict):
-                    if "name" in value[0]:
-                        parsed_value = [entry["name"]  for entry in value]
-                    elif "value" in value[0]:
-                        parsed_value = [entry["value"] for entry in value]
-                else:
-                    parsed_value = ",".join(value)
-
-        return parsed_value
+        return parseAttributeValue(value)
 
 
     # something to approximate method_missing for issue.x access for get
     def __getattr__(self, name):
-        if name in self.attribute.keys():
-            return self.attribute.get(name)
-        return None
+        if name in JiraIssue.__slots__:   # not yet set, as when copying or unpickling
+            raise AttributeError(name)
+        found, value = self._lookup(name)
+        return value
 
     # something to approximate method_missing for issue.x access for set
     def __setattr__(self, name, value):
-        if name == 'attribute':
-            super().__setattr__('attribute', value)
-        elif name in JiraIssue.protected_attributes:
+        if name in JiraIssue.instance_names:
             super().__setattr__(name, value)
         else:
-            self.__dict__['attribute'][name] = value
-            self.markUpdated(name)
+            self._modify(name, value)
 
     def __getitem__(self, name):
-        if name in self.__dict__.keys():
-            return self.__dict__.get(name, None)
-        elif name in self.__dict__['attribute']:
-            return self.__dict__['attribute'].get(name, None)
-        else:
+        if name == 'attribute' or name in JiraIssue.protected_attributes:
+            return getattr(self, name, None)
+        found, value = self._lookup(name)
+        if not found:
             raise JiraIssueError(f'JiraIssue no attribute for: {name}')
+        return value
         #print("--")
         #print(f"JiraIssue.__getitem__ called with arg of {name}")
         #print(repr(list(self.__dict__.keys())))
@@ -249,12 +435,50 @@ class JiraIssue:
             if key in self.custom_field_names and 'edit' in self.custom_fields[key]:
                 assign = True
             if assign:
-                self.__dict__['attribute'][key] = value
-                self.markUpdated(key)
+                self._modify(key, value)
+
+    def _modify(self, name, value):
+        original = self._original
+        if original is None:
+            original = self._original = {}
+        if name not in original:
+            found, prior = self._lookup(name)
+            original[name] = prior if found else NO_VALUE
+        self._attribute[name] = value
+        self.markUpdated(name)
+
+    @property
+    def updated_keys(self):
+        if self._updated_keys is None:
+            self._updated_keys = []
+        return self._updated_keys
+
+    @updated_keys.setter
+    def updated_keys(self, keys):
+        self._updated_keys = keys
 
     def markUpdated(self, key):
-        if key not in self.updated_keys:
-            self.updated_keys.append(key)
+        updated_keys = self.updated_keys
+        if key not in updated_keys:
+            updated_keys.append(key)
+
+    def markPosted(self):
+        """
+            the current values of the updated attributes are now those held by Jira,
+            they become the values later modifications are compared with
+        """
+        if self._original:
+            attributes = self._attribute
+            for name in self.updated_keys:
+                if name in attributes:
+                    self._original[name] = attributes[name]
+
+    def _originalValue(self, name):
+        """
+            the value of attribute name the issue was obtained with (or last posted),
+            NO_VALUE when the attribute hasn't been modified or the issue didn't have it
+        """
+        return self._original.get(name, NO_VALUE) if self._original else NO_VALUE
 
     def jiralize(self, mode):
         """
@@ -265,79 +489,38 @@ class JiraIssue:
                 standard and custom fields
                 special field name to id mappings
                 shaping data value types accord to attribute name / type
+            which is compiled once per project, issue type and mode into a JiralizePlan.
+            In edit mode an updated attribute whose value is the one the issue was obtained
+            with is left out, Jira already has it.
         """
-        post_data = {"fields" : {} }
-        post_data["fields"]["project"]   = {"key" : self.project_key} 
-        post_data["fields"]["issuetype"] = {"id"  : self.issue_type_id}
+        return self._jiralize(self.descriptor.jiralizePlan(mode), mode, debugEnabled(self.logger))
 
-        jira_keys = self.attribute.keys() if mode == 'create' else self.updated_keys
-        #jira_keys = self.attribute.keys() if mode == 'create' else self._updatedFields()
+    def _jiralize(self, plan, mode, debug):
+        post_data = {"fields" : {} }
+        fields = post_data["fields"]
+        fields["project"]   = {"key" : self.project_key} 
+        fields["issuetype"] = {"id"  : self.issue_type_id}
 
+        attributes = self.attribute
+        jira_keys = attributes.keys() if mode == 'create' else self.updated_keys
 
         for field_key in jira_keys:
-            value = self.attribute[field_key]
-            self.logger.debug(f"jiralize field_key: |{field_key}| has a value of |{value}|")
-            ## TODO Do key, project, status and resolution have display names ?
-            ## TODO Need to Handle multilevel selection/pickers field types.
-            # skip things that are already set or can't be set by user
-            if field_key in ['key', 'Project', 'Status', 'Created', 'Updated']:
+            value = attributes[field_key]
+            if debug:
+                self.logger.debug(f"jiralize field_key: |{field_key}| has a value of |{value}|")
+            encoder = plan.encoder(field_key)
+            if encoder is SKIP_ATTRIBUTE:
                 continue
-            if field_key == 'Issue Type':
-                # it is possible to transition a Jira issue to a different issue type
-                post_data["fields"]["issuetype"] = {"name" : value}
-                self.logger.debug(f"   setting post_data['fields']['issuetype'] to {value}")
+            original = self._originalValue(field_key) if mode == 'edit' else NO_VALUE
+            if original is not NO_VALUE and original == value:
                 continue
-
-            self.logger.debug(f"   checking to see if field_type of |{field_key}| "
-                              f" is standard, custom or unrecognized")
-            field_type   = ""
-            std_field    = False
-            custom_field = False
-
-            if field_key in self.custom_fields and mode in self.custom_fields[field_key]:
-                field_info = self.custom_fields[field_key][mode]
-                field_type = field_info["schema"]["type"]
-                # <HACK rallyid=DE17528>
-                if field_info['schema']['custom'] == 'com.pyxis.greenhopper.jira:gh-sprint':
-                    field_type = 'sprint'
-                # </HACK>
-                id = field_info["schema"]["customId"]
-                field_key = f"customfield_{id}"
-                custom_field = True
-            elif field_key in self.standard_fields and mode in self.standard_fields[field_key]:
-                field_info = self.standard_fields[field_key][mode]
-                field_type = field_info["schema"]["type"]
-                if field_key.startswith('Affects Version/s'):
-                    field_type = 'versions'
-                if field_key.startswith('Fix Version/s'):
-                    field_type = 'versions'
-                if field_key.startswith('Component/s'):
-                    field_type = 'components'
-                field_key = field_info["schema"]["system"]
-                std_field = True
-            elif field_key == 'issuetype':
-                self.logger.debug("JiraIssue instance detected a field name of 'issuetype', this field is ignored")
+            if encoder is ISSUE_TYPE_ATTRIBUTE:
+                fields["issuetype"] = {"name" : value}
                 continue
-            else:
-                problem = (f"Unrecognized field |{field_key}|, unable to accurately realize "
-                           f"postable data for this field in |{mode}| mode")
-                raise JiraIssueError(problem)
-
-            if "allowedValues" in field_info:
-                allowed_values = self._allowedValuesForField(field_type, field_info, std_field)
-                if not self._isAllowableValue(value, allowed_values):
-                    problem =  (f'"{value}" not an allowed value for the {field_info["name"]} field,'
-                                f' the allowed values for {field_key} are {repr(allowed_values)}')
-                    raise JiraIssueError(problem)
-
-
-                if custom_field and not re.search(r'versions?', field_type):
-                    field_type = "select"  
-                if custom_field and re.search(r'.*multiselect$', field_info["schema"]["custom"]):
-                    field_type = "multiselect" 
-
-            postable_value = self._postableValue(field_key, field_type, value)
-            post_data["fields"][field_key] = postable_value
+            postable = encoder.postableValue(value)
+            if original is not NO_VALUE and postable == postableOriginal(encoder, original):
+                continue   # eg., a list of versions given as the comma separated names it had
+            fields[encoder.field_key] = postable
 
         return post_data
 
@@ -376,66 +559,15 @@ class JiraIssue:
 
 
     def _allowedValuesForField(self, field_type, field_info, std_field):
-        """
-        """
-        if std_field:
-            allowed_values = [av["name"] for av in field_info["allowedValues"]]
-        else:  # must be a custom field
-            if re.search(r'versions?', field_type):  # version or versions
-                allowed_values = [av["name"] for av in field_info["allowedValues"]]
-            else:
-                allowed_values = [av["value"] for av in field_info["allowedValues"]]
-
-        return allowed_values
+        return allowedValuesForField(field_type, field_info, std_field)
 
 
     def _isAllowableValue(self, value, allowed_values): 
-        if isinstance(value, str):
-            if not re.search(r', ?', value): # value String is NOT a sequence of comma separated values
-                return (value in allowed_values)
-            else:
-                values = re.split(r', ?', value)  # either comma or comma-space between items
-                valids = [val for val in values if val in allowed_values]
-                return len(valids) == len(values)
-        elif isinstance(value, list):
-            valids = [val for val in values if val in allowed_values]
-        else:
-            return False
+        return isAllowableValue(value, allowed_values)
 
 
     def _postableValue(self, field_key, field_type, value):
-        assignment = \
-            {
-             "string"       : (lambda x: x),
-             "number"       : (lambda x: float(x)),
-             "array"        : (lambda x: [item.strip() for item in x.split(',')]),
-             "sprint"       : (lambda x: x),
-             "user"         : (lambda x: {"name"  : x}),
-             "resolution"   : (lambda x: {"name"  : x}),
-             "version"      : (lambda x: {"name"  : x}),
-             "priority"     : (lambda x: {"name"  : x}),
-             "select"       : (lambda x: {"value" : x}),
-             "multiselect"  : (lambda x: [{"value" : item.strip()} for item in x.split(",")]),
-             "timetracking" : (lambda x: x),
-             "date"         : (lambda x: str(x)),
-            #"datetime"     : (lambda x: x), # this field_type gets some special checking/transformation
-            }
-        if field_type == 'datetime':
-            if not ISO_8601_PATTERN.match(str(value)):
-                problem = f"Postable value error: {field_type} {value} is not in a standard format"
-                raise JiraIssueFieldError(problem)
-            date_time, *junk = str(value).split('.', 1)
-            postable_value = f"{date_time}.000-0000"
-        elif field_type in ['versions', 'components']:
-            postable_value = multipleValuesPossible(field_type, value)
-        elif field_type in assignment:
-            postable_value = assignment[field_type](value)
-        else:
-            problem = (f"JiraIssue.jiralize missing logic to set {field_key} "
-                       f"value (of field_type |{field_type}|) with  value = |{value}|" )
-            raise JiraIssueFieldError(problem)
-
-        return postable_value
+        return postableValue(field_key, field_type, value)
 
     def brief(self):
         """
@@ -497,6 +629,41 @@ class JiraIssue:
         return "\n".join(tank)        
 
 
+def parseAttributeValue(value):
+    """
+        the attribute value for a field value in a jira item: the name (or value) of an
+        object or of each of a list of objects, a list of strings is joined with commas
+        TODO: Handle parsing of Multilevel selection/pickers field types ...?
+    """
+    parsed_value = value
+    if isinstance(value, dict):
+        if "name" in value:
+            parsed_value = interned(value["name"])
+        elif "value" in value:
+            parsed_value = interned(value["value"])
+    elif isinstance(value, list):
+        if not value:
+            parsed_value = None
+        else:
+            if isinstance(value[0], dict):
+                if "name" in value[0]:
+                    parsed_value = [interned(entry["name"])  for entry in value]
+                elif "value" in value[0]:
+                    parsed_value = [interned(entry["value"]) for entry in value]
+            else:
+                parsed_value = ",".join(value)
+
+    return parsed_value
+
+
+def interned(value):
+    """
+        the names and values of statuses, priorities, users, select options, etc. repeat
+        across issues, interning them leaves a single copy of each distinct string
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 def multipleValuesPossible(field_type, value):
     if isinstance(value, str):
         postable_value = [{"name" : value}]
@@ -510,3 +677,92 @@ def multipleValuesPossible(field_type, value):
 
     return postable_value
 
+
+def allowedValuesForField(field_type, field_info, std_field):
+    if std_field:
+        return [av["name"] for av in field_info["allowedValues"]]
+    # must be a custom field
+    if re.search(r'versions?', field_type):  # version or versions
+        return [av["name"] for av in field_info["allowedValues"]]
+    return [av["value"] for av in field_info["allowedValues"]]
+
+
+def isAllowableValue(value, allowed_values):
+    """
+        allowed_values is best a set, a string value can be comma separated values
+        each of which has to be allowed as does every item of a list value
+    """
+    if isinstance(value, str):
+        if ',' not in value: # value String is NOT a sequence of comma separated values
+            return value in allowed_values
+        values = COMMA_SEPARATOR.split(value)  # either comma or comma-space between items
+        return all(val in allowed_values for val in values)
+    elif isinstance(value, list):
+        return all(isinstance(val, str) and val in allowed_values for val in value)
+    return False
+
+
+def postableDatetime(value):
+    if not ISO_8601_PATTERN.match(str(value)):
+        problem = f"Postable value error: datetime {value} is not in a standard format"
+        raise JiraIssueFieldError(problem)
+    date_time, *junk = str(value).split('.', 1)
+    return f"{date_time}.000-0000"
+
+
+# field type -> function making the postable value for an attribute value
+POSTABLE_VALUE = \
+    {
+     "string"       : (lambda x: x),
+     "number"       : (lambda x: float(x)),
+     "array"        : (lambda x: [item.strip() for item in x.split(',')]),
+     "sprint"       : (lambda x: x),
+     "user"         : (lambda x: {"name"  : x}),
+     "resolution"   : (lambda x: {"name"  : x}),
+     "version"      : (lambda x: {"name"  : x}),
+     "priority"     : (lambda x: {"name"  : x}),
+     "select"       : (lambda x: {"value" : x}),
+     "multiselect"  : (lambda x: [{"value" : item.strip()} for item in x.split(",")]),
+     "timetracking" : (lambda x: x),
+     "date"         : (lambda x: str(x)),
+     "datetime"     : postableDatetime,
+     "versions"     : partial(multipleValuesPossible, 'versions'),
+     "components"   : partial(multipleValuesPossible, 'components'),
+    }
+
+def postableValue(field_key, field_type, value):
+    if field_type not in POSTABLE_VALUE:
+        problem = (f"JiraIssue.jiralize missing logic to set {field_key} "
+                   f"value (of field_type |{field_type}|) with  value = |{value}|" )
+        raise JiraIssueFieldError(problem)
+    return POSTABLE_VALUE[field_type](value)
+
+
+def postableOriginal(encoder, original):
+    try:
+        return encoder.postableValue(original)
+    except (JiraIssueError, JiraIssueFieldError, ValueError, TypeError, AttributeError):
+        return NO_VALUE
+
+
+def hasFieldChanges(post_data):
+    """
+        True when the jiralize result post_data has more than the project and
+        issue type id included in every post, ie., something for Jira to change
+    """
+    fields = post_data["fields"]
+    return any(key not in ('project', 'issuetype') for key in fields) or 'id' not in fields["issuetype"]
+
+
+def jiralizeMany(jira_issues, mode):
+    """
+        the jiralize result for each of jira_issues, the issues of a project and issue type
+        sharing one JiralizePlan and the check of the logger's level made once for the batch
+    """
+    posts = []
+    debug = None
+    for jira_issue in jira_issues:
+        if debug is None:
+            debug = debugEnabled(jira_issue.logger)
+        posts.append(jira_issue._jiralize(jira_issue.descriptor.jiralizePlan(mode), mode, debug))
+    return posts
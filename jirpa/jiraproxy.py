@@ -3,19 +3,60 @@ import sys, os
 import json
 import base64
 import copy
+import mmap
 import re
 import traceback
-
-from .mutelogger import MuteLogger
-from .jiracomm   import JiraComm
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+
+from .mutelogger import MuteLogger, debugEnabled
+from .jiracomm   import JiraComm, contentSize
+from .retry      import THROTTLED_STATUS
 from .entities   import JiraServerInfo, JiraUser, JiraFieldSchema, JiraAttachmentMeta
 from .entities   import JiraAgileBoard, JiraAgileSprint
-from .jiraissue  import JiraIssue
+from .jiraissue  import JiraIssue, IssueTypeDescriptor, hasFieldChanges
+from .singleflight import SingleFlight
+from .metacatalog  import makeMetadataCatalog, MetadataCatalogError, DEFAULT_CATALOG_TTL
+from .metacatalog  import REFERENCE_TABLES, FIELD_TABLES
+from .jql          import JqlPreparer, JqlError, escapeForGet, DEFAULT_CACHE_SIZE
+from .mirror       import makeIssueMirror
+from .fieldcatalog import FieldCatalog
+from .resultrows   import RESULT_MODES, ITEM_COLUMNS, RowProjection
+from .issueframe   import IssueFrameBuilder, IssueFrameError, columnKind, requireNumpy
+from .validation   import WorkItemValidator
 
 ##################################################################################################
 
 class JiraProxyError(Exception): pass
 
+BOOTSTRAP_MODES = ['eager', 'concurrent', 'lazy']
+
+END_OF_PAGES = object()  # iterIssuesWithJql read-ahead thread sentinel
+
+SEARCH_METHODS      = ['GET', 'POST']
+MAX_GET_JQL_LENGTH  = 2000   # longer jql is sent in a POST body to stay clear of url length limits
+SEARCH_PAGE_SIZE    = 50     # the number of issues Jira returns in a search page unless asked for fewer
+
+# the modes of field information, createmeta supplies create and editmeta supplies edit
+META_MODES = ['create', 'edit']
+DEFAULT_META_NEGATIVE_TTL = 300   # seconds a project and issue type without any issues isn't searched again
+
+# reference table attributes and the JiraProxy method that sets them up
+LAZY_REFERENCE_LOADERS = {'jira_version'            : '_loadServerInfo',
+                          'issue_types'             : '_loadIssueTypes',
+                          'issue_type_map'          : '_loadIssueTypes',
+                          'issue_type_id_for_name'  : '_loadIssueTypes',
+                          'status_values'           : '_loadStatuses',
+                          'status_value_for_id'     : '_loadStatuses',
+                          'priority_values'         : '_loadPriorities',
+                          'priority_value_for_id'   : '_loadPriorities',
+                          'resolution_values'       : '_loadResolutions',
+                          'resolution_value_for_id' : '_loadResolutions',
+                         }
+
 class JiraProxy:
 
     def __init__(self, config={}):
@@ -29,13 +70,29 @@ class JiraProxy:
         password_less_config['password'] = "*****"
         password_less_config['proxy_password'] = "*****"
         self.logger.debug(f'JiraProxy config arg content: {repr(password_less_config)}')
-        self.jira_comm = JiraComm(config)
+        # bootstrap is one of:
+        #   eager      - the reference tables are obtained one after the other right here (default)
+        #   concurrent - the connection check, server info and reference tables are all
+        #                obtained at the same time on bootstrap_workers threads
+        #   lazy       - each reference table is obtained the first time it is used
+        self.bootstrap = config.get('bootstrap', 'eager')
+        if self.bootstrap not in BOOTSTRAP_MODES:
+            problem = (f"Invalid bootstrap config value: |{self.bootstrap}|, "
+                       f"valid values are: {', '.join(BOOTSTRAP_MODES)}")
+            raise JiraProxyError(problem)
+        self.bootstrap_timings = {}  # seconds taken by each bootstrap step
+        bootstrap_start = time.perf_counter()
+
+        # metadata_catalog is the path of a json file where the reference tables and field
+        # information are kept between runs, see MetadataCatalog
+        self.metadata_catalog = makeMetadataCatalog(config.get('metadata_catalog', None),
+                                                    config.get('metadata_catalog_ttl', DEFAULT_CATALOG_TTL))
+
+        check_connection = self.bootstrap != 'concurrent' or self.metadata_catalog is not None
+        self.jira_comm = self._timed('connect', JiraComm, config, check_connection=check_connection)
         self.jira_user = config['user']
 
         self.project_info   = None
-        self.issue_types    = []
-        self.issue_type_map = {}
-        self.issue_type_id_for_name = {}
         #
         # *_fields dict contains the field attributes returned by jira using createmeta and editmeta
         # *_field_names is a list of the valid field names that the user can use with issue. or issue[]
@@ -47,23 +104,187 @@ class JiraProxy:
         self.standard_field_names = {}
         self.custom_field_names   = {}
 
+        self.field_catalogs   = {}  # keyed by (project_key, issue_type), see fieldCatalog
         self.action_fields    = {}  # keyed by an action_id,
                                     # value is a list of fields valid for updating as part of the action
         self.project_versions = {}  # key at first level by project_key, 
                                     # associated value is list of versions
-        self.status_values           = []
-        self.status_value_for_id     = {}
-        self.priority_values         = []
-        self.priority_value_for_id   = {}
-        self.resolution_values       = []
-        self.resolution_value_for_id = {}
+        self._field_loads = SingleFlight()  # in progress metadata retrievals
+        self._reference_loads = SingleFlight()  # in progress lazy reference table retrievals
+        # editmeta needs an existing issue, when a search finds no issue of a project and issue type
+        # the time is kept here and no search is made for meta_negative_ttl seconds thereafter
+        self.no_sample_issue   = {}  # keyed by (project_key, issue_type)
+        self.meta_negative_ttl = float(config.get('meta_negative_ttl', DEFAULT_META_NEGATIVE_TTL))
+        self.search_buffered_pages = int(config.get('search_buffered_pages', 2))  # iterIssuesWithJql read-ahead
+        self.search_parallelism    = int(config.get('search_parallelism', 1))     # getIssuesWithJql page fan-out
+        self.field_ids_for_name = {}  # instance wide, field display name -> list of field ids
+        self.field_type_for_id  = {}  # instance wide, field id -> schema type (eg., number, user)
+        # search_method GET sends the jql in the query string (longer queries are POSTed anyway),
+        # POST always sends the jql and fields in the request body
+        self.search_method = config.get('search_method', 'GET').upper()
+        if self.search_method not in SEARCH_METHODS:
+            problem = (f"Invalid search_method config value: |{self.search_method}|, "
+                       f"valid values are: {', '.join(SEARCH_METHODS)}")
+            raise JiraProxyError(problem)
+        self.jql_preparer = JqlPreparer(cache_size=int(config.get('jql_cache_size', DEFAULT_CACHE_SIZE)))
+        # mirror is the path of a SQLite database (or an IssueMirror) recording every issue obtained
+        self.mirror = makeIssueMirror(config.get('mirror', None), self.logger)
+        self._jql_custom_names_set = False
+        # lazy_issues has JiraIssue instances decode each field value when it's first read
+        self.lazy_issues = bool(config.get('lazy_issues', False))
+        # updateIssue calls that made a PUT and those with nothing to change that didn't
+        self.update_counts = {'made' : 0, 'skipped' : 0}
+        self._update_lock  = threading.Lock()
+
+        warm = False
+        if self.metadata_catalog:
+            # a catalog snapshot is only good for the server version it was taken from
+            self._timed('serverInfo', self._loadServerInfo)
+            warm = self._timed('catalog', self._restoreFromCatalog)
+
+        if warm or self.bootstrap == 'lazy':
+            # with the lazy bootstrap jira_version, issue_types, status_values, etc.
+            # are set up by __getattr__ on first use
+            pass
+        elif self.bootstrap == 'concurrent':
+            self._concurrentBootstrap(int(config.get('bootstrap_workers', 6)))
+            self._saveCatalog()
+        else:
+            if 'jira_version' not in self.__dict__:
+                self._timed('serverInfo', self._loadServerInfo)
+            self._timed('issuetype',  self._loadIssueTypes)
+            self._timed('status',     self._loadStatuses)
+            self._timed('priority',   self._loadPriorities)
+            self._timed('resolution', self._loadResolutions)
+            self._saveCatalog()
+
+        self.bootstrap_timings['total'] = time.perf_counter() - bootstrap_start
+        steps = ", ".join(f'{step}: {seconds:.3f}' for step, seconds in self.bootstrap_timings.items())
+        self.logger.info(f'JiraProxy {self.bootstrap} bootstrap took '
+                         f'{self.bootstrap_timings["total"]:.3f} seconds ({steps})')
+
+
+    def _timed(self, step, func, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.bootstrap_timings[step] = time.perf_counter() - started
+
+
+    def _concurrentBootstrap(self, workers):
+        steps = [('issuetype',  self._loadIssueTypes),
+                 ('status',     self._loadStatuses),
+                 ('priority',   self._loadPriorities),
+                 ('resolution', self._loadResolutions),
+                ]
+        if 'jira_version' not in self.__dict__:
+            steps.insert(0, ('serverInfo', self._loadServerInfo))
+        if self.jira_comm.status is None:
+            steps.insert(0, ('connect', self.jira_comm.checkConnection))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='jirpa-bootstrap') as executor:
+            futures = [executor.submit(self._timed, step, loader) for step, loader in steps]
+        # the connection check failure is the most informative one, it comes first
+        for future in futures:
+            future.result()
+
+
+    def __getattr__(self, name):
+        # only called for attributes not (yet) set, which with the lazy bootstrap
+        # includes the reference tables until they're first used
+        loader = LAZY_REFERENCE_LOADERS.get(name, None)
+        if not loader or '_reference_loads' not in self.__dict__:
+            raise AttributeError(f"'JiraProxy' object has no attribute '{name}'")
+        self._reference_loads.do(loader, self._timed, loader.replace('_load', 'lazy '), 
+                                 getattr(self, loader))
+        if loader != '_loadServerInfo':
+            self._saveCatalog()
+        return self.__dict__[name]
+
+
+    def _metadataSnapshot(self):
+        snapshot = {'url'     : self.jira_comm.url,
+                    'user'    : self.jira_user,
+                    'version' : self.jira_version.version,
+                   }
+        # only what has been obtained so far (the lazy bootstrap may not have everything)
+        snapshot['reference'] = {table : self.__dict__[table] for table in REFERENCE_TABLES
+                                                               if table in self.__dict__}
+        # the per issue type dicts are replaced rather than updated by record_fields,
+        # so copying down to that level is enough to get a consistent view
+        snapshot['fields'] = {table : {project_key : dict(by_issue_type) for project_key, by_issue_type
+                                                     in list(getattr(self, table).items())}
+                              for table in FIELD_TABLES}
+        return snapshot
+
+
+    def _applySnapshot(self, snapshot):
+        for table, value in snapshot['reference'].items():
+            if table in REFERENCE_TABLES:
+                setattr(self, table, value)
+        for table in FIELD_TABLES:
+            for project_key, by_issue_type in snapshot['fields'].get(table, {}).items():
+                getattr(self, table).setdefault(project_key, {}).update(by_issue_type)
+
+
+    def _restoreFromCatalog(self):
+        try:
+            snapshot = self.metadata_catalog.load(self.jira_comm.url, self.jira_user,
+                                                  self.jira_version.version)
+        except MetadataCatalogError as exc:
+            self.logger.warning(str(exc))
+            return False
+        if not snapshot:
+            return False
+        self._applySnapshot(snapshot)
+        return set(REFERENCE_TABLES).issubset(snapshot['reference'])
+
+
+    def _saveCatalog(self):
+        if not self.metadata_catalog:
+            return
+        try:
+            self.metadata_catalog.save(self._metadataSnapshot())
+        except (OSError, TypeError, ValueError, MetadataCatalogError) as exc:
+            self.logger.warning(f'Unable to save metadata catalog {self.metadata_catalog.path}: {exc}')
 
-        self.jira_version = self.getServerInfo()
 
-        self.getIssueTypes()
-        self.getStatuses()
-        self.getPriorities()
-        self.getResolutions()
+    def exportMetadata(self, path=None):
+        """
+            Returns a snapshot (a json compatible dict) of the reference tables and all field
+            information obtained so far, also written to the file at path if one is given.
+            The snapshot can be handed to importMetadata of a JiraProxy on another host.
+        """
+        snapshot = self._metadataSnapshot()
+        if path:
+            with open(path, 'w') as sf:
+                json.dump(snapshot, sf)
+        return snapshot
+
+
+    def importMetadata(self, snapshot):
+        """
+            snapshot is a dict from exportMetadata or the path of a file it was written to.
+            The snapshot must come from a server at the same version as the one in use.
+        """
+        if not isinstance(snapshot, dict):
+            with open(snapshot, 'r') as sf:
+                snapshot = json.load(sf)
+        if snapshot.get('version') != self.jira_version.version:
+            problem = (f"Metadata snapshot is for Jira version {snapshot.get('version')}, "
+                       f"the server is at version {self.jira_version.version}")
+            raise JiraProxyError(problem)
+        self._applySnapshot(snapshot)
+        self._saveCatalog()
+
+
+    def invalidateMetadataCatalog(self):
+        """
+            discard the catalog snapshot for this server and user, the next JiraProxy
+            will obtain all its metadata from the server
+        """
+        if self.metadata_catalog:
+            self.metadata_catalog.invalidate(self.jira_comm.url, self.jira_user)
 
 
     def getProjects(self):
@@ -75,10 +296,12 @@ class JiraProxy:
             raise JiraProxyError(errors)
 
         # populate a dict of project_key to project name mappings in 
-        # the self.project_info instance variable
-        self.project_info = {}
+        # the self.project_info instance variable (assigned when complete, 
+        # other threads may be looking at it)
+        project_info = {}
         for proj in result:
-            self.project_info[proj["key"]] = proj["name"]
+            project_info[proj["key"]] = proj["name"]
+        self.project_info = project_info
         return self.project_info
 
 
@@ -109,6 +332,9 @@ class JiraProxy:
             raise JiraProxyError(errors) 
         return JiraServerInfo(result)
 
+    def _loadServerInfo(self):
+        self.jira_version = self.getServerInfo()
+
     def getGroups(self, username):
         # obtain the group memberships for a specific user
         criteria = {'username' :  username,  'expand': 'groups'}
@@ -183,16 +409,24 @@ class JiraProxy:
     def getIssueTypes(self):
         # instance wide info, across all projects
         if not self.issue_type_map:
-            endpoint = 'issuetype'
-            status, results, errors = self.jira_comm.getRequest(endpoint)
-            for entry in results:
-                name = entry["name"]
-                self.issue_types.append(name)
-                self.issue_type_map[name] = entry
-                self.issue_type_id_for_name[name] = int(entry["id"])
+            self._loadIssueTypes()
         return self.issue_types, self.issue_type_map
 
 
+    def _loadIssueTypes(self):
+        endpoint = 'issuetype'
+        status, results, errors = self.jira_comm.getRequest(endpoint)
+        issue_types, issue_type_map, issue_type_id_for_name = [], {}, {}
+        for entry in results:
+            name = entry["name"]
+            issue_types.append(name)
+            issue_type_map[name] = entry
+            issue_type_id_for_name[name] = int(entry["id"])
+        self.issue_types            = issue_types
+        self.issue_type_map         = issue_type_map
+        self.issue_type_id_for_name = issue_type_id_for_name
+
+
     def _buildMapFromResult(self, result):
         # build a map (dict) with each item's id as the key mapping to item's value
         ident_map = {}
@@ -203,31 +437,151 @@ class JiraProxy:
 
     def getStatuses(self):
         if not self.status_values:
-            endpoint = 'status'
-            status, result, errors = self.jira_comm.getRequest(endpoint)
-            self.status_value_for_id = self._buildMapFromResult(result)
-            #result.each do | entry | self.status_values << entry["name"] end
-            self.status_values = [entry["name"] for entry in result] 
+            self._loadStatuses()
         return self.status_values
 
+    def _loadStatuses(self):
+        endpoint = 'status'
+        status, result, errors = self.jira_comm.getRequest(endpoint)
+        self.status_value_for_id = self._buildMapFromResult(result)
+        #result.each do | entry | self.status_values << entry["name"] end
+        self.status_values = [entry["name"] for entry in result] 
+
     def getPriorities(self):
         if not self.priority_values:
-            endpoint = 'priority'
-            status, result, errors = self.jira_comm.getRequest(endpoint)
-            self.priority_value_for_id = self._buildMapFromResult(result)
-            #result.each do | entry | self.priority_values << entry["name"] end
-            self.priority_values = [entry["name"] for entry in result]
+            self._loadPriorities()
         return self.priority_values
 
+    def _loadPriorities(self):
+        endpoint = 'priority'
+        status, result, errors = self.jira_comm.getRequest(endpoint)
+        self.priority_value_for_id = self._buildMapFromResult(result)
+        #result.each do | entry | self.priority_values << entry["name"] end
+        self.priority_values = [entry["name"] for entry in result]
+
     def getResolutions(self):
         if not self.resolution_values:
-            endpoint = 'resolution'
-            status, result, errors = self.jira_comm.getRequest(endpoint)
-            self.resolution_value_for_id = self._buildMapFromResult(result)
-            #result.each do | entry | self.resolution_values << entry["name"] end
-            self.resolution_values = [entry["name"] for entry in result]
+            self._loadResolutions()
         return self.resolution_values
 
+    def _loadResolutions(self):
+        endpoint = 'resolution'
+        status, result, errors = self.jira_comm.getRequest(endpoint)
+        self.resolution_value_for_id = self._buildMapFromResult(result)
+        #result.each do | entry | self.resolution_values << entry["name"] end
+        self.resolution_values = [entry["name"] for entry in result]
+
+
+    def getFieldIdMap(self):
+        """
+            instance wide field information from the rest/api/2/field endpoint, 
+            returns a dict of field display name -> list of field ids
+            (custom fields from different contexts can share a display name)
+        """
+        if self.field_ids_for_name:
+            return self.field_ids_for_name
+        endpoint = 'field'
+        status, result, errors = self.jira_comm.getRequest(endpoint)
+        if errors:
+            raise JiraProxyError(errors)
+        field_ids_for_name = {}
+        for field in result:
+            field_ids_for_name.setdefault(field["name"], []).append(field["id"])
+            self.field_type_for_id[field["id"]] = field.get("schema", {}).get("type")
+        self.field_ids_for_name = field_ids_for_name
+        return self.field_ids_for_name
+
+
+    def _fieldIds(self, fields):
+        """
+            the list of field ids for each of fields (field display names or field ids),
+            an empty list for key or id which are always present without being fields
+        """
+        field_ids_for_name = self.getFieldIdMap()
+        known_ids = {field_id for field_ids in field_ids_for_name.values() for field_id in field_ids}
+        lower_names = {name.lower() : name for name in field_ids_for_name}
+        ids_for_fields = []
+        unknown = []
+        for field_name in fields:
+            if field_name in known_ids or field_name.startswith('*'):
+                ids = [field_name]
+            elif field_name in field_ids_for_name:
+                ids = field_ids_for_name[field_name]
+            elif field_name.lower() in lower_names:
+                ids = field_ids_for_name[lower_names[field_name.lower()]]
+            elif field_name.lower() in ITEM_COLUMNS:
+                ids = []
+            else:
+                unknown.append(field_name)
+                continue
+            ids_for_fields.append(ids)
+        if unknown:
+            problem = f'Unrecognized field name(s): {", ".join(unknown)}'
+            raise JiraProxyError(problem)
+        return ids_for_fields
+
+
+    def projectFields(self, fields):
+        """
+            Translate fields, a list of field display names (or field ids), into the value
+            for a fields query parameter naming the corresponding field ids.
+            A string (eg., "*all" or "summary,status") or None is passed through as is.
+            issuetype is always included as a JiraIssue can't be constructed without it.
+        """
+        if fields is None or isinstance(fields, str):
+            return fields
+        field_ids = ['issuetype']
+        for ids in self._fieldIds(fields):
+            field_ids.extend(field_id for field_id in ids if field_id not in field_ids)
+        return ",".join(field_ids)
+
+
+    def searchSetup(self, jql_query, fields=None, start_at=0, params=None, result='issues'):
+        """
+            returns the search options for the first page of a search (the prepared jql,
+            startAt and fields) and the function that turns a page of raw issue items into
+            results of the result mode, None for the raw mode (see getIssuesWithJql)
+        """
+        jql_query = self.prepareJql(jql_query, params)
+        fields_value, make = self._resultMaker(result, fields)
+        search_options = {'jql'      :  jql_query,
+                          'startAt'  :  start_at,
+                          'fields'   :  fields_value,
+                         }
+        return search_options, make
+
+
+    def pageOptions(self, search_options, start_at, remaining=None):
+        """
+            the search options for the page at start_at, asking for no more than remaining
+            issues (None for no limit) when that is fewer than a page holds
+        """
+        options = dict(search_options, startAt=start_at)
+        if remaining is not None and remaining < SEARCH_PAGE_SIZE:
+            options['maxResults'] = max(remaining, 1)
+        return options
+
+
+    def _resultMaker(self, result, fields):
+        """
+            returns the fields query parameter value for a search and the function that
+            turns a page of raw issue items into a list of results of the result mode (one
+            of RESULT_MODES), None for the raw mode as the raw issue items are the results
+        """
+        if result not in RESULT_MODES:
+            problem = (f"Invalid result mode: |{result}|, "
+                       f"valid result modes are: {', '.join(RESULT_MODES)}")
+            raise JiraProxyError(problem)
+        fields_value = "*all" if fields is None else self.projectFields(fields)
+        if result == 'issues':
+            return fields_value, self.makeIssueInstances
+        if result == 'raw':
+            return fields_value, None
+        if fields is None or isinstance(fields, str):
+            raise JiraProxyError("The rows result mode requires fields to be a list of field names")
+        row = RowProjection(fields, self._fieldIds(fields)).row
+        return fields_value, lambda jira_items: [row(jira_item) for jira_item in jira_items]
+
 
     def getCustomFields(self, project, issue_type):
         project_key = self._getProjectKey(project)
@@ -259,6 +613,23 @@ class JiraProxy:
         return self.standard_field_names[project_key][issue_type]
 
 
+    def fieldCatalog(self, project_key, issue_type):
+        """
+            the FieldCatalog (lookup tables) for the field information recorded
+            for project_key and issue_type, None if none has been recorded yet
+        """
+        standard_fields = self.standard_fields.get(project_key, {}).get(issue_type)
+        custom_fields   = self.custom_fields.get(project_key, {}).get(issue_type)
+        if standard_fields is None or custom_fields is None:
+            return None
+        catalog = self.field_catalogs.get((project_key, issue_type))
+        if catalog is None or not catalog.describes(standard_fields, custom_fields):
+            # field information put in place other than by record_fields (eg., importMetadata)
+            catalog = FieldCatalog(standard_fields, custom_fields)
+            self.field_catalogs[(project_key, issue_type)] = catalog
+        return catalog
+
+
     def fieldExists(self, project, issue_type, field_name):
         if issue_type not in self.issue_types:
             it_list = ", ".join(self.issue_types)
@@ -277,17 +648,9 @@ class JiraProxy:
         if re.search(r'updated|updateddate|updated date', field_name.lower()):
             return True 
 
-        standard_field_names = self.getStandardFields(project, issue_type)
-        hit = [fn.lower() for fn in standard_field_names if fn.lower() == field_name.lower()]
-        if hit:
-            return True
-
-        custom_field_names = self.getCustomFields(project, issue_type)
-        hit = [fn.lower() for fn in custom_field_names if fn.lower() == field_name.lower()]
-        if hit:
-            return True
-
-        return False
+        project_key = self._getProjectKey(project)
+        self.getStandardFields(project_key, issue_type)  # obtains the field info if not yet recorded
+        return self.fieldCatalog(project_key, issue_type).fieldExists(field_name)
 
 
     def fieldSchema(self, project, issue_type, field_name):
@@ -301,12 +664,7 @@ class JiraProxy:
             problem = (f'No such field {field_name} exists for project {project_key} '
                        f'and issue type {issue_type}')
             raise JiraProxyError(problem)
-        custom = False
-        if self.isCustomField(project_key, issue_type, field_name):
-            info = self.custom_fields[project_key][issue_type][field_name]
-            custom = True
-        else:
-            info = self.standard_fields[project_key][issue_type][field_name]
+        info, custom = self.fieldCatalog(project_key, issue_type).fieldInfo(field_name)
 
         return JiraFieldSchema(info, not custom, custom)
 
@@ -317,13 +675,9 @@ class JiraProxy:
             problem = f'bad issue type: |{issue_type}|, valid issue types are: {it_list}'
             raise JiraProxyError(problem)
 
-        custom_fields = self.getCustomFields(project, issue_type)
-        #hit = custom_fields.find {|fn| fn.downcase == field_name.to_s.downcase}
-        hit = [fn for fn in custom_fields if  fn.lower() == field_name.lower()]
-        if hit:
-            return True
-
-        return False
+        project_key = self._getProjectKey(project)
+        self.getCustomFields(project_key, issue_type)  # obtains the field info if not yet recorded
+        return self.fieldCatalog(project_key, issue_type).isCustomField(field_name)
 
 
     def _getFields(self, project, issue_type_name):
@@ -332,25 +686,32 @@ class JiraProxy:
         # eg., self.standard_fields[project_key][issue_type] = ...
         # eg., self.custom_fields  [project_key][issue_type] = ...
         project_key = self._getProjectKey(project)
-        options = {}
-        options["projectKeys"]    = project_key
-        options["issuetypeNames"] = issue_type_name
-        options["expand"]         = "projects.issuetypes.fields"
+        self._getCreateFields(project_key, issue_type_name)
+        self._getEditFields(project_key, issue_type_name)
+        self._saveCatalog()
+
+
+    def _fieldMetaOptions(self, project_key, issue_type_name):
+        return {"projectKeys"    : project_key,
+                "issuetypeNames" : issue_type_name,
+                "expand"         : "projects.issuetypes.fields"}
+
+
+    def _getCreateFields(self, project_key, issue_type_name):
+        options = self._fieldMetaOptions(project_key, issue_type_name)
         endpoint = 'issue/createmeta'
         status, field_info, errors = self.jira_comm.getRequest(endpoint, **options)
         if errors:
             problem = f'Failed issue/createmeta query for {project_key} {issue_type_name}, {errors}'
             raise JiraProxyError(problem)
 
-        try:
-            schema_info = json.dumps(json.loads(field_info, indent=4))
-        except Exception as ex:
-            schema_info = field_info
-        self.logger.debug(f"field_info returned from JIRA options-{options} were:\n{schema_info}")
+        if debugEnabled(self.logger):
+            schema_info = self.jira_comm.json_codec.pretty(field_info)
+            self.logger.debug(f"field_info returned from JIRA options-{options} were:\n{schema_info}")
         
         project_1 = field_info['projects'][0]  # should be only 1 item in field_info['projects'] list
         if not project_1['issuetypes']:
-            problem = (f'Could not find Issue Type "{issue_type_name}" in Project "{project}".  '
+            problem = (f'Could not find Issue Type "{issue_type_name}" in Project "{project_key}".  '
                        f'Ensure the Issue Type "{issue_type_name}" is available '
                        f'(via Project -> Administration -> Issue Types ...)')
             raise JiraProxyError(problem)
@@ -359,71 +720,106 @@ class JiraProxy:
         fields = issue_type_info["fields"]
         self.record_fields(project_key, issue_type_name, fields, "create")
 
-        # get an issue (any issue will do) for the project_key and issue_type_name
-        search_options = \
-            {
-             'jql'        :  f"project = {project_key} AND issuetype = '{issue_type_name}'",
-             'startAt'    :  0,
-             'maxResults' :  1,
-             'fields'     :  "*all"
-            }
-        endpoint = 'search'
-        status, result, errors = self.jira_comm.getRequest(endpoint, **search_options)
-        if errors:
-            problem = f'Failed issue search query: {search_options[:jql]}, {errors}'
-            raise JiraProxyError(problem)
 
-        # use the issue_key from the result as the issue_key 
-        # in a issue/#{issue_key}/editmeta REST call
-        if result["total"] > 0:
-            issue_key = result['issues'][0]["key"]
-            endpoint = f'issue/{issue_key}/editmeta'
-            status, field_info, errors = self.jira_comm.getRequest(endpoint, **options)
+    def _getEditFields(self, project_key, issue_type_name, issue_key=None):
+        """
+            editmeta is obtained for an existing issue, issue_key or failing that any issue
+            a search finds for the project and issue type.  When there is no such issue
+            (recently, see meta_negative_ttl) there is no edit mode field information.
+        """
+        options = self._fieldMetaOptions(project_key, issue_type_name)
+        if issue_key is None:
+            if self._noSampleIssue(project_key, issue_type_name):
+                return
+            # get an issue (any issue will do) for the project_key and issue_type_name
+            search_options = \
+                {
+                 'jql'        :  f"project = {project_key} AND issuetype = '{issue_type_name}'",
+                 'startAt'    :  0,
+                 'maxResults' :  1,
+                 'fields'     :  "*all"
+                }
+            endpoint = 'search'
+            status, result, errors = self.jira_comm.getRequest(endpoint, **search_options)
             if errors:
-                problem = f'Failed {endpoint} query for {project_key} {issue_type_name}, {errors}'
+                problem = f'Failed issue search query: {search_options["jql"]}, {errors}'
                 raise JiraProxyError(problem)
-            fields = field_info['fields']
-            self.record_fields(project_key, issue_type_name, fields, "edit")
+            if result["total"] == 0:
+                self.no_sample_issue[(project_key, issue_type_name)] = time.monotonic()
+                return
+            issue_key = result['issues'][0]["key"]
+
+        # use the issue_key as the issue_key in a issue/#{issue_key}/editmeta REST call
+        endpoint = f'issue/{issue_key}/editmeta'
+        status, field_info, errors = self.jira_comm.getRequest(endpoint, **options)
+        if errors:
+            problem = f'Failed {endpoint} query for {project_key} {issue_type_name}, {errors}'
+            raise JiraProxyError(problem)
+        fields = field_info['fields']
+        self.record_fields(project_key, issue_type_name, fields, "edit")
+        self.no_sample_issue.pop((project_key, issue_type_name), None)
+
+
+    def _noSampleIssue(self, project_key, issue_type_name):
+        """
+            True when a search for an issue of the project and issue type found none
+            within the last meta_negative_ttl seconds
+        """
+        searched = self.no_sample_issue.get((project_key, issue_type_name))
+        return searched is not None and time.monotonic() - searched < self.meta_negative_ttl
 
 
     def record_fields(self, project_key, issue_type_name, fields, mode):
         """
             record as in verb (RE-cord)
+
+            The per issue type dicts are built up as copies and put in place when
+            complete, so that other threads never see a partially recorded issue type.
         """
-        if project_key not in self.standard_fields:
-            self.standard_fields[project_key]      = {}
-            self.standard_field_names[project_key] = {}
-        if issue_type_name not in self.standard_fields[project_key]:
-            self.standard_fields[project_key][issue_type_name] = {}
-        self.standard_field_names[project_key][issue_type_name] = []
+        self.standard_fields.setdefault(project_key, {})
+        self.standard_field_names.setdefault(project_key, {})
+        standard_fields = {field_name : dict(info) for field_name, info 
+                            in self.standard_fields[project_key].get(issue_type_name, {}).items()}
+        standard_field_names = []
         standard_field_keys = [name for name in fields.keys() if not name.startswith("customfield")]
         for key in standard_field_keys:
             field_name = fields[key]["name"]
-            if field_name not in self.standard_fields[project_key][issue_type_name]:
-                self.standard_fields[project_key][issue_type_name][field_name] = {}
-            self.standard_fields[project_key][issue_type_name][field_name][mode] = fields[key]
-            self.standard_field_names[project_key][issue_type_name].append(field_name)
-        unique_list = list(set(self.standard_field_names[project_key][issue_type_name]))
-        self.standard_field_names[project_key][issue_type_name] = unique_list[:]
-
-        if project_key not in self.custom_fields:
-            self.custom_fields[project_key]      = {}
-            self.custom_field_names[project_key] = {}
-        if issue_type_name not in self.custom_fields[project_key]:
-            self.custom_fields[project_key][issue_type_name] = {}
-        self.custom_field_names[project_key][issue_type_name] = []
+            if field_name not in standard_fields:
+                standard_fields[field_name] = {}
+            standard_fields[field_name][mode] = fields[key]
+            standard_field_names.append(field_name)
+        self.standard_fields[project_key][issue_type_name] = standard_fields
+        self.standard_field_names[project_key][issue_type_name] = list(set(standard_field_names))
+
+        self.custom_fields.setdefault(project_key, {})
+        self.custom_field_names.setdefault(project_key, {})
+        custom_fields = {field_name : dict(info) for field_name, info 
+                          in self.custom_fields[project_key].get(issue_type_name, {}).items()}
+        custom_field_names = []
         custom_field_keys = [name for name in fields.keys() if name.startswith("customfield")]
         for key in custom_field_keys:
             field_name = fields[key]["name"]
-            if field_name not in self.custom_fields[project_key][issue_type_name]:
-                self.custom_fields[project_key][issue_type_name][field_name] = {}
-            self.custom_fields[project_key][issue_type_name][field_name][mode] = fields[key]
-            self.custom_field_names[project_key][issue_type_name].append(field_name)
-        unique_list = list(set(self.custom_field_names[project_key][issue_type_name]))
-        self.custom_field_names[project_key][issue_type_name] = unique_list
+            if field_name not in custom_fields:
+                custom_fields[field_name] = {}
+            custom_fields[field_name][mode] = fields[key]
+            custom_field_names.append(field_name)
+        self.custom_fields[project_key][issue_type_name] = custom_fields
+        self.custom_field_names[project_key][issue_type_name] = list(set(custom_field_names))
+
+        self.field_catalogs[(project_key, issue_type_name)] = FieldCatalog(standard_fields, custom_fields)
 
 
     def createIssue(self, project, issue_type, work_item):
+        project_key, postable_issue_data = self.prepareCreate(project, issue_type, work_item)
+        status, issue, errors = self.jira_comm.postRequest("issue", postable_issue_data)
+        return self.createdIssueKey(project_key, issue_type, issue, errors)
+
+
+    def prepareCreate(self, project, issue_type, work_item):
+        """
+            returns the project key and the data to POST to create an issue of
+            issue_type in project from work_item (as given to createIssue)
+        """
         project_key = self._getProjectKey(project)
         if issue_type not in self.issue_types:
             it_list = ", ".join(self.issue_types)
@@ -437,19 +833,52 @@ class JiraProxy:
         issue = self.makeAnIssueInstance(jira_item)
         postable_issue_data = issue.jiralize('create')
         self.logger.debug(f"will create a JIRA issue with:  {postable_issue_data}")
-        status, issue, errors = self.jira_comm.postRequest("issue", postable_issue_data)
+        return project_key, postable_issue_data
 
+
+    def createdIssueKey(self, project_key, issue_type, result, errors):
+        """
+            the key of the issue created by the POST prepared by prepareCreate,
+            a JiraProxyError is raised when the POST got back errors
+        """
         if errors:
             problem = (f'Creating issue type {issue_type} in project {project_key} '
                        f'failed: {errors}')
             raise JiraProxyError(problem)
 
-        return issue["key"]  # just the key not the whole issue
+        return result["key"]  # just the key not the whole issue
+
+
+    def validateWorkItems(self, project, issue_type, work_items):
+        """
+            Checks each of work_items (dicts as given to createIssue) against the field
+            information for the project and issue type without posting anything, returns
+            a validation.ValidationReport of the problems found by row (position in work_items).
+            Field existence, allowed values, value shape and required fields are checked,
+            once the field information is at hand no further requests are made of Jira.
+        """
+        project_key = self._getProjectKey(project)
+        if issue_type not in self.issue_types:
+            it_list = ", ".join(self.issue_types)
+            problem = f'bad issue type: |{issue_type}|, valid issue types are: {it_list}'
+            raise JiraProxyError(problem)
+
+        self.ensureMetaInformationSupport(project_key, issue_type, modes=['create'])
+        descriptor = IssueTypeDescriptor.forIssue(self, project_key, issue_type)
+        validator = WorkItemValidator(self, project_key, issue_type, descriptor)
+        return validator.validate(work_items)
 
 
-    def getIssue(self, issue_key):
+    def getIssue(self, issue_key, fields=None):
+        """
+            fields is an optional list of field display names (eg., ['Summary', 'Status', 'Story Points'])
+            limiting the fields obtained to those named, by default all fields are obtained
+        """
         endpoint = f'issue/{issue_key}'
-        status, jira_item, errors = self.jira_comm.getRequest(endpoint)
+        options = {}
+        if fields is not None:
+            options['fields'] = self.projectFields(fields)
+        status, jira_item, errors = self.jira_comm.getRequest(endpoint, **options)
         self.logger.debug(f"getIssue({issue_key}) returned status of {status}")
         if errors:
             self.logger.error(f'getIssue({issue_key}) returned {errors}')
@@ -462,78 +891,308 @@ class JiraProxy:
         return jira_issue
 
 
-    def getIssuesWithJql(self, jql_query, fields=None, start_at=0, limit=1000):
+    def prepareJql(self, jql_query, params=None):
+        """
+            Rewrite the display names in jql_query to jql field names (see JqlPreparer),
+            custom field display names become cf[NNNNN] references.
+            When params is supplied jql_query is a template and each {name} placeholder
+            is replaced by the params[name] value as a jql literal.
+        """
+        if not self._jql_custom_names_set:
+            self.jql_preparer.setCustomNames(self._customFieldJqlNames())
+            self._jql_custom_names_set = True
+        self.logger.debug(f"Initial jql: {jql_query}")
+        try:
+            jql_query = self.jql_preparer.prepare(jql_query, params)
+        except JqlError as exc:
+            raise JiraProxyError(str(exc))
+        self.logger.debug(f"Updated jql: {jql_query}")
+        return jql_query
 
-        # There are six cases where Display Names need to be replaced  with jql field names:
-        #   Affects Version/s   :   affectedVersion
-        #   Fix Version/s       :   fixVersion
-        #   Component/s         :   component
-        #   Due Date            :   duedate
-        #   Original Estimate   :   originalEstimate
-        #   Remaining Estimate  :   remainingEstimate
 
-        # Note that the Original Estimate and Remaining Estimate are not listed 
-        # in either create meta or edit meta rest calls.
+    def _customFieldJqlNames(self):
+        # display name -> cf[NNNNN] for the custom fields whose display name is unambiguous
+        try:
+            field_ids_for_name = self.getFieldIdMap()
+        except JiraProxyError as exc:
+            self.logger.warning(f'Custom field names in jql will not be rewritten: {exc}')
+            return {}
+        return {name : f"cf[{field_ids[0].replace('customfield_', '')}]"
+                      for name, field_ids in field_ids_for_name.items()
+                       if len(field_ids) == 1 and field_ids[0].startswith('customfield_')}
 
-        self.logger.debug(f"Initial jql: {jql_query}")
-        jql_query = jql_query.replace(r'Affects Version/s', "affectedVersion")
-        jql_query = jql_query.replace(r'Fix Version/s',     "fixVersion")
-        jql_query = jql_query.replace(r'Component/s',       "component")
-        jql_query = jql_query.replace(r'Due Date',           "duedate")
-        jql_query = jql_query.replace(r'Original Estimate',  "originalEstimate")
-        jql_query = jql_query.replace(r'Remaining Estimate', "remainingEstimate")
 
-        #
-        # Fix for DE17360  - ampersand char (&) and plus symbol (+) must be urlencoded as unicode code point value
-        #
-        jql_query = jql_query.replace(r'&', '\\u0026')
-        jql_query = jql_query.replace(r'+', '\\u002B')
-        jql_query = jql_query.replace(r'%', '\\u0025')
-        jql_query = jql_query.replace(r'?', '\\u003F')
-        jql_query = jql_query.replace(r'@', '\\u0040')
+    def searchPage(self, search_options):
+        """
+            search_options holds the prepared (unescaped) jql, startAt and fields
+        """
+        endpoint = 'search'
+        jql_query = search_options['jql']
+        if self.search_method == 'POST' or len(jql_query) > MAX_GET_JQL_LENGTH:
+            payload = dict(search_options)
+            if isinstance(payload.get('fields'), str):
+                payload['fields'] = payload['fields'].split(',')
+            status, result, errors = self.jira_comm.postRequest(endpoint, payload)
+        else:
+            options = dict(search_options, jql=escapeForGet(jql_query))
+            status, result, errors = self.jira_comm.getRequest(endpoint, **options)
+        if errors:
+            raise JiraProxyError(errors)
+        if not result:
+            problem = (f'JQL search returned empty results: jql: {jql_query}  '
+                       f'startAt: {search_options["startAt"]}')
+            raise JiraProxyError(problem)
+        return result
 
-        self.logger.debug(f"Updated jql: {jql_query}")
 
-        search_options = {'jql'      :  jql_query,
-                          'startAt'  :  start_at,
-                          'fields'   :  "*all" if fields is None else fields,
-                         }
+    def getIssuesWithJql(self, jql_query, fields=None, start_at=0, limit=1000, parallel=None, params=None,
+                               result='issues'):
+        """
+            fields is either a list of field display names (eg., ['Summary', 'Status']) limiting 
+            the fields obtained to those named, or a fields query parameter value (default "*all").
+
+            result is one of RESULT_MODES:
+              'issues' - a list of JiraIssue instances (the default)
+              'raw'    - a list of the issue dicts as Jira supplies them
+              'rows'   - a list of tuples holding the values of the fields (a list of names,
+                         key and id can be among them) in the order named, decoded as for
+                         JiraIssue attributes, no createmeta / editmeta information is needed
+            raw and rows results aren't recorded in a mirror.
+
+            limit is the most issues obtained, no page asks for more than the number still wanted.
+
+            params is a dict of values for the {name} placeholders when jql_query is a template,
+            eg., jql_query of 'project = {project} AND key in {keys}' 
+                 with params of {'project' : 'JEST', 'keys' : ['JEST-1', 'JEST-2']}
+
+            parallel is the number of page requests to have in flight at once after the
+            first page of results has come back (default is the search_parallelism config
+            item, itself defaulting to 1, ie., one page after the other).
+            When the server starts throttling the number in flight is halved, it creeps
+            back up by one for each page obtained without further throttling.
+        """
+        search_options, make = self.searchSetup(jql_query, fields, start_at, params, result)
+        parallel = int(parallel or self.search_parallelism)
+        if parallel > 1:
+            jira_items = self._fanOutSearch(search_options, limit, parallel)
+            return jira_items if make is None else make(jira_items)
+
         issues = []
-        result = None
-        errors = None
-        endpoint = 'search'
+        page = None
         while True:
-            status, result, errors = self.jira_comm.getRequest(endpoint, **search_options)
-            if errors:
-                raise JiraProxyError(errors)
-            if not result:
-                problem = (f'JQL search returned empty results: jql: {jql_query}  '
-                           f'startAt: {search_options[startAt]}')
-                raise JiraProxyError(problem)
+            page = self.searchPage(self.pageOptions(search_options, start_at, limit - len(issues)))
 
-            issues.extend([self.makeAnIssueInstance(jira_item) 
-                                 for jira_item in result["issues"]])
+            if make is None:
+                issues.extend(page["issues"])
+            else:
+                issues.extend(make(page["issues"]))
 
-            start_at += result["maxResults"]
-            search_options['startAt'] = start_at
+            start_at += page["maxResults"]
 
-            if len(issues) >= result["total"] or len(issues) >= limit:
+            if not page["issues"] or len(issues) >= page["total"] or len(issues) >= limit:
                 break
 
         return issues
 
 
+    def getIssueFrame(self, jql_query, fields, start_at=0, limit=None, params=None):
+        """
+            Returns an IssueFrame holding the values of fields (a list of field display names
+            or ids, key and id can be among them) for the issues matching jql_query, a numpy
+            array per field typed according to the field's schema type (see issueframe.columnKind).
+            The pages of search results are read ahead as for iterIssuesWithJql and each
+            issue goes straight into the columns, no JiraIssue instances are made.
+            Requires the numpy package.
+        """
+        try:
+            requireNumpy()
+        except IssueFrameError as exc:
+            raise JiraProxyError(str(exc))
+        if fields is None or isinstance(fields, str):
+            raise JiraProxyError("getIssueFrame requires fields to be a list of field names")
+        kinds = []
+        for ids in self._fieldIds(fields):
+            types = {self.field_type_for_id.get(field_id) for field_id in ids}
+            kinds.append(columnKind(types.pop() if len(types) == 1 else None))
+        builder = IssueFrameBuilder(fields, kinds)
+        builder.addRows(self.iterIssuesWithJql(jql_query, fields=fields, start_at=start_at, limit=limit,
+                                               params=params, result='rows'))
+        return builder.frame()
+
+
+    def _throttledCount(self):
+        by_status = self.jira_comm.retryStatistics()['by_status']
+        return sum(by_status.get(status, 0) for status in THROTTLED_STATUS)
+
+
+    def _fanOutSearch(self, search_options, limit, parallel):
+        """
+            obtain the first page, then request the pages at the remaining offsets
+            (up to limit) concurrently, returning the raw issue items in result order
+        """
+        start_at = search_options['startAt']
+        first = self.searchPage(self.pageOptions(search_options, start_at, limit))
+        page_size = first["maxResults"] or len(first["issues"])
+        end = min(first["total"], start_at + limit)
+        if not page_size or start_at + page_size >= end:
+            return first["issues"]
+
+        pages   = {start_at : first["issues"]}
+        pending = deque(range(start_at + page_size, end, page_size))
+        in_flight = {}
+        width = parallel
+        throttled = self._throttledCount()
+        with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix='jirpa-search') as executor:
+            try:
+                while pending or in_flight:
+                    while pending and len(in_flight) < width:
+                        offset = pending.popleft()
+                        options = self.pageOptions(search_options, offset, end - offset)
+                        in_flight[executor.submit(self.searchPage, options)] = offset
+                    done, not_done = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pages[in_flight.pop(future)] = future.result()["issues"]
+
+                    now_throttled = self._throttledCount()
+                    if now_throttled > throttled:
+                        width = max(1, width // 2)
+                        self.logger.info(f'JQL search throttled by the server, '
+                                         f'concurrent page requests reduced to {width}')
+                    elif width < parallel:
+                        width += 1
+                    throttled = now_throttled
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                raise
+
+        jira_items = []
+        for offset in sorted(pages):
+            jira_items.extend(pages[offset])
+        return jira_items
+
+
+    def iterIssuesWithJql(self, jql_query, fields=None, start_at=0, limit=None, buffered_pages=None,
+                                params=None, result='issues'):
+        """
+            Generator counterpart of getIssuesWithJql, JiraIssue instances (or raw issue dicts
+            or rows per result, see getIssuesWithJql) are yielded as each page of the search
+            results arrives rather than all at once at the end.
+            The following pages are obtained on a background thread while the caller works
+            on the current one, with no more than buffered_pages pages (default is the
+            search_buffered_pages config item, itself defaulting to 2) held waiting.
+            limit of None means every issue matching the query.
+            Leaving the iteration early (break, close()) stops the reading ahead.
+        """
+        search_options, make = self.searchSetup(jql_query, fields, start_at, params, result)
+        pages = queue.Queue(maxsize=buffered_pages or self.search_buffered_pages)
+        stop  = threading.Event()
+        reader = threading.Thread(target=self._readAhead, args=(search_options, limit, pages, stop),
+                                  name='jirpa-search-read-ahead', daemon=True)
+        reader.start()
+        try:
+            while True:
+                page = pages.get()
+                if page is END_OF_PAGES:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                yield from (page if make is None else make(page))
+        finally:
+            stop.set()
+
+
+    def _readAhead(self, search_options, limit, pages, stop):
+        """
+            runs on the iterIssuesWithJql background thread, puts lists of raw
+            issue items on the pages queue, followed by END_OF_PAGES or the
+            exception that ended the search
+        """
+        def deliver(item):
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        obtained = 0
+        try:
+            while not stop.is_set():
+                remaining = None if limit is None else limit - obtained
+                result = self.searchPage(self.pageOptions(search_options, search_options['startAt'], remaining))
+                jira_items = result["issues"]
+                if limit is not None:
+                    jira_items = jira_items[:limit - obtained]
+                obtained += len(jira_items)
+                if jira_items and not deliver(jira_items):
+                    return
+                search_options['startAt'] += len(result["issues"])
+                if not result["issues"] or search_options['startAt'] >= result["total"]:
+                    break
+                if limit is not None and obtained >= limit:
+                    break
+        except Exception as exc:
+            deliver(exc)
+            return
+        deliver(END_OF_PAGES)
+
+
     def updateIssue(self, issue):
-        putable_data = issue.jiralize('edit')
-        self.logger.debug(f'before call to update {issue["key"]} with {repr(putable_data)}')
+        """
+            PUTs the updated attributes of issue whose values differ from those Jira has,
+            when there are none no request is made (counted in updateStatistics)
+        """
+        putable_data = self.prepareUpdate(issue)
+        if putable_data is None:
+            return True
         status, result, errors = self.jira_comm.putRequest(f"issue/{issue.key}", putable_data)
         self.logger.debug(f'status, result, errors from update call: {status} <-> {result} <-> {errors}')
+        self.completeUpdate(issue, putable_data, errors)
+        return True
+
+
+    def prepareUpdate(self, issue):
+        """
+            returns the data to PUT for the updated attributes of issue, None (and the
+            update counted as skipped) when none of the values differ from those Jira has
+        """
+        putable_data = issue.jiralize('edit')
+        if not hasFieldChanges(putable_data):
+            self.logger.debug(f'update of {issue.key} skipped, no field values have changed')
+            self._countUpdate('skipped')
+            return None
+        self.logger.debug(f'before call to update {issue["key"]} with {repr(putable_data)}')
+        return putable_data
+
+
+    def completeUpdate(self, issue, putable_data, errors):
+        """
+            records the outcome of the PUT of putable_data (from prepareUpdate) for issue,
+            a JiraProxyError is raised when the PUT got back errors
+        """
         if errors:
             supplied_update_info = repr(putable_data["fields"])
             problem = (f'JIRA update errors for {issue.key} {errors}, '
                        f'update data provided: {supplied_update_info}')
             raise JiraProxyError(problem)
-        return True
+        issue.markPosted()
+        self._countUpdate('made')
+
+
+    def _countUpdate(self, outcome):
+        with self._update_lock:
+            self.update_counts[outcome] += 1
+
+
+    def updateStatistics(self):
+        """
+            Return a dict with the number of updateIssue calls that made a PUT request (made)
+            and the number that had no changed field values and made no request (skipped)
+        """
+        with self._update_lock:
+            return dict(self.update_counts)
 
 
     def deleteIssue(self, issue_key):
@@ -556,6 +1215,10 @@ class JiraProxy:
         if errors:
             raise JiraProxyError(errors)
 
+        return self.transitionMap(result)
+
+
+    def transitionMap(self, result):
         transitions = {}
 
         for trans in result["transitions"]:
@@ -682,46 +1345,108 @@ class JiraProxy:
         return attachment_content
 
 
+    def downloadAttachment(self, att_info, destination, chunk_size=None, checksum=None):
+        """
+            Write the content of the attachment described by att_info (a JiraAttachmentMeta)
+            to destination (a file path or a binary mode file object) without holding
+            the whole content in memory.  checksum optionally names a hashlib 
+            algorithm for a digest of the content computed during the download.
+            Returns a dict with 'bytes', 'checksum' and 'algorithm' keys.
+        """
+        status, info, errors = self.jira_comm.downloadAttachment(att_info, destination, 
+                                                                 chunk_size=chunk_size, 
+                                                                 checksum=checksum)
+        if errors:
+            raise JiraProxyError(errors)
+        return info
+
+
     def addAttachmentsToIssue(self, issue_key, attachments):
-        # each item in attachments must be a dict with
-        #  'filename', 'mimetype' and possibly 'base64content' keys
-        # If a file exists for the filename value, then the content of that
-        # file is used.
-        # If a file does NOT exist for the 'filename' key, but there is a value
-        # for the 'base64content' that can be decoded, then a temporary file
-        # with the name of filename is written with the decoded content into
-        # the current directory and provided to post_attachment, the temporary
-        # file is removed prior to returning from this method
+        # each item in attachments must be a dict with 'filename', 'mimetype' 
+        # and one of these keys providing the content:
+        #   'file_content'  - str, bytes, bytearray, memoryview or mmap
+        #   'base64content' - base64 encoded content
+        #   'file_object'   - an open binary mode file object
+        #   'file_path'     - path of the file to upload
+        # If none of those are present and a file exists for the filename value,
+        # then the content of that file is used.
+        # File content is streamed to Jira, not read into memory.
         endpoint = f'attachment/meta'
         status, info, errors = self.jira_comm.getRequest(endpoint)
-        if not info["enabled"]:
-            problem = "Uploading attachments not enabled"
-            raise JiraProxyError(problem)
-        size_limit = int(info["uploadLimit"])
+        size_limit = self.attachmentSizeLimit(info)
         result = {}
         for att_info in attachments:
-            # determine if att_info['filename'] exists
-            # and if not, does att_info['base64content'] exist?
-            # if it does, decode the base64content and  
-            # write it into a file name named for att_info['filename']
-
-            filename = att_info['filename']
-            if att_info.get('file_content', False):
-                att_info['file_content'] = str(att_info['file_content'])
-            if att_info.get('base64content', False):
-                att_info['file_content'] = base64.b64decode(att_info['base64content']).decode('UTF-8')
-            result[filename] = {"added" : True, "error" : None}
-            file_size = len(att_info['file_content'])
-            if file_size > size_limit:
-                err_msg = f"{filename} filesize of {file_size} too large for upload, skipped"
-                result[filename] = {"added" :  False, "error" :  err_msg}
-            else:
-                status, info, errors = self.jira_comm.postAttachment(issue_key, att_info)
-                if errors:
-                    result[filename] = {"added" :  False, "error" :  errors}
+            upload_info, outcome = self.prepareAttachment(att_info, size_limit)
+            if upload_info:
+                status, info, errors = self.jira_comm.postAttachment(issue_key, upload_info)
+                outcome = self.attachmentOutcome(errors)
+            result[att_info['filename']] = outcome
         return result
 
 
+    def attachmentSizeLimit(self, info):
+        """
+            the upload size limit from info (the attachment/meta result), a
+            JiraProxyError is raised when uploading attachments isn't enabled
+        """
+        if not info["enabled"]:
+            problem = "Uploading attachments not enabled"
+            raise JiraProxyError(problem)
+        return int(info["uploadLimit"])
+
+
+    def prepareAttachment(self, att_info, size_limit):
+        """
+            returns the dict to hand to JiraComm.postAttachment for att_info (see
+            addAttachmentsToIssue) and None, or None and the addAttachmentsToIssue
+            outcome when the content is larger than size_limit and isn't to be uploaded
+        """
+        filename = att_info['filename']
+        upload_info, file_size = self._attachmentUpload(att_info)
+        if file_size > size_limit:
+            err_msg = f"{filename} filesize of {file_size} too large for upload, skipped"
+            return None, {"added" :  False, "error" :  err_msg}
+        return upload_info, None
+
+
+    def attachmentOutcome(self, errors):
+        if errors:
+            return {"added" :  False, "error" :  errors}
+        return {"added" : True, "error" : None}
+
+
+    def _attachmentUpload(self, att_info):
+        """
+            Given an addAttachmentsToIssue att_info dict, return the dict to hand to
+            JiraComm.postAttachment along with the size in bytes of the content
+        """
+        upload_info = {'filename' : att_info['filename'], 'mimetype' : att_info['mimetype']}
+        content = att_info.get('file_content', None)
+        if content:
+            if not isinstance(content, (str, bytes, bytearray, memoryview, mmap.mmap)):
+                content = str(content)
+            if isinstance(content, str):
+                content = content.encode('UTF-8')
+            upload_info['file_content'] = content
+        elif att_info.get('base64content', False):
+            upload_info['file_content'] = base64.b64decode(att_info['base64content'])
+        elif att_info.get('file_object', None):
+            upload_info['file_object'] = att_info['file_object']
+        elif att_info.get('file_path', None) or os.path.isfile(att_info['filename']):
+            upload_info['file_path'] = att_info.get('file_path', None) or att_info['filename']
+        else:
+            problem = f"No content for attachment {att_info['filename']} has been provided"
+            raise JiraProxyError(problem)
+
+        if 'file_path' in upload_info:
+            file_size = os.path.getsize(upload_info['file_path'])
+        elif 'file_object' in upload_info:
+            file_size = contentSize(upload_info['file_object'])
+        else:
+            file_size = contentSize(upload_info['file_content'])
+        return upload_info, file_size
+
+
     def getPermissions(self, project):
         project_key = self._getProjectKey(project)
         options = {'projectKey' :  project_key}
@@ -771,6 +1496,8 @@ class JiraProxy:
         if project_identifier:
             option['projectKeyOrId'] = project_identifier
         status, response, errors = self.jira_comm.getRequest(endpoint, **option)
+        if errors:
+            raise JiraProxyError(errors)
         # potentially look at 'maxResults', 'startAt', 'isLast' to see if more pages have to be retrieved...
         boards = [JiraAgileBoard(info) for info in response['values']]
         return boards
@@ -790,27 +1517,107 @@ class JiraProxy:
         endpoint = self.jira_comm.url + f'/rest/agile/1.0/board/{boardId}/sprint'
         option = {'verbatim_url' : True}
         status, response, errors = self.jira_comm.getRequest(endpoint, **option)
+        if errors:
+            raise JiraProxyError(errors)
         sprints = [JiraAgileSprint(info) for info in response['values']]
         return sprints
 
-    def ensureMetaInformationSupport(self, project_key, issue_type):
-        if project_key not in self.standard_fields:
-            self._getFields(project_key, issue_type)
-        if issue_type not in self.standard_fields[project_key]:
-            self._getFields(project_key, issue_type)
+    def getSprintIssues(self, project_identifier, target_board, target_sprint, fields=None):
+        """
+            Get the issues in the sprint named target_sprint of the board named target_board
+            from the endpoint /rest/agile/1.0/board/{boardId}/sprint/{sprintId}/issue.
+            fields is an optional list of field display names limiting the fields obtained
+            for each issue (as for getIssuesWithJql).
+        """
+        boards = self.getAgileBoards(project_identifier)
+        hits = [board.id for board in boards if board.name == target_board ]
+        if not hits:
+            return []
+        boardId = hits[0]
+        sprints = self.getAgileSprints(project_identifier, target_board)
+        hits = [sprint.id for sprint in sprints if sprint.name == target_sprint]
+        if not hits:
+            return []
+        sprintId = hits[0]
+
+        endpoint = self.jira_comm.url + f'/rest/agile/1.0/board/{boardId}/sprint/{sprintId}/issue'
+        option = {'verbatim_url' : True,
+                  'startAt'      : 0,
+                 }
+        if fields is not None:
+            option['fields'] = self.projectFields(fields)
+        issues = []
+        while True:
+            status, response, errors = self.jira_comm.getRequest(endpoint, **option)
+            if errors:
+                raise JiraProxyError(errors)
+            issues.extend(self.makeIssueInstances(response['issues']))
+            option['startAt'] += len(response['issues'])
+            if not response['issues'] or option['startAt'] >= response['total']:
+                break
+        return issues
 
-        if "Summary" not in self.standard_fields[project_key][issue_type]:
+    def ensureMetaInformationSupport(self, project_key, issue_type, modes=META_MODES, issue_key=None):
+        """
+            obtains the field information in each of modes not yet held for project_key and
+            issue_type, ['create'] suffices for creating issues.  The edit mode information
+            is obtained with the editmeta of issue_key when given (eg., an issue just fetched),
+            otherwise with that of an issue found by a search.
+        """
+        # threads needing the same (project_key, issue_type) metadata at the same time
+        # wait on a single retrieval instead of each doing their own
+        for mode in modes:
+            if not self._metaInformationComplete(project_key, issue_type, mode, issue_key):
+                self._field_loads.do((project_key, issue_type, mode), 
+                                     self._ensureMetaInformation, project_key, issue_type, mode, issue_key)
+
+        if "Summary" not in self.standard_fields.get(project_key, {}).get(issue_type, {}):
             problem = (f'Error in jiraProxy.ensureMetaInformationSupport for '
                        f' project_key : {project_key}, issue_type: {issue_type} : '
                        f'Summary field does not exist.')
             raise JiraProxyError(problem)
-        if 'edit' not in self.standard_fields[project_key][issue_type]["Summary"]:
-            self._getFields(project_key, issue_type)
-        # assert that self.standard_fields has project_key at first level, issue_type at second level
 
 
-    def makeAnIssueInstance(self, jira_item):
+    def _metaInformationComplete(self, project_key, issue_type, mode='edit', issue_key=None):
+        std_fields = self.standard_fields.get(project_key, {}).get(issue_type, {})
+        if mode in std_fields.get("Summary", {}):
+            return True
+        # with no issue to go by, a recent search having found none will find none now
+        return mode == 'edit' and issue_key is None and self._noSampleIssue(project_key, issue_type)
+
+
+    def _ensureMetaInformation(self, project_key, issue_type, mode, issue_key):
+        if self._metaInformationComplete(project_key, issue_type, mode, issue_key):
+            return   # obtained by another thread in the meantime
+        if mode == 'create':
+            self._getCreateFields(project_key, issue_type)
+        else:
+            self._getEditFields(project_key, issue_type, issue_key)
+        self._saveCatalog()
+
+
+    def makeIssueInstances(self, jira_items):
+        """
+            JiraIssue instances for jira_items (eg., a page of search results),
+            recorded in the mirror (when there is one) in a single transaction
+        """
+        issues = [self.makeAnIssueInstance(jira_item, record=False) for jira_item in jira_items]
+        self._recordInMirror(jira_items)
+        return issues
 
+
+    def _recordInMirror(self, jira_items):
+        # issues put together locally (eg., by createIssue) have no id and aren't mirrored
+        if self.mirror:
+            obtained = [jira_item for jira_item in jira_items if 'id' in jira_item]
+            if obtained:
+                self.mirror.storeMany(obtained, self)
+
+
+    def makeAnIssueInstance(self, jira_item, record=True):
+        """
+            record=False leaves recording jira_item in the mirror to the caller
+        """
         proj_key   = None
         issue_type = None
 
@@ -858,7 +1665,12 @@ class JiraProxy:
 
         try:
             self.logger.debug(f"Calling ensureMetaInformationSupport for proj_key: {proj_key}, issue_type: {issue_type}")
-            self.ensureMetaInformationSupport(proj_key, issue_type)
+            if 'id' in jira_item:
+                # an issue obtained from Jira, its own editmeta supplies the edit mode information
+                self.ensureMetaInformationSupport(proj_key, issue_type, issue_key=jira_item['key'])
+            else:
+                # an issue put together locally to be created (eg., by createIssue)
+                self.ensureMetaInformationSupport(proj_key, issue_type, modes=['create'])
         except Exception as ex:
             exc_type, exc_value, exc_tb = sys.exc_info()
             tb = traceback.format_tb(exc_tb)
@@ -870,9 +1682,8 @@ class JiraProxy:
 
         try:
             self.logger.debug(f"Attempting to obtain a JiraIssue instance for {jira_item['key']}")
-            jira_issue = JiraIssue(jira_item, self)
+            jira_issue = JiraIssue(jira_item, self, lazy=self.lazy_issues)
             self.logger.debug(f"Obtained JiraIssue for {jira_issue.key}")
-            return jira_issue
         except Exception as ex:
             exc_type, exc_value, exc_tb = sys.exc_info()
             tb = traceback.format_tb(exc_tb)
@@ -882,3 +1693,7 @@ class JiraProxy:
             self.logger.error(problem)
             raise JiraProxyError(brief)
 
+        if record:
+            self._recordInMirror([jira_item])
+        return jira_issue
+
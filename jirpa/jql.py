@@ -0,0 +1,138 @@
+# jql file for jirpa package
+
+import re
+import threading
+from collections import OrderedDict
+
+###################################################################################
+
+class JqlError(Exception): pass
+
+# Display Names (as seen in createmeta / editmeta) that need to be replaced with jql field names.
+# Note that the Original Estimate and Remaining Estimate are not listed
+# in either create meta or edit meta rest calls.
+STANDARD_DISPLAY_NAMES = {'Affects Version/s'  : 'affectedVersion',
+                          'Fix Version/s'      : 'fixVersion',
+                          'Component/s'        : 'component',
+                          'Due Date'           : 'duedate',
+                          'Original Estimate'  : 'originalEstimate',
+                          'Remaining Estimate' : 'remainingEstimate',
+                         }
+
+# Fix for DE17360  - ampersand char (&), plus symbol (+), etc. must be sent as unicode
+# code point values when the jql travels in a query string (not needed for a POST)
+GET_ESCAPES = str.maketrans({'&' : '\\u0026',
+                             '+' : '\\u002B',
+                             '%' : '\\u0025',
+                             '?' : '\\u003F',
+                             '@' : '\\u0040',
+                            })
+
+QUOTED_PATTERN = r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''
+OPERATOR_AHEAD = re.compile(r'\s*(?:!=|!~|>=|<=|=|~|>|<|(?:not\s+in|in|is\s+not|is|was\s+not|was|changed)\b)',
+                            re.IGNORECASE)
+ORDER_BY       = re.compile(r'\border\s+by\b', re.IGNORECASE)
+PLACEHOLDER    = re.compile(QUOTED_PATTERN + r'|\{(\w+)\}')
+
+DEFAULT_CACHE_SIZE = 256
+
+def escapeForGet(jql):
+    return jql.translate(GET_ESCAPES)
+
+def jqlLiteral(value):
+    """
+        render a template parameter value as a jql literal,
+        lists, tuples and sets become a parenthesized list for use with in / not in
+    """
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return '(' + ', '.join(jqlLiteral(item) for item in value) + ')'
+    if isinstance(value, bool) or value is None:
+        raise JqlError(f'No jql literal form for {value!r}')
+    if isinstance(value, (int, float)):
+        return str(value)
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{text}"'
+
+
+class JqlPreparer:
+    """
+        Rewrites the field display names in a jql query to jql field names in a single
+        pass that leaves quoted literals alone (other than a quoted display name used
+        as a field, eg., "Story Points" > 3).  The six STANDARD_DISPLAY_NAMES are
+        rewritten wherever they appear, custom field display names (supplied as
+        display name -> cf[NNNNN]) only where they're followed by an operator or
+        are in the ORDER BY clause.
+        Prepared queries are cached, templates with {name} placeholders are prepared
+        once and have the parameter values substituted as jql literals on each use.
+    """
+    def __init__(self, custom_names=None, cache_size=DEFAULT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.cache      = OrderedDict()
+        self.lock       = threading.Lock()
+        self.setCustomNames(custom_names or {})
+
+    def setCustomNames(self, custom_names):
+        standard = {name.lower() : jql_name for name, jql_name in STANDARD_DISPLAY_NAMES.items()}
+        custom   = {name.lower() : jql_name for name, jql_name in custom_names.items()
+                                             if name.lower() not in standard}
+        # longest first so that a name isn't pre-empted by a shorter name it starts with
+        names = sorted(list(standard) + list(custom), key=len, reverse=True)
+        alternation = '|'.join(re.escape(name) for name in names)
+        pattern = QUOTED_PATTERN
+        if alternation:
+            pattern += r'|(?<![\w.\[])(?:' + alternation + r')(?![\w/])'
+        with self.lock:
+            self.standard = standard
+            self.custom   = custom
+            self.pattern  = re.compile(pattern, re.IGNORECASE)
+            self.cache.clear()
+
+    def prepare(self, jql, params=None):
+        with self.lock:
+            prepared = self.cache.get(jql)
+            if prepared is not None:
+                self.cache.move_to_end(jql)
+        if prepared is None:
+            prepared = self.rewrite(jql)
+            with self.lock:
+                self.cache[jql] = prepared
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        if params is not None:
+            prepared = self.substitute(prepared, params)
+        return prepared
+
+    def rewrite(self, jql):
+        with self.lock:
+            pattern, standard, custom = self.pattern, self.standard, self.custom
+
+        def replacement(match):
+            token = match.group(0)
+            quoted = token[0] in '"\''
+            name = token[1:-1].lower() if quoted else token.lower()
+            if name not in standard and name not in custom:
+                return token
+            in_field_position = (OPERATOR_AHEAD.match(jql, match.end()) is not None
+                                 or ORDER_BY.search(jql, 0, match.start()) is not None)
+            if name in standard and (not quoted or in_field_position):
+                return standard[name]
+            if name in custom and in_field_position:
+                return custom[name]
+            return token
+
+        return pattern.sub(replacement, jql)
+
+    def substitute(self, jql, params):
+        def replacement(match):
+            name = match.group(1)
+            if name is None:   # a quoted literal
+                return match.group(0)
+            if name not in params:
+                raise JqlError(f'No value supplied for jql template parameter {{{name}}}')
+            return jqlLiteral(params[name])
+
+        return PLACEHOLDER.sub(replacement, jql)
+
+    def statistics(self):
+        with self.lock:
+            return {'cached' : len(self.cache), 'cache_size' : self.cache_size}
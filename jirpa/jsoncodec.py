@@ -0,0 +1,86 @@
+# jsoncodec file for jirpa package
+
+import json
+
+###################################################################################
+
+class JsonCodecError(Exception): pass
+
+class JsonCodec:
+    """
+        JSON backend based on the standard library json module.
+        Subclasses wrap the optional orjson and ujson packages.
+        dumps gives back UTF-8 encoded bytes, a str request body would be sent as Latin-1.
+    """
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj).encode('UTF-8')
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def pretty(self, obj):
+        return json.dumps(obj, indent=4)
+
+
+class OrjsonCodec(JsonCodec):
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self.orjson = orjson
+
+    def dumps(self, obj):
+        return self.orjson.dumps(obj)   # already UTF-8 encoded bytes
+
+    def loads(self, data):
+        return self.orjson.loads(data)
+
+    def pretty(self, obj):
+        return self.orjson.dumps(obj, option=self.orjson.OPT_INDENT_2).decode('UTF-8')
+
+
+class UjsonCodec(JsonCodec):
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self.ujson = ujson
+
+    def dumps(self, obj):
+        return self.ujson.dumps(obj, ensure_ascii=False).encode('UTF-8')
+
+    def loads(self, data):
+        return self.ujson.loads(data)
+
+    def pretty(self, obj):
+        return self.ujson.dumps(obj, indent=4, ensure_ascii=False)
+
+
+JSON_CODECS = {'json'   : JsonCodec,
+               'orjson' : OrjsonCodec,
+               'ujson'  : UjsonCodec,
+              }
+
+def getJsonCodec(name='json'):
+    """
+        name is one of json, orjson, ujson or auto (fastest one installed),
+        a JsonCodec instance is passed back as is
+    """
+    if isinstance(name, JsonCodec):
+        return name
+    if name == 'auto':
+        for candidate in ['orjson', 'ujson']:
+            try:
+                return JSON_CODECS[candidate]()
+            except ImportError:
+                pass
+        return JsonCodec()
+    if name not in JSON_CODECS:
+        problem = f'Unknown json_codec: |{name}|, valid values are: auto, {", ".join(JSON_CODECS)}'
+        raise JsonCodecError(problem)
+    try:
+        return JSON_CODECS[name]()
+    except ImportError:
+        raise JsonCodecError(f'json_codec {name} requested but the {name} package is not installed')
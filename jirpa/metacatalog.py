@@ -0,0 +1,110 @@
+# metacatalog file for jirpa package
+
+import os
+import json
+import time
+import threading
+
+###################################################################################
+
+class MetadataCatalogError(Exception): pass
+
+CATALOG_FORMAT      = 1
+DEFAULT_CATALOG_TTL = 24 * 60 * 60   # seconds
+
+# JiraProxy attributes held in a catalog snapshot
+REFERENCE_TABLES = ['issue_types', 'issue_type_map', 'issue_type_id_for_name',
+                    'status_values',     'status_value_for_id',
+                    'priority_values',   'priority_value_for_id',
+                    'resolution_values', 'resolution_value_for_id',
+                   ]
+FIELD_TABLES     = ['standard_fields', 'custom_fields', 'standard_field_names', 'custom_field_names']
+
+class MetadataCatalog:
+    """
+        A json file holding JiraProxy metadata snapshots (the reference tables and the
+        createmeta/editmeta field information per project and issue type) so that a new
+        JiraProxy can start without retrieving any of it.
+        Snapshots are keyed by server url and user, and a snapshot is only good for the
+        server version it was taken from and for ttl seconds after it was saved.
+        The file can hold snapshots for any number of url/user combinations.
+    """
+    def __init__(self, path, ttl=DEFAULT_CATALOG_TTL):
+        self.path = path
+        self.ttl  = ttl
+        self.lock = threading.Lock()
+
+    def key(self, url, user):
+        return f'{user}@{url}'
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as cf:
+                catalog = json.load(cf)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            raise MetadataCatalogError(f'Unable to read metadata catalog {self.path}: {exc}')
+        if catalog.get('format') != CATALOG_FORMAT:
+            return {}
+        return catalog.get('snapshots', {})
+
+    def _write(self, snapshots):
+        # serialized before anything is written so that a snapshot json can't
+        # represent leaves the file as it was and no partial temp file behind
+        try:
+            content = json.dumps({'format' : CATALOG_FORMAT, 'snapshots' : snapshots})
+        except (TypeError, ValueError) as exc:
+            raise MetadataCatalogError(f'Unable to serialize metadata catalog {self.path}: {exc}')
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f'{self.path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'w') as tf:
+            tf.write(content)
+        os.replace(temp_path, self.path)
+
+    def load(self, url, user, version):
+        """
+            the snapshot for url and user if it was taken from a server at version
+            and hasn't outlived the ttl, otherwise None
+        """
+        with self.lock:
+            snapshot = self._read().get(self.key(url, user))
+        if not snapshot:
+            return None
+        if snapshot.get('version') != version:
+            return None
+        if self.ttl is not None and time.time() - snapshot.get('saved_at', 0) > self.ttl:
+            return None
+        return snapshot
+
+    def save(self, snapshot):
+        snapshot = dict(snapshot, saved_at=time.time())
+        with self.lock:
+            snapshots = self._read()
+            snapshots[self.key(snapshot['url'], snapshot['user'])] = snapshot
+            self._write(snapshots)
+
+    def invalidate(self, url=None, user=None):
+        """
+            drop the snapshot for url and user, or every snapshot when no url is given
+        """
+        with self.lock:
+            if url is None:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            snapshots = self._read()
+            if snapshots.pop(self.key(url, user), None) is not None:
+                self._write(snapshots)
+
+
+def makeMetadataCatalog(setting, ttl=DEFAULT_CATALOG_TTL):
+    """
+        setting is the metadata_catalog config value, a MetadataCatalog instance or a file path
+    """
+    if not setting:
+        return None
+    if isinstance(setting, MetadataCatalog):
+        return setting
+    return MetadataCatalog(setting, ttl)
@@ -0,0 +1,264 @@
+# mirror file for jirpa package
+
+import json
+import time
+import sqlite3
+import threading
+from datetime import timezone
+
+from .mutelogger import MuteLogger
+from .deltasync  import parseJiraTimestamp, DeltaSyncError
+from .jiraissue  import JiraIssue
+from .fieldcatalog import FieldCatalog
+
+###################################################################################
+
+class IssueMirrorError(Exception): pass
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS issue (
+        key          TEXT PRIMARY KEY,
+        id           TEXT,
+        project_key  TEXT NOT NULL,
+        issue_type   TEXT NOT NULL,
+        status       TEXT,
+        assignee     TEXT,
+        updated      TEXT,
+        fields       TEXT NOT NULL,
+        mirrored_at  REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS issue_project    ON issue (project_key);
+    CREATE INDEX IF NOT EXISTS issue_issue_type ON issue (issue_type);
+    CREATE INDEX IF NOT EXISTS issue_status     ON issue (status);
+    CREATE INDEX IF NOT EXISTS issue_assignee   ON issue (assignee);
+    CREATE INDEX IF NOT EXISTS issue_updated    ON issue (updated);
+
+    CREATE TABLE IF NOT EXISTS field_meta (
+        project_key      TEXT NOT NULL,
+        issue_type       TEXT NOT NULL,
+        standard_fields  TEXT NOT NULL,
+        custom_fields    TEXT NOT NULL,
+        PRIMARY KEY (project_key, issue_type)
+    );
+
+    CREATE TABLE IF NOT EXISTS reference (
+        name   TEXT PRIMARY KEY,
+        value  TEXT NOT NULL
+    );
+"""
+
+# JiraProxy attributes a JiraIssue takes from the proxy besides the per issue type field info
+MIRRORED_REFERENCES = ['issue_type_id_for_name', 'priority_value_for_id']
+
+QUERY_COLUMNS = ['project_key', 'issue_type', 'status', 'assignee']
+
+def normalizedTimestamp(value):
+    """
+        updated in UTC so that the text column sorts and compares chronologically
+    """
+    if not value:
+        return None
+    try:
+        return parseJiraTimestamp(value).astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + '+0000'
+    except DeltaSyncError:
+        return value
+
+def userIdentity(value):
+    if isinstance(value, dict):
+        return value.get('name') or value.get('accountId') or value.get('displayName')
+    return value
+
+
+class MirroredVersion:
+    def __init__(self, version):
+        self.version = version
+
+
+class MirroredProxy:
+    """
+        Stands in for the JiraProxy a JiraIssue is constructed with, supplying the
+        metadata recorded in the mirror so that no requests are made to Jira
+    """
+    def __init__(self, mirror, logger):
+        self.mirror          = mirror
+        self.logger          = logger
+        self.standard_fields = {}
+        self.custom_fields   = {}
+        self.field_catalogs  = {}
+        references = mirror.references()
+        self.jira_version = MirroredVersion(references.get('jira_version'))
+        for name in MIRRORED_REFERENCES:
+            setattr(self, name, references.get(name, {}))
+
+    def ensureFieldInfo(self, project_key, issue_type):
+        if issue_type in self.standard_fields.get(project_key, {}):
+            return
+        standard_fields, custom_fields = self.mirror.fieldInfo(project_key, issue_type)
+        self.standard_fields.setdefault(project_key, {})[issue_type] = standard_fields
+        self.custom_fields.setdefault(project_key, {})[issue_type] = custom_fields
+        self.field_catalogs[(project_key, issue_type)] = FieldCatalog(standard_fields, custom_fields)
+
+    def fieldCatalog(self, project_key, issue_type):
+        return self.field_catalogs[(project_key, issue_type)]
+
+
+class IssueMirror:
+    """
+        SQLite database holding issues obtained through a JiraProxy (the raw fields of
+        each along with indexed key, project, issue type, status, assignee and updated
+        columns) and the metadata needed to reconstruct JiraIssue instances offline.
+        A JiraProxy given a mirror config item (a database path or an IssueMirror)
+        records every issue it obtains from Jira.
+    """
+    def __init__(self, path, logger=None):
+        self.path   = path
+        self.logger = logger or MuteLogger()
+        self.lock   = threading.Lock()
+        self.conn   = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self._recorded_meta = set()   # (project_key, issue_type) field info written by this instance
+        self._recorded_references = False
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def store(self, jira_item, jira_proxy):
+        """
+            record (or refresh) jira_item, fields already mirrored for the issue that
+            aren't in jira_item (eg., it was obtained with only some fields) are kept
+        """
+        self.storeMany([jira_item], jira_proxy)
+
+    def storeMany(self, jira_items, jira_proxy):
+        now = time.time()
+        with self.lock:
+            with self.conn:
+                self._recordReferences(jira_proxy)
+                for jira_item in jira_items:
+                    fields = jira_item['fields']
+                    key = jira_item['key']
+                    project_key = key.split('-')[0]
+                    issue_type  = fields['issuetype']['name']
+                    row = self.conn.execute('SELECT fields FROM issue WHERE key = ?', (key,)).fetchone()
+                    if row:
+                        fields = dict(json.loads(row[0]), **fields)
+                    status = fields.get('status')
+                    self.conn.execute('INSERT OR REPLACE INTO issue VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                      (key, jira_item.get('id'), project_key, issue_type,
+                                       status.get('name') if isinstance(status, dict) else status,
+                                       userIdentity(fields.get('assignee')),
+                                       normalizedTimestamp(fields.get('updated')),
+                                       json.dumps(fields), now))
+                    self._recordFieldInfo(project_key, issue_type, jira_proxy)
+
+    def _recordReferences(self, jira_proxy):
+        if self._recorded_references:
+            return
+        references = {name : getattr(jira_proxy, name) for name in MIRRORED_REFERENCES}
+        references['jira_version'] = jira_proxy.jira_version.version
+        self.conn.executemany('INSERT OR REPLACE INTO reference VALUES (?, ?)',
+                              [(name, json.dumps(value)) for name, value in references.items()])
+        self._recorded_references = True
+
+    def _recordFieldInfo(self, project_key, issue_type, jira_proxy):
+        if (project_key, issue_type) in self._recorded_meta:
+            return
+        standard_fields = jira_proxy.standard_fields.get(project_key, {}).get(issue_type)
+        custom_fields   = jira_proxy.custom_fields.get(project_key, {}).get(issue_type)
+        if standard_fields is None or custom_fields is None:
+            return
+        self.conn.execute('INSERT OR REPLACE INTO field_meta VALUES (?, ?, ?, ?)',
+                          (project_key, issue_type, json.dumps(standard_fields), json.dumps(custom_fields)))
+        self._recorded_meta.add((project_key, issue_type))
+
+    def references(self):
+        with self.lock:
+            rows = self.conn.execute('SELECT name, value FROM reference').fetchall()
+        return {name : json.loads(value) for name, value in rows}
+
+    def fieldInfo(self, project_key, issue_type):
+        with self.lock:
+            row = self.conn.execute('SELECT standard_fields, custom_fields FROM field_meta '
+                                    'WHERE project_key = ? AND issue_type = ?',
+                                    (project_key, issue_type)).fetchone()
+        if not row:
+            raise IssueMirrorError(f'No field information mirrored for {project_key} {issue_type}')
+        return json.loads(row[0]), json.loads(row[1])
+
+    def _select(self, columns, keys=None, updated_since=None, order_by='key', limit=None, **criteria):
+        clauses, values = [], []
+        for column, value in criteria.items():
+            if column not in QUERY_COLUMNS:
+                raise IssueMirrorError(f'Unknown mirror criteria: {column}, valid criteria are: '
+                                       f'{", ".join(QUERY_COLUMNS)}')
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                clauses.append(f'{column} IN ({", ".join("?" * len(value))})')
+                values.extend(value)
+            else:
+                clauses.append(f'{column} = ?')
+                values.append(value)
+        if keys is not None:
+            clauses.append(f'key IN ({", ".join("?" * len(keys))})')
+            values.extend(keys)
+        if updated_since:
+            clauses.append('updated >= ?')
+            values.append(normalizedTimestamp(updated_since))
+        if order_by not in ['key', 'updated', 'project_key', 'issue_type', 'status', 'assignee']:
+            raise IssueMirrorError(f'Cannot order mirrored issues by {order_by}')
+        sql = f'SELECT {columns} FROM issue'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += f' ORDER BY {order_by}'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            values.append(int(limit))
+        with self.lock:
+            return self.conn.execute(sql, values).fetchall()
+
+    def count(self, **criteria):
+        criteria['order_by'] = 'key'
+        return self._select('COUNT(*)', **criteria)[0][0]
+
+    def rawItems(self, **criteria):
+        """
+            the mirrored issues matching criteria as dicts in the form Jira supplies them
+            (key, id and fields), see issues for the criteria
+        """
+        rows = self._select('key, id, fields', **criteria)
+        return [{'key' : key, 'id' : ident, 'fields' : json.loads(fields)} for key, ident, fields in rows]
+
+    def issues(self, **criteria):
+        """
+            JiraIssue instances for the mirrored issues matching criteria, made without
+            contacting Jira.  Criteria are project_key, issue_type, status and assignee
+            (a value or a list of values), keys (list of issue keys), updated_since
+            (a Jira timestamp), order_by (a column name, default key) and limit.
+        """
+        stand_in = MirroredProxy(self, self.logger)
+        jira_issues = []
+        for jira_item in self.rawItems(**criteria):
+            project_key = jira_item['key'].split('-')[0]
+            stand_in.ensureFieldInfo(project_key, jira_item['fields']['issuetype']['name'])
+            jira_issues.append(JiraIssue(jira_item, stand_in))
+        return jira_issues
+
+    def getIssue(self, issue_key):
+        hits = self.issues(keys=[issue_key])
+        return hits[0] if hits else None
+
+
+def makeIssueMirror(setting, logger=None):
+    """
+        setting is the mirror config value, an IssueMirror instance or the path of a SQLite database
+    """
+    if not setting:
+        return None
+    if isinstance(setting, IssueMirror):
+        return setting
+    return IssueMirror(setting, logger)
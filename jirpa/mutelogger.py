@@ -1,3 +1,5 @@
+import logging
+
 class MuteLogger:
     def __init__(self, params=None):
         self.params = params
@@ -17,3 +19,17 @@ class MuteLogger:
         return muteness
 
 ###################################################################################
+
+
+def debugEnabled(logger):
+    """
+        Answer whether debug output to the logger will actually go somewhere,
+        so that expensive debug message content is only built when it will be used.
+        Loggers without an isEnabledFor method are assumed to want debug output.
+    """
+    if isinstance(logger, MuteLogger):
+        return False
+    is_enabled_for = getattr(logger, 'isEnabledFor', None)
+    if callable(is_enabled_for):
+        return bool(is_enabled_for(logging.DEBUG))
+    return True
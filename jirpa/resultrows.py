@@ -0,0 +1,56 @@
+# resultrows file for jirpa package
+
+from .jiraissue import parseAttributeValue
+
+###################################################################################
+
+# what JQL searches return for each issue found
+#   issues - JiraIssue instances
+#   raw    - the issue dicts as Jira supplies them (key, id, fields, ...)
+#   rows   - tuples of the values of the named fields
+RESULT_MODES = ['issues', 'raw', 'rows']
+
+# names in a row projection taken from the issue item itself rather than from its fields
+ITEM_COLUMNS = ['key', 'id']
+
+class RowProjection:
+    """
+        Turns raw issue items into tuples holding the values of the columns (field display
+        names or field ids, and key or id) in column order, each field value decoded as
+        for a JiraIssue attribute.  A column can map to more than one field id (custom
+        fields in different contexts can share a display name), the first field id
+        having a value supplies it.  No createmeta / editmeta information is involved.
+    """
+    def __init__(self, columns, field_ids):
+        """
+            field_ids is a list of the field ids for each column, empty for an ITEM_COLUMNS name
+        """
+        self.columns = list(columns)
+        self.sources = []
+        for column, ids in zip(self.columns, field_ids):
+            if column.lower() in ITEM_COLUMNS and not ids:
+                self.sources.append((column.lower(), None))
+            elif len(ids) == 1:
+                self.sources.append((None, ids[0]))
+            else:
+                self.sources.append((None, tuple(ids)))
+
+    def row(self, jira_item):
+        fields = jira_item['fields']
+        values = []
+        for item_name, field_id in self.sources:
+            if item_name:
+                values.append(jira_item.get(item_name))
+            elif isinstance(field_id, str):
+                values.append(parseAttributeValue(fields.get(field_id)))
+            else:
+                value = None
+                for candidate in field_id:
+                    value = fields.get(candidate)
+                    if value is not None:
+                        break
+                values.append(parseAttributeValue(value))
+        return tuple(values)
+
+    def rows(self, jira_items):
+        return [self.row(jira_item) for jira_item in jira_items]
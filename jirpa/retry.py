@@ -0,0 +1,130 @@
+# retry file for jirpa package
+
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+###################################################################################
+
+IDEMPOTENT_METHODS = ['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE']
+
+THROTTLED_STATUS  = [429, 503]   # server asking us to back off
+TRANSIENT_STATUS  = [502, 504]   # gateway hiccups, only retried for idempotent verbs
+
+DEFAULT_RETRY_BUDGET = {'GET'     : 5,
+                        'HEAD'    : 5,
+                        'OPTIONS' : 5,
+                        'PUT'     : 3,
+                        'DELETE'  : 3,
+                        'POST'    : 2,   # only retried when the server supplies a Retry-After
+                       }
+
+class RetryRecord:
+    """
+        What happened on a single retry of a request.
+    """
+    def __init__(self, method, endpoint, status, attempt, delay, reason):
+        self.method    = method
+        self.endpoint  = endpoint
+        self.status    = status
+        self.attempt   = attempt
+        self.delay     = delay
+        self.reason    = reason
+        self.timestamp = time.time()
+
+    def __repr__(self):
+        return (f'RetryRecord({self.method} {self.endpoint} status: {self.status} '
+                f'attempt: {self.attempt} delay: {self.delay:.3f} reason: {self.reason})')
+
+###################################################################################
+
+class RetryPolicy:
+    """
+        Decides whether a response warrants another attempt and how long to wait first.
+
+        config items used:
+          retry_budget     - int (applies to all verbs) or dict of verb -> max number of retries
+          retry_backoff    - base seconds for the jittered exponential backoff (default 0.5)
+          retry_max_delay  - longest single wait in seconds; a Retry-After / X-RateLimit-Reset
+                             demanding more than this is not waited on (default 120)
+    """
+    def __init__(self, config):
+        budget = config.get('retry_budget', None)
+        self.budgets = dict(DEFAULT_RETRY_BUDGET)
+        if isinstance(budget, dict):
+            self.budgets.update({verb.upper() : int(count) for verb, count in budget.items()})
+        elif budget is not None:
+            self.budgets = {verb : int(budget) for verb in self.budgets}
+        self.backoff   = float(config.get('retry_backoff', 0.5))
+        self.max_delay = float(config.get('retry_max_delay', 120))
+
+    def budget(self, method):
+        return self.budgets.get(method.upper(), 0)
+
+    def delayFor(self, method, status, headers, attempt):
+        """
+            Return a (delay, reason) tuple when the request should be retried after
+            delay seconds, or (None, None) when the response should be returned as is.
+            attempt is the number of retries already made for this request.
+        """
+        method = method.upper()
+        if attempt >= self.budget(method):
+            return None, None
+        if status not in THROTTLED_STATUS and status not in TRANSIENT_STATUS:
+            return None, None
+
+        idempotent = method in IDEMPOTENT_METHODS
+        server_delay, reason = self.serverRequestedDelay(status, headers)
+        if server_delay is not None:
+            if server_delay > self.max_delay:
+                return None, None
+            # a little jitter so that a pool of workers don't all come back at the same instant
+            return server_delay + random.uniform(0, self.backoff), reason
+
+        if not idempotent:
+            # no indication the request wasn't acted upon, don't risk doing it twice
+            return None, None
+        ceiling = min(self.max_delay, self.backoff * (2 ** attempt))
+        return random.uniform(0, ceiling), f'backoff after {status}'
+
+    def serverRequestedDelay(self, status, headers):
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            seconds = self._secondsUntil(retry_after)
+            if seconds is not None:
+                return seconds, f'Retry-After: {retry_after}'
+
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset     = headers.get('X-RateLimit-Reset')
+        if status == 429 and reset and (remaining is None or remaining.strip() == '0'):
+            seconds = self._secondsUntil(reset)
+            if seconds is not None:
+                return seconds, f'X-RateLimit-Reset: {reset}'
+
+        return None, None
+
+    def _secondsUntil(self, value):
+        """
+            value is either a number of seconds, an epoch timestamp, an HTTP-date
+            or an ISO 8601 timestamp (Jira Cloud uses the latter for X-RateLimit-Reset)
+        """
+        value = value.strip()
+        try:
+            seconds = float(value)
+            if seconds > 1000000000:  # an epoch timestamp rather than a duration
+                seconds -= time.time()
+            return max(seconds, 0.0)
+        except ValueError:
+            pass
+        when = None
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            try:
+                when = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except ValueError:
+                return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -0,0 +1,57 @@
+# singleflight file for jirpa package
+
+import threading
+
+###################################################################################
+
+class _Call:
+    def __init__(self):
+        self.done   = threading.Event()
+        self.result = None
+        self.error  = None
+
+
+class SingleFlight:
+    """
+        Collapses concurrent calls that have the same key into one execution.
+        The first caller for a key runs the function, callers arriving while it is
+        still running wait for it and get the same result (or the same exception).
+        Nothing is remembered once the call completes, this is not a cache.
+        share, when given, is applied to the result handed to each waiting caller
+        (eg., copy.deepcopy so that no two callers hold the same mutable result).
+    """
+    def __init__(self, share=None):
+        self.share  = share
+        self.lock   = threading.Lock()
+        self.calls  = {}
+        self.counts = {'executed' : 0, 'shared' : 0}
+
+    def do(self, key, func, *args, **kwargs):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+                self.counts['executed'] += 1
+            else:
+                self.counts['shared'] += 1
+        if not leader:
+            call.done.wait()
+            if call.error:
+                raise call.error
+            return self.share(call.result) if self.share else call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.result
+
+    def statistics(self):
+        with self.lock:
+            return dict(self.counts, in_flight=len(self.calls))
@@ -0,0 +1,116 @@
+# validation file for jirpa package
+
+import re
+
+from .jiraissue import JiraIssue, JiraIssueError, JiraIssueFieldError
+from .jiraissue import SKIP_ATTRIBUTE, ISSUE_TYPE_ATTRIBUTE
+
+###################################################################################
+
+# required fields jiralize supplies itself for every created issue
+SUPPLIED_FIELDS = ['Project', 'Issue Type']
+
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+class WorkItemValidator:
+    """
+        Checks work items (dicts of field name -> value as given to JiraProxy.createIssue)
+        for one project and issue type against the createmeta field information, the way
+        jiralize('create') would treat them: every field has to exist, a value has to be
+        one of the field's allowed values (a set lookup) and has to have the shape of the
+        field type (a number, an ISO 8601 date or datetime, ...), and every required field
+        without a default value has to have a value.  No requests are made of Jira.
+    """
+    def __init__(self, jira_proxy, project_key, issue_type, descriptor):
+        self.jira_proxy  = jira_proxy
+        self.project_key = project_key
+        self.issue_type  = issue_type
+        self.plan        = descriptor.jiralizePlan('create')
+        catalog = descriptor.catalog
+        self.required_fields = [name for name, tub in list(catalog.standard_fields.items()) +
+                                                      list(catalog.custom_fields.items())
+                                      if 'create' in tub and tub['create'].get('required')
+                                     and not tub['create'].get('hasDefaultValue')
+                                     and name not in SUPPLIED_FIELDS]
+
+    def problems(self, work_item):
+        """
+            returns a list of the problems with work_item, empty when there are none
+        """
+        fields = dict(work_item)   # the caller's work item is left as is
+        fields['issuetype'] = {'name' : self.issue_type}
+        jira_item = {'key' : f'{self.project_key}-0000', 'fields' : fields}
+        try:
+            attributes = JiraIssue(jira_item, self.jira_proxy).attribute
+        except (JiraIssueError, ValueError) as exc:
+            return [f'Unable to read the work item: {exc}']
+
+        problems = []
+        for field_key, value in attributes.items():
+            try:
+                encoder = self.plan.encoder(field_key)
+            except JiraIssueError as exc:
+                problems.append(str(exc))
+                continue
+            if encoder is SKIP_ATTRIBUTE or encoder is ISSUE_TYPE_ATTRIBUTE or value is None:
+                continue
+            if not encoder.isAllowed(value):
+                problems.append(encoder.disallowed(value))
+                continue
+            problem = self._shapeProblem(encoder, value)
+            if problem:
+                problems.append(problem)
+
+        for field_name in self.required_fields:
+            if attributes.get(field_name) in (None, '', []):
+                problems.append(f'The {field_name} field is required')
+        return problems
+
+    def _shapeProblem(self, encoder, value):
+        if encoder.field_type == 'date' and not DATE_PATTERN.match(str(value)):
+            return f'{encoder.field_name} value {value} is not a date in the YYYY-MM-DD format'
+        try:
+            encoder.postableValue(value)
+        except JiraIssueFieldError as exc:
+            return str(exc)
+        except (ValueError, TypeError, AttributeError):
+            return (f'{encoder.field_name} value |{value}| is not suitable '
+                    f'for a field of type {encoder.field_type}')
+        return None
+
+    def validate(self, work_items):
+        report = ValidationReport()
+        for row, work_item in enumerate(work_items):
+            report.record(row, self.problems(work_item))
+        return report
+
+
+class ValidationReport:
+    """
+        The problems found with each work item (row), by the work item's position
+        in the sequence of work items validated.  Rows without problems aren't listed.
+    """
+    def __init__(self):
+        self.row_count = 0
+        self.errors    = {}   # row -> list of problems
+
+    def record(self, row, problems):
+        self.row_count += 1
+        if problems:
+            self.errors[row] = problems
+
+    @property
+    def valid(self):
+        return not self.errors
+
+    def invalidRows(self):
+        return sorted(self.errors)
+
+    def validRows(self):
+        return [row for row in range(self.row_count) if row not in self.errors]
+
+    def __str__(self):
+        lines = [f'{len(self.errors)} of {self.row_count} work items have problems']
+        for row in self.invalidRows():
+            lines.extend(f'  row {row}: {problem}' for problem in self.errors[row])
+        return "\n".join(lines)
@@ -1,6 +1,9 @@
 
 from datetime import datetime
 
+from jirpa.fieldcatalog import FieldCatalog
+from jirpa.mutelogger   import MuteLogger
+
 class BasicLogger:
     def __init__(self, logfile_name):
         self.logfile_name = logfile_name
@@ -26,3 +29,26 @@ def excErrorMessage(excinfo):
     """
     return str(excinfo.value)
 
+
+#
+# stand-ins for what JiraIssue takes from a JiraProxy, for tests run without a Jira server
+#
+def field(name, mode_info, modes=('create', 'edit')):
+    """
+        the field information for the field name in each of modes
+    """
+    return {mode : dict(mode_info, name=name) for mode in modes}
+
+class StandInVersion:
+    version = '8.5.0'
+
+class StandInProxy:
+    def __init__(self, standard_fields, custom_fields, priority_value_for_id=None):
+        self.jira_version           = StandInVersion()
+        self.logger                 = MuteLogger()
+        self.issue_type_id_for_name = {'Story' : '10001'}
+        self.priority_value_for_id  = priority_value_for_id or {}
+        self.catalog = FieldCatalog(standard_fields, custom_fields)
+
+    def fieldCatalog(self, project_key, issue_type):
+        return self.catalog
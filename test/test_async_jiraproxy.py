@@ -0,0 +1,123 @@
+
+import sys, os
+import py
+import re
+import asyncio
+import copy
+
+from jirpa import JiraProxy, JiraProxyError
+from jirpa import AsyncJiraProxy
+from jirpa.asyncjira import AsyncJiraComm
+from jirpa import JiraIssue
+
+###############################################################################################
+
+from helper_pak import BasicLogger, excErrorMessage
+
+from jira_targets import GOOD_VANILLA_SERVER_CONFIG
+from jira_targets import PROJECT_KEY_1
+from jira_targets import JEST_ISSUE_1_KEY
+
+###############################################################################################
+
+proj1 = f'project = {PROJECT_KEY_1}'
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_async_get_issue():
+    """
+        will return a JiraIssue from an awaited getIssue call
+    """
+    async def scenario():
+        async with await AsyncJiraProxy.connect(GOOD_VANILLA_SERVER_CONFIG) as ajp:
+            return await ajp.getIssue(JEST_ISSUE_1_KEY)
+
+    jira_issue = run(scenario())
+    assert jira_issue.__class__ == JiraIssue
+    assert jira_issue.key == JEST_ISSUE_1_KEY
+
+def test_async_get_issues_with_jql_matches_blocking_proxy():
+    """
+        the awaited getIssuesWithJql returns the same issues in the same order
+        as the blocking JiraProxy.getIssuesWithJql
+    """
+    jql = f'{proj1} AND issuetype = Story ORDER BY key ASC'
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    expected = [issue.key for issue in jp.getIssuesWithJql(jql)]
+
+    async def scenario():
+        async with AsyncJiraProxy(GOOD_VANILLA_SERVER_CONFIG, jira_proxy=jp) as ajp:
+            return await ajp.getIssuesWithJql(jql)
+
+    jira_issues = run(scenario())
+    assert [issue.key for issue in jira_issues] == expected
+
+def test_async_get_many_issues_concurrently():
+    """
+        a number of getIssue calls can be in flight at the same time
+    """
+    async def scenario():
+        async with await AsyncJiraProxy.connect(GOOD_VANILLA_SERVER_CONFIG) as ajp:
+            return await ajp.getIssues([JEST_ISSUE_1_KEY] * 10)
+
+    jira_issues = run(scenario())
+    assert len(jira_issues) == 10
+    assert all(issue.key == JEST_ISSUE_1_KEY for issue in jira_issues)
+
+def test_async_get_transitions():
+    """
+        will return the transitions for an issue from an awaited getTransitions call
+    """
+    async def scenario():
+        async with await AsyncJiraProxy.connect(GOOD_VANILLA_SERVER_CONFIG) as ajp:
+            return await ajp.getTransitions(JEST_ISSUE_1_KEY)
+
+    transitions = run(scenario())
+    assert len(transitions) > 0
+    for name, info in transitions.items():
+        assert 'action_id' in info
+
+def test_async_sad_get_nonexistent_issue():
+    """
+        will raise a JiraProxyError when awaiting getIssue for a non existent issue
+    """
+    async def scenario():
+        async with await AsyncJiraProxy.connect(GOOD_VANILLA_SERVER_CONFIG) as ajp:
+            return await ajp.getIssue("JEST-1001")
+
+    with py.test.raises(JiraProxyError) as excinfo:
+        run(scenario())
+    assert "Issue Does Not Exist" in excErrorMessage(excinfo)
+
+def test_async_create_and_update_with_lazy_bootstrap():
+    """
+        will create and update an issue with the awaited calls when the reference
+        tables haven't been obtained yet, the update counted as for JiraProxy
+    """
+    config = dict(GOOD_VANILLA_SERVER_CONFIG, bootstrap='lazy')
+    async def scenario():
+        async with await AsyncJiraProxy.connect(config) as ajp:
+            issue_key = await ajp.createIssue(PROJECT_KEY_1, "Story", {"Summary" : "async bowling alley"})
+            issue = await ajp.getIssue(issue_key)
+            issue.Summary = "async Mr. Bojangles"
+            assert await ajp.updateIssue(issue)
+            assert await ajp.updateIssue(issue)
+            updated = await ajp.getIssue(issue_key)
+            await ajp.deleteIssue(issue_key)
+            return updated, ajp.proxy.updateStatistics()
+
+    updated, counts = run(scenario())
+    assert updated.Summary == "async Mr. Bojangles"
+    assert counts == {'made' : 1, 'skipped' : 1}
+
+def test_async_comm_without_jira_comm_has_no_attributes():
+    """
+        will raise AttributeError rather than KeyError for an attribute of an AsyncJiraComm
+        whose JiraComm isn't in place yet (as while it is being copied or unpickled)
+    """
+    bare = AsyncJiraComm.__new__(AsyncJiraComm)
+    with py.test.raises(AttributeError):
+        bare.url
+    assert not hasattr(bare, 'jira_comm')
+    assert copy.copy(bare).__dict__ == {}
@@ -0,0 +1,120 @@
+import sys, os
+import re
+import pytest
+from datetime import timedelta
+
+from jirpa.deltasync import Watermark, WatermarkStore, DeltaSync, DeltaSyncError, parseJiraTimestamp
+
+###############################################################################################
+
+T1 = '2021-03-04T15:16:00.000+0000'
+T2 = '2021-03-04T15:16:30.000+0000'
+T2_ELSEWHERE = '2021-03-04T10:16:30.000-0500'   # same instant as T2
+
+def test_initial_watermark_accepts_everything():
+    watermark = Watermark()
+    assert watermark.isChange(T1, 'JEST-1')
+
+def test_changes_at_the_watermark_time_are_told_apart_by_key():
+    watermark = Watermark(T2, ['JEST-1'])
+    assert not watermark.isChange(T1, 'JEST-2')
+    assert not watermark.isChange(T2, 'JEST-1')
+    assert not watermark.isChange(T2_ELSEWHERE, 'JEST-1')
+    assert watermark.isChange(T2, 'JEST-2')
+    assert watermark.isChange('2021-03-04T15:17:00.000+0000', 'JEST-1')
+
+def test_advance_keeps_latest_time_and_its_keys():
+    watermark = Watermark(T1, ['JEST-9'])
+    advanced = watermark.advance([(T1, 'JEST-3'), (T2, 'JEST-1'), (T2_ELSEWHERE, 'JEST-2')])
+    assert advanced == Watermark(T2, ['JEST-1', 'JEST-2'])
+    assert watermark.advance([(T1, 'JEST-3')]) == Watermark(T1, ['JEST-3', 'JEST-9'])
+
+def test_store_round_trips_named_watermarks(tmp_path):
+    store = WatermarkStore(str(tmp_path / 'marks' / 'watermarks.json'))
+    assert store.load('project = JEST') == Watermark()
+    store.save('project = JEST', Watermark(T2, ['JEST-1']))
+    store.save('project = OTHR', Watermark(T1, ['OTHR-4']))
+    reloaded = WatermarkStore(store.path)
+    assert reloaded.load('project = JEST') == Watermark(T2, ['JEST-1'])
+    assert reloaded.load('project = OTHR') == Watermark(T1, ['OTHR-4'])
+    assert [name for name in os.listdir(tmp_path / 'marks')] == ['watermarks.json']
+
+def test_bad_timestamp_detected():
+    with pytest.raises(DeltaSyncError):
+        parseJiraTimestamp('last tuesday')
+
+###############################################################################################
+
+SERVER_NOW = '2021-03-04T16:00:00.000+0000'
+
+class StandInIssue:
+    def __init__(self, key, updated):
+        self.key     = key
+        self.Created = '2021-03-01T09:00:00.000+0000'
+        self.Updated = updated
+
+class StandInServerInfo:
+    server_time = SERVER_NOW
+
+class StandInSearchProxy:
+    """
+        searches a list of issues the way Jira does for a DeltaSync query,
+        calling between_pages (if set) after each page has been served
+    """
+    def __init__(self, issues):
+        self.issues = {issue.key : issue for issue in issues}
+        self.between_pages = None
+        self.searches = []
+
+    def getServerInfo(self):
+        return StandInServerInfo()
+
+    def getIssuesWithJql(self, jql_query, fields=None, start_at=0, limit=1000):
+        self.searches.append((jql_query, start_at))
+        matching = sorted(self.issues.values(), key=lambda issue: (parseJiraTimestamp(issue.Updated), issue.key))
+        since = re.search(r'updated >= -(\d+)m', jql_query)
+        if since:
+            earliest = parseJiraTimestamp(SERVER_NOW) - timedelta(minutes=int(since.group(1)))
+            matching = [issue for issue in matching if parseJiraTimestamp(issue.Updated) >= earliest]
+        page = [StandInIssue(issue.key, issue.Updated) for issue in matching[start_at : start_at + limit]]
+        if self.between_pages:
+            self.between_pages(self)
+        return page
+
+def changed_at(minute):
+    return f'2021-03-04T15:{minute:02d}:00.000+0000'
+
+def test_issue_updated_mid_poll_does_not_hide_later_issues(tmp_path):
+    proxy = StandInSearchProxy([StandInIssue(f'JEST-{ix}', changed_at(10 + ix)) for ix in range(1, 8)])
+    def update_first_issue(proxy):
+        proxy.issues['JEST-1'].Updated = changed_at(30)
+        proxy.between_pages = None
+    proxy.between_pages = update_first_issue
+
+    sync = DeltaSync(proxy, 'project = JEST', str(tmp_path / 'watermarks.json'), page_size=3)
+    sync.store.save(sync.name, Watermark(changed_at(0), []))
+    records = sync.poll()
+    assert [(rec.key, rec.updated) for rec in records] == \
+           [(f'JEST-{ix}', changed_at(10 + ix)) for ix in range(1, 8)] + [('JEST-1', changed_at(30))]
+    assert sync.watermark == Watermark(changed_at(30), ['JEST-1'])
+    assert sync.poll() == []
+
+def test_full_pages_of_issues_already_covered_are_paged_past(tmp_path):
+    # more issues within the overlap than fit on a page, all covered by the watermark
+    issues = [StandInIssue(f'JEST-{ix}', changed_at(5)) for ix in range(1, 6)] + [StandInIssue('JEST-9', changed_at(6))]
+    proxy = StandInSearchProxy(issues)
+    sync = DeltaSync(proxy, 'project = JEST', str(tmp_path / 'watermarks.json'), page_size=2)
+    sync.store.save(sync.name, Watermark(changed_at(5), [f'JEST-{ix}' for ix in range(1, 6)]))
+    assert [rec.key for rec in sync.poll()] == ['JEST-9']
+    assert [start_at for jql_query, start_at in proxy.searches] == [0, 1, 2, 3, 4, 5]
+
+def test_bulk_edit_within_one_minute_is_paged_through_once(tmp_path):
+    issues = [StandInIssue(f'JEST-{ix:02d}', changed_at(20)) for ix in range(1, 41)]
+    proxy = StandInSearchProxy(issues)
+    sync = DeltaSync(proxy, 'project = JEST', str(tmp_path / 'watermarks.json'), page_size=10)
+    sync.store.save(sync.name, Watermark(changed_at(0), []))
+    assert len(sync.poll()) == 40
+    assert len({jql_query for jql_query, start_at in proxy.searches}) == 1
+    assert [start_at for jql_query, start_at in proxy.searches] == [0, 9, 18, 27, 36]
+    assert sync.watermark == Watermark(changed_at(20), [f'JEST-{ix:02d}' for ix in range(1, 41)])
+
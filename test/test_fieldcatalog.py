@@ -0,0 +1,41 @@
+import sys, os
+import pytest
+
+from jirpa.fieldcatalog import FieldCatalog
+
+###############################################################################################
+
+STANDARD_FIELDS = {'Summary'  : {'create' : {'name' : 'Summary',  'schema' : {'system' : 'summary'}},
+                                 'edit'   : {'name' : 'Summary',  'schema' : {'system' : 'summary'}}},
+                   'Reporter' : {'edit'   : {'name' : 'Reporter', 'schema' : {'system' : 'reporter'}}},
+                   'Due Date' : {'create' : {'name' : 'Due Date', 'schema' : {'system' : 'duedate'}}},
+                  }
+CUSTOM_FIELDS   = {'Story Points' : {'create' : {'name' : 'Story Points', 'schema' : {'customId' : 10010}}},
+                   'RallyItem'    : {'edit'   : {'name' : 'RallyItem',    'schema' : {'customId' : 10200}}},
+                  }
+
+def test_system_and_display_names_resolved():
+    catalog = FieldCatalog(STANDARD_FIELDS, CUSTOM_FIELDS)
+    assert catalog.std_display_for_sys == {'summary' : 'Summary', 'reporter' : 'Reporter', 'duedate' : 'Due Date'}
+    assert catalog.standard_display_for['reporter'] == 'Reporter'
+    assert catalog.standard_display_for['Due Date'] == 'Due Date'
+    assert catalog.custom_display_for_id == {'customfield_10010' : 'Story Points',
+                                             'customfield_10200' : 'RallyItem'}
+
+def test_field_names_matched_regardless_of_case():
+    catalog = FieldCatalog(STANDARD_FIELDS, CUSTOM_FIELDS)
+    assert catalog.fieldExists('due date')
+    assert catalog.fieldExists('STORY POINTS')
+    assert not catalog.fieldExists('Color')
+    assert catalog.isCustomField('rallyitem')
+    assert not catalog.isCustomField('Summary')
+    assert catalog.displayName('reporter') == 'Reporter'
+    assert catalog.fieldInfo('story points') == (CUSTOM_FIELDS['Story Points'], True)
+    assert catalog.fieldInfo('summary') == (STANDARD_FIELDS['Summary'], False)
+    with pytest.raises(KeyError):
+        catalog.fieldInfo('Color')
+
+def test_catalog_knows_the_field_info_it_describes():
+    catalog = FieldCatalog(STANDARD_FIELDS, CUSTOM_FIELDS)
+    assert catalog.describes(STANDARD_FIELDS, CUSTOM_FIELDS)
+    assert not catalog.describes(dict(STANDARD_FIELDS), CUSTOM_FIELDS)
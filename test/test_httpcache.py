@@ -0,0 +1,106 @@
+
+import sys, os
+import pytest
+
+import requests
+
+from jirpa.httpcache import HttpCache, CacheEntry, MemoryCacheStore, DiskCacheStore
+from jirpa.httpcache import makeHttpCache
+
+###############################################################################################
+
+def canned_response(status, body=b'', headers=None):
+    response = requests.models.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+def test_only_reference_data_gets_are_cacheable():
+    """
+        GETs to the reference endpoints are cacheable, anything else is not
+    """
+    cache = HttpCache()
+    assert cache.cacheable('GET', 'issuetype')
+    assert cache.cacheable('get', 'issue/createmeta')
+    assert not cache.cacheable('POST', 'issuetype')
+    assert not cache.cacheable('GET', 'issue/JEST-1')
+    assert not cache.cacheable('GET', 'project/JEST')
+
+def test_response_with_validators_is_stored():
+    """
+        a 200 response with an ETag or Last-Modified is stored and gives conditional headers
+    """
+    cache = HttpCache()
+    cache.record('k1', canned_response(200, b'[1, 2]', {'ETag' : '"abc"'}))
+    cache.record('k2', canned_response(200, b'[3]', {'Last-Modified' : 'Wed, 21 Oct 2015 07:28:00 GMT'}))
+    cache.record('k3', canned_response(200, b'[4]'))
+    cache.record('k4', canned_response(404, b'{}', {'ETag' : '"x"'}))
+    assert cache.conditionalHeaders(cache.lookup('k1')) == {'If-None-Match' : '"abc"'}
+    assert 'If-Modified-Since' in cache.conditionalHeaders(cache.lookup('k2'))
+    assert cache.lookup('k3') is None
+    assert cache.lookup('k4') is None
+    stats = cache.statistics()
+    assert stats['stores'] == 2
+    assert stats['misses'] == 4
+
+def test_hits_are_counted():
+    """
+        serving a stored entry counts a hit and the bytes that didn't have to be downloaded
+    """
+    cache = HttpCache()
+    cache.record('k1', canned_response(200, b'0123456789', {'ETag' : '"abc"'}))
+    cache.hit(cache.lookup('k1'))
+    stats = cache.statistics()
+    assert stats['hits'] == 1
+    assert stats['bytes_saved'] == 10
+
+def test_memory_store_evicts_least_recently_used():
+    """
+        once the stored bodies exceed max_bytes the least recently used entries go
+    """
+    store = MemoryCacheStore(max_bytes=25)
+    store.put('a', CacheEntry(b'x' * 10, etag='"a"'))
+    store.put('b', CacheEntry(b'x' * 10, etag='"b"'))
+    store.get('a')
+    store.put('c', CacheEntry(b'x' * 10, etag='"c"'))
+    assert store.get('b') is None
+    assert store.get('a') is not None
+    assert store.get('c') is not None
+    assert store.size == 20
+    assert store.evictions == 1
+
+def test_disk_store_persists_entries(tmp_path):
+    """
+        entries written by one DiskCacheStore are available to a later one on the same directory
+    """
+    store = DiskCacheStore(str(tmp_path))
+    store.put('user@http://jira/rest/api/2/status', CacheEntry(b'[{"id": "1"}]', etag='"s1"'))
+    later = DiskCacheStore(str(tmp_path))
+    entry = later.get('user@http://jira/rest/api/2/status')
+    assert entry.body == b'[{"id": "1"}]'
+    assert entry.etag == '"s1"'
+    assert later.size == len(b'[{"id": "1"}]')
+    assert later.get('user@http://jira/rest/api/2/priority') is None
+
+def test_disk_store_evicts_when_over_size(tmp_path):
+    """
+        the disk store drops the oldest entries once over max_bytes
+    """
+    store = DiskCacheStore(str(tmp_path), max_bytes=25)
+    for name in ['a', 'b', 'c']:
+        store.put(name, CacheEntry(b'x' * 10, etag=f'"{name}"'))
+    assert store.size <= 25
+    assert store.evictions == 1
+    assert store.get('c') is not None
+
+def test_make_http_cache_from_config_value(tmp_path):
+    """
+        the http_cache config value selects the store
+    """
+    assert makeHttpCache(None) is None
+    assert isinstance(makeHttpCache(True).store, MemoryCacheStore)
+    assert isinstance(makeHttpCache('memory').store, MemoryCacheStore)
+    assert isinstance(makeHttpCache(str(tmp_path)).store, DiskCacheStore)
+    cache = HttpCache()
+    assert makeHttpCache(cache) is cache
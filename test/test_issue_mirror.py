@@ -0,0 +1,72 @@
+import sys, os
+from types import SimpleNamespace
+import pytest
+
+from jirpa import JiraIssue
+from jirpa.mirror import IssueMirror, IssueMirrorError
+
+###############################################################################################
+
+STANDARD_FIELDS = {'Summary'    : {'create' : {'name' : 'Summary',    'schema' : {'system' : 'summary'}}},
+                   'Assignee'   : {'create' : {'name' : 'Assignee',   'schema' : {'system' : 'assignee'}}},
+                   'Issue Type' : {'create' : {'name' : 'Issue Type', 'schema' : {'system' : 'issuetype'}}},
+                  }
+CUSTOM_FIELDS   = {'Story Points' : {'create' : {'name' : 'Story Points',
+                                                 'schema' : {'custom' : 'float', 'customId' : 10010}}}}
+
+def proxy_metadata():
+    """
+        the JiraProxy attributes the mirror records alongside the issues
+    """
+    return SimpleNamespace(jira_version           = SimpleNamespace(version='8.5.0'),
+                           issue_type_id_for_name = {'Story' : 10001},
+                           priority_value_for_id  = {'2' : 'High'},
+                           standard_fields        = {'JEST' : {'Story' : STANDARD_FIELDS}},
+                           custom_fields          = {'JEST' : {'Story' : CUSTOM_FIELDS}})
+
+def jira_item(seq, status='Open', assignee='fred', updated='2021-03-04T15:16:00.000+0000'):
+    return {'key' : f'JEST-{seq}', 'id' : str(10000 + seq),
+            'fields' : {'summary'   : f'Issue {seq}',
+                        'issuetype' : {'name' : 'Story'},
+                        'status'    : {'name' : status},
+                        'assignee'  : {'name' : assignee},
+                        'updated'   : updated,
+                        'customfield_10010' : float(seq)}}
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = IssueMirror(str(tmp_path / 'mirror.db'))
+    mirror.storeMany([jira_item(1), 
+                      jira_item(2, status='Done'),
+                      jira_item(3, assignee='wilma', updated='2021-03-04T10:30:00.000-0500')],
+                     proxy_metadata())
+    yield mirror
+    mirror.close()
+
+def test_mirrored_issues_queried_by_indexed_columns(mirror):
+    assert mirror.count() == 3
+    assert mirror.count(status='Open') == 2
+    assert mirror.count(assignee=['wilma', 'barney']) == 1
+    assert [item['key'] for item in mirror.rawItems(order_by='updated')] == ['JEST-1', 'JEST-2', 'JEST-3']
+    assert [item['key'] for item in mirror.rawItems(updated_since='2021-03-04T15:20:00.000+0000')] == ['JEST-3']
+    with pytest.raises(IssueMirrorError):
+        mirror.count(color='red')
+
+def test_mirrored_issues_rehydrated_offline(tmp_path, mirror):
+    mirror.close()
+    reopened = IssueMirror(mirror.path)
+    jira_issue = reopened.getIssue('JEST-2')
+    assert jira_issue.__class__ == JiraIssue
+    assert jira_issue.Summary == 'Issue 2'
+    assert jira_issue.Status == 'Done'
+    assert jira_issue['Story Points'] == 2.0
+    assert reopened.getIssue('JEST-99') is None
+    reopened.close()
+
+def test_partial_refresh_keeps_other_mirrored_fields(mirror):
+    refresh = {'key' : 'JEST-1', 'id' : '10001',
+               'fields' : {'issuetype' : {'name' : 'Story'}, 'status' : {'name' : 'Done'}}}
+    mirror.store(refresh, proxy_metadata())
+    jira_issue = mirror.getIssue('JEST-1')
+    assert jira_issue.Status == 'Done'
+    assert jira_issue.Summary == 'Issue 1'
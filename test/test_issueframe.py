@@ -0,0 +1,57 @@
+import sys, os
+import io
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from jirpa.issueframe import IssueFrameBuilder, IssueFrameError, columnKind
+from jirpa.issueframe import NUMBER, DATE, DATETIME, CATEGORY, TEXT
+
+###############################################################################################
+
+COLUMNS = ['key', 'Status', 'Assignee', 'Story Points', 'Created', 'Due Date']
+KINDS   = [TEXT, CATEGORY, CATEGORY, NUMBER, DATETIME, DATE]
+ROWS    = [('JEST-1', 'Open', 'alice',                 3.0,  '2021-03-04T10:00:00.000-0700', '2021-04-01'),
+           ('JEST-2', 'Done', 'bob',                   5.0,  '2021-03-05T10:00:00.000+0000', None),
+           ('JEST-3', 'Open', {'displayName' : 'Cy'},  None, '2021-03-06T10:00:00.000+0000', '2021-04-03'),
+           ('JEST-4', 'Done', None,                    8.0,  None,                           '2021-04-04'),
+          ]
+
+def build():
+    builder = IssueFrameBuilder(COLUMNS, KINDS)
+    builder.addRows(ROWS)
+    return builder.frame()
+
+def test_column_kinds_follow_the_field_schema_type():
+    assert [columnKind(kind) for kind in ['number', 'date', 'datetime', 'status', 'user', 'string', None]] == \
+           [NUMBER, DATE, DATETIME, CATEGORY, CATEGORY, TEXT, TEXT]
+
+def test_columns_are_typed_numpy_arrays():
+    frame = build()
+    assert len(frame) == 4
+    assert frame.arrays['Story Points'].dtype == numpy.float64
+    assert frame.arrays['Created'].dtype == numpy.dtype('datetime64[ms]')
+    assert frame.arrays['Due Date'].dtype == numpy.dtype('datetime64[D]')
+    assert frame.arrays['Status'].tolist() == [0, 1, 0, 1]
+    assert frame.labels['Status'] == ['Open', 'Done']
+    assert frame['Assignee'].tolist() == ['alice', 'bob', 'Cy', None]
+    assert str(frame['Created'][0]) == '2021-03-04T17:00:00.000'
+    assert numpy.isnat(frame['Due Date'][1])
+
+def test_filter_group_and_sum():
+    frame = build()
+    assert frame.sum('Story Points') == 16.0
+    assert frame.groupBy('Status').sum('Story Points') == {'Open' : 3.0, 'Done' : 13.0}
+    assert frame.groupBy('Assignee').count() == {'alice' : 1, 'bob' : 1, 'Cy' : 1, None : 1}
+    done = frame.filter(frame.isIn('Status', ['Done']))
+    assert done['key'].tolist() == ['JEST-2', 'JEST-4']
+    assert done.sum('Story Points') == 13.0
+    with pytest.raises(IssueFrameError):
+        frame.sum('Sprint')
+
+def test_csv_export():
+    output = io.StringIO()
+    build().filter(numpy.array([False, True, False, True])).toCsv(output)
+    assert output.getvalue().splitlines() == ['key,Status,Assignee,Story Points,Created,Due Date',
+                                              'JEST-2,Done,bob,5.0,2021-03-05T10:00:00.000,',
+                                              'JEST-4,Done,,8.0,,2021-04-04']
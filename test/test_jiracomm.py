@@ -3,6 +3,7 @@ import sys, os
 import py
 import re
 import copy
+import time
 
 import requests
 
@@ -97,3 +98,70 @@ def hide_test_sad_ridiculous_short_timeout():
    # assert 'TimeoutError' in excErrorMessage(excinfo)
 
 
+
+def test_happy_use_default_pool_configuration():
+    """
+        JiraComm uses the requests default connection pool sizes if none are specified
+    """
+    jc = JiraComm(GOOD_VANILLA_SERVER_CONFIG)
+    assert jc.pool_connections == 10
+    assert jc.pool_maxsize     == 10
+    assert jc.pool_block is False
+
+def test_happy_use_specified_pool_configuration():
+    """
+        new JiraComm instance uses the pool configuration items in the config argument
+    """
+    config = copy.copy(GOOD_VANILLA_SERVER_CONFIG)
+    config['pool_maxsize'] = 25
+    config['pool_block']   = True
+    config['keep_alive']   = True
+    jc = JiraComm(config)
+    assert jc.pool_maxsize == 25
+    assert jc.adapter._pool_maxsize == 25
+    assert jc.adapter._pool_block is True
+    assert jc.adapter.socket_options is not None
+
+def test_connections_are_reused():
+    """
+        repeated requests on a JiraComm reuse the pooled connection
+    """
+    jc = JiraComm(GOOD_VANILLA_SERVER_CONFIG)
+    for ix in range(5):
+        status, result, errors = jc.getRequest('serverInfo')
+        assert status == 200
+    stats = jc.poolStatistics()
+    assert stats['requests'] == 6   # the initial 'user' probe plus the 5 above
+    assert stats['connections_created'] == 1
+    assert stats['connections_reused']  == 5
+
+def test_idle_connections_are_refreshed():
+    """
+        connections idle for longer than pool_idle_timeout are dropped and re-established
+    """
+    config = copy.copy(GOOD_VANILLA_SERVER_CONFIG)
+    config['pool_idle_timeout'] = 0.5
+    jc = JiraComm(config)
+    time.sleep(1)
+    status, result, errors = jc.getRequest('serverInfo')
+    assert status == 200
+    stats = jc.poolStatistics()
+    assert stats['refreshes'] == 1
+    assert stats['connections_created'] == 2
+
+def test_idle_connections_are_not_refreshed_while_a_request_is_in_flight():
+    """
+        the pool is left alone while another request is in flight, and idleness
+        is measured from when the last request completed
+    """
+    config = copy.copy(GOOD_VANILLA_SERVER_CONFIG)
+    config['pool_idle_timeout'] = 0.5
+    jc = JiraComm(config)
+    jc._requestStarting()    # as though another thread had a long request going
+    time.sleep(1)
+    status, result, errors = jc.getRequest('serverInfo')
+    assert status == 200
+    assert jc.poolStatistics()['refreshes'] == 0
+    jc._requestDone()
+    status, result, errors = jc.getRequest('serverInfo')
+    assert jc.poolStatistics()['refreshes'] == 0
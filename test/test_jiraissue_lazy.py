@@ -0,0 +1,95 @@
+import sys, os
+import pytest
+
+from jirpa.jiraissue    import JiraIssue, JiraIssueError
+
+from helper_pak import StandInProxy, field
+
+###############################################################################################
+
+STANDARD_FIELDS = {'Summary'  : field('Summary',  {'schema' : {'type' : 'string',   'system' : 'summary'}},  ['edit']),
+                   'Priority' : field('Priority', {'schema' : {'type' : 'priority', 'system' : 'priority'}}, ['edit']),
+                   'Assignee' : field('Assignee', {'schema' : {'type' : 'user',     'system' : 'assignee'}}, ['edit']),
+                  }
+CUSTOM_FIELDS   = {'Story Points' : field('Story Points', {'schema' : {'type' : 'number', 'customId' : 10010,
+                                                                       'custom' : 'float'}}, ['edit']),
+                   'Sprint'       : field('Sprint', {'schema' : {'type' : 'array', 'customId' : 10100,
+                                                                 'custom' : 'com.pyxis.greenhopper.jira:gh-sprint'}}, ['edit']),
+                  }
+
+def stand_in_proxy():
+    return StandInProxy(STANDARD_FIELDS, CUSTOM_FIELDS, {'3' : 'Medium'})
+
+def jira_item(number):
+    return {'id' : str(10000 + number), 'key' : f'JEST-{number}',
+            'fields' : {'summary'           : f'Issue {number}',
+                        'issuetype'         : {'id' : '10001', 'name' : 'Story'},
+                        'status'            : {'id' : '1', 'name' : 'Open'},
+                        'priority'          : {'id' : '3', 'name' : 'Medium'},
+                        'assignee'          : {'name' : 'testuser', 'displayName' : 'Test User'},
+                        'customfield_10010' : 5.0,
+                        'customfield_10100' : 'com.atlassian.greenhopper.service.sprint.Sprint@1[id=17,name=S1]',
+                        'watches'           : {'watchCount' : 1},
+                       }}
+
+###############################################################################################
+
+def test_lazy_and_eager_issues_have_the_same_attributes():
+    proxy = stand_in_proxy()
+    eager = JiraIssue(jira_item(1), proxy)
+    lazy  = JiraIssue(jira_item(1), proxy, lazy=True)
+    assert list(lazy.attribute.items()) == list(eager.attribute.items())
+    assert eager.Sprint == '17,name=S1]'
+    assert eager.Status == 'Open'
+    assert eager['Story Points'] == 5.0
+
+def test_lazy_issue_decodes_an_attribute_when_first_read():
+    lazy = JiraIssue(jira_item(2), stand_in_proxy(), lazy=True)
+    assert lazy._attribute == {}
+    assert lazy.Priority == 'Medium'
+    assert lazy['Assignee'] == 'testuser'
+    assert list(lazy._attribute) == ['Priority', 'Assignee']
+    assert lazy.Bogus is None
+    with pytest.raises(JiraIssueError):
+        lazy['Bogus']
+
+def test_lazy_issue_modification_survives_decoding():
+    proxy = stand_in_proxy()
+    lazy  = JiraIssue(jira_item(3), proxy, lazy=True)
+    lazy.Summary = 'Revised'
+    assert lazy.updated_keys == ['Summary']
+    assert lazy.attributeNames() == JiraIssue(jira_item(3), proxy).attributeNames()
+    assert lazy.Summary == 'Revised'
+    assert lazy.jiralize('edit')['fields']['summary'] == 'Revised'
+
+def test_issues_share_their_issue_type_descriptor_and_repeated_values():
+    proxy = stand_in_proxy()
+    first, second = JiraIssue(jira_item(4), proxy), JiraIssue(jira_item(5), proxy)
+    assert first.descriptor is second.descriptor
+    assert first.Assignee is second.Assignee
+    assert first.project_key == 'JEST' and first.issue_type_id == '10001'
+    assert JiraIssue.__dictoffset__ == 0   # slotted, instances have no __dict__
+
+def test_each_instance_name_can_be_assigned():
+    proxy = stand_in_proxy()
+    issue = JiraIssue(jira_item(5), proxy)
+    other = JiraIssue(jira_item(6), proxy)
+    for name in JiraIssue.protected_attributes:
+        setattr(issue, name, f'own {name}')
+        assert getattr(issue, name) == f'own {name}'
+        assert issue[name] == f'own {name}'
+    assert other.version == proxy.jira_version.version
+    assert other.issue_type == 'Story'
+    assert issue.updated_keys == 'own updated_keys'
+    issue.attribute = {'Summary' : 'replaced'}
+    assert issue.Summary == 'replaced'
+
+def test_updated_keys_is_a_list_and_special_is_read_only():
+    proxy = stand_in_proxy()
+    issue = JiraIssue(jira_item(7), proxy)
+    assert issue.updated_keys == []
+    issue.updated_keys.append('Summary')
+    assert issue.updated_keys == ['Summary']
+    with pytest.raises(TypeError):
+        issue.special['labels'] = 'Labels'
+    assert 'labels' not in JiraIssue(jira_item(8), proxy).special
@@ -0,0 +1,97 @@
+import sys, os
+import pytest
+
+from jirpa.jiraissue    import JiraIssue, JiraIssueError, jiralizeMany, hasFieldChanges
+from jirpa.jiraissue    import SKIP_ATTRIBUTE, ISSUE_TYPE_ATTRIBUTE
+
+from helper_pak import StandInProxy, field
+
+###############################################################################################
+
+STANDARD_FIELDS = {'Summary'       : field('Summary',  {'schema' : {'type' : 'string', 'system' : 'summary'}}),
+                   'Priority'      : field('Priority', {'schema' : {'type' : 'priority', 'system' : 'priority'},
+                                                        'allowedValues' : [{'name' : 'High'}, {'name' : 'Low'}]}),
+                   'Fix Version/s' : field('Fix Version/s', {'schema' : {'type' : 'array', 'system' : 'fixVersions'}}),
+                   'Due Date'      : field('Due Date', {'schema' : {'type' : 'date', 'system' : 'duedate'}}),
+                  }
+CUSTOM_FIELDS   = {'Color' : field('Color', {'schema' : {'type' : 'option', 'customId' : 10020,
+                                                         'custom' : 'com.atlassian.jira.plugin.system.customfieldtypes:select'},
+                                             'allowedValues' : [{'value' : 'red'}, {'value' : 'blue'}]}),
+                  }
+
+def stand_in_proxy():
+    return StandInProxy(STANDARD_FIELDS, CUSTOM_FIELDS)
+
+def new_issue(proxy, number):
+    return JiraIssue({'key' : f'JEST-{number}', 'fields' : {'issuetype' : {'name' : 'Story'},
+                                                            'summary'   : f'Issue {number}'}}, proxy)
+
+###############################################################################################
+
+def test_plan_compiled_once_per_mode_and_shared_by_the_issues():
+    proxy = stand_in_proxy()
+    first, second = new_issue(proxy, 1), new_issue(proxy, 2)
+    plan = first.descriptor.jiralizePlan('edit')
+    assert second.descriptor.jiralizePlan('edit') is plan
+    assert first.descriptor.jiralizePlan('create') is not plan
+    encoder = plan.encoder('Color')
+    assert (encoder.field_key, encoder.field_type, encoder.allowed) == ('customfield_10020', 'select',
+                                                                       frozenset(['red', 'blue']))
+    assert plan.encoder('Fix Version/s').field_type == 'versions'
+    assert plan.encoder('Status') is SKIP_ATTRIBUTE
+    assert plan.encoder('Issue Type') is ISSUE_TYPE_ATTRIBUTE
+    assert plan.encoder('Color') is encoder
+
+def test_jiralize_runs_the_plan():
+    issue = new_issue(stand_in_proxy(), 3)
+    issue.Priority = 'Low'
+    issue.Color = 'blue'
+    issue['Fix Version/s'] = '1.0, 1.1'
+    issue['Due Date'] = '2021-05-01'
+    assert issue.jiralize('edit') == {'fields' : {'project'           : {'key' : 'JEST'},
+                                                  'issuetype'         : {'id' : '10001'},
+                                                  'priority'          : {'name' : 'Low'},
+                                                  'customfield_10020' : {'value' : 'blue'},
+                                                  'fixVersions'       : [{'name' : '1.0'}, {'name' : '1.1'}],
+                                                  'duedate'           : '2021-05-01'}}
+
+def test_jiralize_rejects_disallowed_and_unrecognized_values():
+    issue = new_issue(stand_in_proxy(), 4)
+    issue.Priority = 'Urgent'
+    with pytest.raises(JiraIssueError):
+        issue.jiralize('edit')
+    issue = new_issue(stand_in_proxy(), 5)
+    issue.Flavor = 'vanilla'
+    with pytest.raises(JiraIssueError):
+        issue.jiralize('edit')
+
+def test_jiralize_many():
+    proxy = stand_in_proxy()
+    issues = [new_issue(proxy, number) for number in range(6, 9)]
+    for issue in issues:
+        issue.Color = 'red'
+    assert jiralizeMany(issues, 'create') == [issue.jiralize('create') for issue in issues]
+    assert [post['fields']['summary'] for post in jiralizeMany(issues, 'create')] == ['Issue 6', 'Issue 7', 'Issue 8']
+
+def test_jiralize_edit_leaves_out_unchanged_values():
+    proxy = stand_in_proxy()
+    issue = JiraIssue({'key' : 'JEST-9', 'fields' : {'issuetype' : {'name' : 'Story'}, 'summary' : 'Issue 9',
+                                                     'priority'  : {'id' : '2', 'name' : 'High'},
+                                                     'fixVersions' : [{'name' : '1.0'}, {'name' : '1.1'}]}}, proxy)
+    issue.Summary  = 'Issue 9'
+    issue.Priority = 'High'
+    issue['Fix Version/s'] = '1.0, 1.1'
+    assert issue.updated_keys == ['Summary', 'Priority', 'Fix Version/s']
+    unchanged = issue.jiralize('edit')
+    assert unchanged == {'fields' : {'project' : {'key' : 'JEST'}, 'issuetype' : {'id' : '10001'}}}
+    assert not hasFieldChanges(unchanged)
+
+    issue.Priority = 'Low'
+    changed = issue.jiralize('edit')
+    assert changed['fields']['priority'] == {'name' : 'Low'} and 'summary' not in changed['fields']
+    assert hasFieldChanges(changed)
+    assert issue.jiralize('create')['fields']['summary'] == 'Issue 9'
+
+    issue.markPosted()
+    assert not hasFieldChanges(issue.jiralize('edit'))
+
@@ -1,6 +1,8 @@
 
 import sys, os
+import io
 import re
+import hashlib
 import base64
 import uuid
 import py
@@ -66,6 +68,47 @@ def test_fail_gracefully_when_attempting_to_obtain_content_of_nonexistent_attach
     actualErrorMessage = excErrorMessage(excinfo)
     assert '404 (Not Found)' in actualErrorMessage
 
+def test_download_attachment_content_to_a_file(tmpdir):
+    """
+        should stream the content of an attachment into a file, computing a checksum on the way
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    attachments = jp.getIssueAttachmentsInfo(JEST_ISSUE_1_KEY)
+    image_attachment = [att for att in attachments if att.filename == 'earthjello.jpeg'][0]
+    target = os.path.join(str(tmpdir), image_attachment.filename)
+
+    info = jp.downloadAttachment(image_attachment, target, chunk_size=4096, checksum='sha256')
+    assert info['bytes'] == 43739
+    assert os.path.getsize(target) == 43739
+    content = jp.getAttachmentContent(image_attachment)
+    assert info['checksum'] == hashlib.sha256(content).hexdigest()
+
+def test_download_attachment_content_to_a_file_object():
+    """
+        should stream the content of an attachment into an open binary file object
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    attachments = jp.getIssueAttachmentsInfo(JEST_ISSUE_1_KEY)
+    text_attachment = [att for att in attachments if att.filename == 'testattachment.txt'][0]
+    sink = io.BytesIO()
+    info = jp.downloadAttachment(text_attachment, sink)
+    assert info['checksum'] is None
+    assert sink.getvalue().decode('UTF-8') == "Hello World of hurt!"
+
+def test_fail_gracefully_when_downloading_a_nonexistent_attachment(tmpdir):
+    """
+        should raise a JiraProxyError and leave no partial file behind for a non-existent attachment
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    attachments = jp.getIssueAttachmentsInfo(JEST_ISSUE_1_KEY)
+    attachments[1].content_ref = re.sub(r'attachment\/\d+\/', 'attachment/0000/', attachments[1].content_ref)
+    target = os.path.join(str(tmpdir), 'missing.txt')
+
+    with py.test.raises(JiraProxyError) as excinfo:
+        jp.downloadAttachment(attachments[1], target)
+    assert '404 (Not Found)' in excErrorMessage(excinfo)
+    assert os.listdir(str(tmpdir)) == []
+
 def test_adding_an_attachment_to_an_issue():
     """
         add an attachment to an issue
@@ -109,3 +152,41 @@ def test_adding_an_attachment_using_connector_protocol():
     assert jp.deleteIssue(issue_key)
 
 
+
+def test_adding_attachments_from_file_path_and_file_object():
+    """
+        add attachments to an issue streamed from a file path and from an open file object
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    work_item = {"Summary" : "Monet was a painter"}
+    issue_key = jp.createIssue(PROJECT_KEY_1, "Bug", work_item)
+    with open(ATTACHMENT_FILE, 'rb') as att_file:
+        attachments = [{'filename' : 'from_path.txt',   'mimetype' : "text/plain",
+                        'file_path' : ATTACHMENT_FILE},
+                       {'filename' : 'from_object.txt', 'mimetype' : "text/plain",
+                        'file_object' : att_file}
+                      ]
+        result = jp.addAttachmentsToIssue(issue_key, attachments)
+    assert result['from_path.txt']["added"] == True
+    assert result['from_object.txt']["added"] == True
+    for attachment in jp.getIssueAttachmentsInfo(issue_key):
+        assert jp.getAttachmentContent(attachment).decode() == "The World is Good."
+
+    assert jp.deleteIssue(issue_key)
+
+def test_adding_a_binary_attachment():
+    """
+        add an attachment whose content is not valid UTF-8
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    work_item = {"Summary" : "Monet was a painter"}
+    issue_key = jp.createIssue(PROJECT_KEY_1, "Bug", work_item)
+    binary_content = bytes(range(256)) * 16
+    attachments = [{'filename' : 'binary.dat', 'mimetype' : "application/octet-stream",
+                    'base64content' : base64.b64encode(binary_content)}]
+    result = jp.addAttachmentsToIssue(issue_key, attachments)
+    assert result['binary.dat']["added"] == True
+    attachments = jp.getIssueAttachmentsInfo(issue_key)
+    assert jp.getAttachmentContent(attachments[0]) == binary_content
+
+    assert jp.deleteIssue(issue_key)
@@ -258,3 +258,35 @@ def test_show_password_as_fuzzed():
 
     os.remove(TLOG)
 
+
+def test_bootstrap_modes_yield_the_same_reference_tables():
+    """
+        the concurrent and lazy bootstrap modes end up with the same reference
+        tables as the default eager bootstrap
+    """
+    eager = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    for mode in ['concurrent', 'lazy']:
+        config = copy.copy(GOOD_VANILLA_SERVER_CONFIG)
+        config['bootstrap'] = mode
+        jp = JiraProxy(config)
+        assert jp.bootstrap_timings['total'] >= 0.0
+        assert jp.getIssueTypes()[0] == eager.issue_types
+        assert jp.getStatuses()      == eager.status_values
+        assert jp.getPriorities()    == eager.priority_values
+        assert jp.getResolutions()   == eager.resolution_values
+        assert jp.jira_version.version == eager.jira_version.version
+
+    lazy_config = copy.copy(GOOD_VANILLA_SERVER_CONFIG)
+    lazy_config['bootstrap'] = 'lazy'
+    jp = JiraProxy(lazy_config)
+    assert 'status_values' not in jp.__dict__
+    assert len(jp.status_values) > 0
+    assert 'status_values' in jp.__dict__
+
+def test_bad_bootstrap_mode_detected():
+    config = copy.copy(GOOD_VANILLA_SERVER_CONFIG)
+    config['bootstrap'] = 'whenever'
+    with py.test.raises(JiraProxyError) as excinfo:
+        jp = JiraProxy(config)
+    actual_error_message = excErrorMessage(excinfo)
+    assert 'Invalid bootstrap config value: |whenever|' in actual_error_message
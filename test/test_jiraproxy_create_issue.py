@@ -522,3 +522,21 @@ def test_create_story_with_original_estimate_field_set():
     assert jp.deleteIssue(issue_key)
 
 
+
+def test_create_needs_only_the_create_mode_field_information():
+    """
+        creating issues obtains createmeta once and neither searches for a sample issue nor
+        obtains editmeta, an issue fetched afterwards supplies the editmeta with its own key
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    issue_keys = [jp.createIssue(PROJECT_KEY_1, "Bug", {"Summary" : f"marquee bulb count {ix}"})
+                  for ix in range(3)]
+    summary_info = jp.standard_fields[PROJECT_KEY_1]["Bug"]["Summary"]
+    assert 'create' in summary_info and 'edit' not in summary_info
+
+    issue = jp.getIssue(issue_keys[0])
+    assert 'edit' in jp.standard_fields[PROJECT_KEY_1]["Bug"]["Summary"]
+    assert issue.Summary == "marquee bulb count 0"
+
+    for issue_key in issue_keys:
+        assert jp.deleteIssue(issue_key)
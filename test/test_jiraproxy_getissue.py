@@ -92,6 +92,29 @@ def test_accessing_custom_fields():
     assert jira_issue['RallyItem'] == JEST_ISSUE_1_RALLY_ITEM
 
 
+def test_get_issue_with_only_the_named_fields():
+    """
+        will obtain only the fields named (by display name) along with the Issue Type
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    jira_issue = jp.getIssue(JEST_ISSUE_1_KEY, fields=['Summary', 'Status', 'RallyItem'])
+
+    assert jira_issue.RallyItem == JEST_ISSUE_1_RALLY_ITEM
+    assert jira_issue.Status is not None
+    assert set(jira_issue.attribute.keys()) == {'Summary', 'Status', 'RallyItem', 'Issue Type'}
+
+
+def test_get_issue_with_unknown_field_name():
+    """
+        will raise a JiraProxyError naming the field names that are not recognized
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    with py.test.raises(JiraProxyError) as excinfo:
+        jira_issue = jp.getIssue(JEST_ISSUE_1_KEY, fields=['Summary', 'Bogosity'])
+    actualErrorMessage = excErrorMessage(excinfo)
+    assert actualErrorMessage == 'Unrecognized field name(s): Bogosity'
+
+
 def test_issue_creation_with_multiple_versions():
     """
         create a JIRA issue with two version values
@@ -8,6 +8,7 @@ from datetime import datetime
 
 from jirpa import JiraProxy, JiraProxyError
 from jirpa import JiraIssue
+from jirpa.mirror import IssueMirror
 
 ###############################################################################################
 
@@ -165,3 +166,126 @@ def test_query_specifying_for_field_whose_value_is_null():
     jira_issues = jp.getIssuesWithJql(jql)
     assert len(jira_issues) > 0
 
+
+def test_iterating_query_results_matches_list_of_issues():
+    """
+        will yield the same JiraIssue instances from iterIssuesWithJql 
+        as getIssuesWithJql returns, in the same order
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    jql = f'{proj1} AND issuetype = Story'
+    listed_keys = [issue.key for issue in jp.getIssuesWithJql(jql)]
+    iterated = jp.iterIssuesWithJql(jql, buffered_pages=1)
+    first = next(iterated)
+    assert first.__class__ == JiraIssue
+    iterated_keys = [first.key] + [issue.key for issue in iterated]
+    assert iterated_keys == listed_keys
+
+def test_iterating_query_results_honors_limit():
+    """
+        will stop yielding issues once limit issues have been produced
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    jira_issues = list(jp.iterIssuesWithJql(proj1, limit=3))
+    assert len(jira_issues) == 3
+
+def test_iterating_bad_query_raises_error():
+    """
+        will raise a JiraProxyError when the read ahead search fails
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    with py.test.raises(JiraProxyError) as excinfo:
+        jira_issues = list(jp.iterIssuesWithJql(f'{proj1} AND nosuchfield = 23'))
+
+def test_parallel_page_requests_return_issues_in_result_order():
+    """
+        will return the same issues in the same order whether the pages 
+        are obtained one after the other or concurrently
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    sequential_keys = [issue.key for issue in jp.getIssuesWithJql(proj1, limit=200)]
+    parallel_keys   = [issue.key for issue in jp.getIssuesWithJql(proj1, limit=200, parallel=4)]
+    assert parallel_keys == sequential_keys
+
+def test_query_with_template_parameters():
+    """
+        will substitute the params values as jql literals into the query template
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    jql = 'project = {project} AND issuetype = {issue_type}'
+    params = {'project' : PROJECT_KEY_1, 'issue_type' : 'Story'}
+    templated_keys = [issue.key for issue in jp.getIssuesWithJql(jql, params=params)]
+    plain_keys     = [issue.key for issue in jp.getIssuesWithJql(f'{proj1} AND issuetype = Story')]
+    assert templated_keys == plain_keys
+
+def test_query_sent_with_post():
+    """
+        will return the same issues when the search is POSTed, including for 
+        values with characters that need escaping when the jql is in the url
+    """
+    config = copy.copy(GOOD_VANILLA_SERVER_CONFIG)
+    config['search_method'] = 'POST'
+    jp = JiraProxy(config)
+    jql = f'{proj1} AND Component/s = "Sun & Moon"'
+    post_keys = [issue.key for issue in jp.getIssuesWithJql(jql)]
+    get_keys  = [issue.key for issue in JiraProxy(GOOD_VANILLA_SERVER_CONFIG).getIssuesWithJql(jql)]
+    assert post_keys == get_keys
+
+def test_raw_and_rows_result_modes():
+    """
+        will return the issue dicts or tuples of the named field values 
+        that agree with the corresponding JiraIssue instances
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    jira_issues = jp.getIssuesWithJql(proj1, limit=20)
+    raw_items   = jp.getIssuesWithJql(proj1, limit=20, result='raw')
+    rows        = jp.getIssuesWithJql(proj1, limit=20, fields=['key', 'Summary', 'Status'], result='rows')
+    assert [item['key'] for item in raw_items] == [issue.key for issue in jira_issues]
+    assert rows == [(issue.key, issue.Summary, issue.Status) for issue in jira_issues]
+
+def test_rows_result_mode_requires_field_names():
+    """
+        will raise a JiraProxyError for the rows result mode without a list 
+        of field names and for an unknown result mode
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    with py.test.raises(JiraProxyError) as excinfo:
+        jp.getIssuesWithJql(proj1, result='rows')
+    with py.test.raises(JiraProxyError) as excinfo:
+        jp.getIssuesWithJql(proj1, result='tabular')
+
+def test_issue_frame_columns_agree_with_issues():
+    """
+        will return an IssueFrame whose columns hold the values of the issues found
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    jira_issues = jp.getIssuesWithJql(proj1, limit=20)
+    frame = jp.getIssueFrame(proj1, ['key', 'Status', 'Priority'], limit=20)
+    assert frame['key'].tolist()    == [issue.key    for issue in jira_issues]
+    assert frame['Status'].tolist() == [issue.Status for issue in jira_issues]
+
+class BatchCountingMirror(IssueMirror):
+    def __init__(self, path):
+        super().__init__(path)
+        self.batches = []
+
+    def storeMany(self, jira_items, jira_proxy):
+        self.batches.append(len(jira_items))
+        super().storeMany(jira_items, jira_proxy)
+
+def test_search_results_mirrored_a_page_at_a_time(tmp_path):
+    """
+        will record the issues of each page of search results in the mirror with one storeMany call
+    """
+    mirror = BatchCountingMirror(str(tmp_path / 'mirror.db'))
+    config = dict(GOOD_VANILLA_SERVER_CONFIG, mirror=mirror)
+    jp = JiraProxy(config)
+    jira_issues = jp.getIssuesWithJql(proj1, limit=120)
+    assert sum(mirror.batches) == len(jira_issues)
+    assert len(mirror.batches) < len(jira_issues)
+    mirror.batches = []
+    iterated = list(jp.iterIssuesWithJql(proj1, limit=120))
+    assert sum(mirror.batches) == len(iterated)
+    assert len(mirror.batches) < len(iterated)
+    assert mirror.count() == len(jira_issues)
+    mirror.close()
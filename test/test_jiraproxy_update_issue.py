@@ -395,3 +395,27 @@ def test_update_custom_datetime_field():
 
 
 
+
+def test_update_with_unchanged_values_makes_no_request():
+    """
+        reassigning the values an issue already has leaves nothing to update,
+        updateIssue makes no PUT and counts the update as skipped
+    """
+    jp = JiraProxy(GOOD_VANILLA_SERVER_CONFIG)
+    work_item = {"Summary"  :  "carousel horse repainting schedule",
+                 "Priority" :  "Highest",
+                 }
+    issue_key = jp.createIssue(PROJECT_KEY_1, "Bug", work_item)
+    issue = jp.getIssue(issue_key)
+    issue.Summary  = issue.Summary
+    issue.Priority = "Highest"
+    assert jp.updateIssue(issue) == True
+    assert jp.updateStatistics() == {'made' : 0, 'skipped' : 1}
+
+    issue.Summary = "carousel horse repainting postponed"
+    assert jp.updateIssue(issue) == True
+    assert jp.updateIssue(issue) == True
+    assert jp.updateStatistics() == {'made' : 1, 'skipped' : 2}
+    assert jp.getIssue(issue_key).Summary == "carousel horse repainting postponed"
+
+    assert jp.deleteIssue(issue_key)
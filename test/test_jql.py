@@ -0,0 +1,63 @@
+import sys, os
+import pytest
+
+from jirpa.jql import JqlPreparer, JqlError, escapeForGet, jqlLiteral
+
+###############################################################################################
+
+CUSTOM_NAMES = {'Story Points' : 'cf[10010]', 'RallyItem' : 'cf[10200]', 'Team' : 'cf[10300]'}
+
+def test_standard_display_names_rewritten():
+    """
+        the six display names that aren't jql field names are rewritten outside of literals
+    """
+    preparer = JqlPreparer()
+    jql = 'project = JEST AND Affects Version/s = peach AND Component/s = "Front End" ORDER BY Due Date'
+    assert preparer.prepare(jql) == \
+           'project = JEST AND affectedVersion = peach AND component = "Front End" ORDER BY duedate'
+    jql = 'Fix Version/s in (a, b) and "Original Estimate" > 1h and Remaining Estimate < 2h'
+    assert preparer.prepare(jql) == \
+           'fixVersion in (a, b) and originalEstimate > 1h and remainingEstimate < 2h'
+
+def test_literals_left_alone():
+    """
+        a display name inside a quoted value isn't a field reference
+    """
+    preparer = JqlPreparer(CUSTOM_NAMES)
+    jql = 'summary ~ "Due Date slipped" AND description ~ \'Team "Story Points"\''
+    assert preparer.prepare(jql) == jql
+
+def test_custom_field_display_names_rewritten_in_field_position():
+    """
+        custom field display names become cf[NNNNN] when used as a field
+    """
+    preparer = JqlPreparer(CUSTOM_NAMES)
+    jql = '"Story Points" >= 3 AND rallyitem is not EMPTY AND status = Team ORDER BY "Story Points"'
+    assert preparer.prepare(jql) == \
+           'cf[10010] >= 3 AND cf[10200] is not EMPTY AND status = Team ORDER BY cf[10010]'
+    assert preparer.prepare('Team in (a, b)') == 'cf[10300] in (a, b)'
+
+def test_prepared_queries_are_cached():
+    preparer = JqlPreparer(cache_size=2)
+    for jql in ['Due Date > now()', 'Component/s = x', 'Due Date > now()', 'key = A-1']:
+        preparer.prepare(jql)
+    assert list(preparer.cache) == ['Due Date > now()', 'key = A-1']
+    preparer.setCustomNames(CUSTOM_NAMES)
+    assert preparer.statistics()['cached'] == 0
+
+def test_template_parameters_substituted_as_literals():
+    preparer = JqlPreparer(CUSTOM_NAMES)
+    template = 'project = {project} AND key in {keys} AND "Story Points" > {points} AND summary ~ "{x}"'
+    params = {'project' : 'JEST', 'keys' : ['JEST-1', 'JEST-2'], 'points' : 3}
+    assert preparer.prepare(template, params) == \
+           'project = "JEST" AND key in ("JEST-1", "JEST-2") AND cf[10010] > 3 AND summary ~ "{x}"'
+    assert preparer.prepare(template, dict(params, project='say "hi"')).startswith(
+           'project = "say \\"hi\\"" AND')
+    with pytest.raises(JqlError):
+        preparer.prepare(template, {'project' : 'JEST'})
+    with pytest.raises(JqlError):
+        jqlLiteral(None)
+
+def test_escaping_for_query_string():
+    assert escapeForGet('component = "R&D + QA" AND x ~ "50% ?@"') == \
+           'component = "R\\u0026D \\u002B QA" AND x ~ "50\\u0025 \\u003F\\u0040"'
@@ -0,0 +1,80 @@
+
+import sys, os
+import json
+import pytest
+
+from jirpa.jsoncodec import JsonCodec, getJsonCodec, JsonCodecError, JSON_CODECS
+
+###############################################################################################
+
+SAMPLE = {"key" : "JEST-1", "fields" : {"summary" : "Grüße & ümlauts", "points" : 3.5,
+                                        "labels" : ["a", "b"], "assignee" : None}}
+
+def available_codecs():
+    codecs = []
+    for name, codec_class in JSON_CODECS.items():
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            pass
+    return codecs
+
+def test_default_codec_is_stdlib_json():
+    """
+        the standard library json module is used unless another backend is named
+    """
+    assert getJsonCodec().name == 'json'
+    assert getJsonCodec('json').__class__ == JsonCodec
+
+def test_auto_codec_picks_an_installed_backend():
+    """
+        auto gives back a working codec whatever is installed
+    """
+    codec = getJsonCodec('auto')
+    assert codec.name in JSON_CODECS
+    assert codec.loads(codec.dumps(SAMPLE)) == SAMPLE
+
+def test_codecs_round_trip_the_same_data():
+    """
+        every installed codec encodes and decodes to the same Python data
+    """
+    for codec in available_codecs():
+        encoded = codec.dumps(SAMPLE)
+        assert codec.loads(encoded) == SAMPLE
+        assert JsonCodec().loads(encoded) == SAMPLE
+        assert JsonCodec().loads(codec.pretty(SAMPLE)) == SAMPLE
+
+def test_codecs_encode_non_ascii_work_items_as_utf8_bytes():
+    """
+        request bodies are UTF-8 encoded bytes whichever codec is used, text outside
+        Latin-1 (CJK, emoji) and accented text reach Jira intact
+    """
+    work_item = {"fields" : {"summary" : "設計レビュー 🚀", "description" : "Grüße, café"}}
+    for codec in available_codecs() + [getJsonCodec('auto')]:
+        body = codec.dumps(work_item)
+        assert isinstance(body, bytes)
+        assert json.loads(body.decode('UTF-8')) == work_item
+        assert codec.loads(body) == work_item
+
+def test_codecs_decode_utf8_bytes():
+    """
+        response bodies arrive as bytes, every codec decodes them directly
+    """
+    body = JsonCodec().dumps(SAMPLE)
+    for codec in available_codecs():
+        assert codec.loads(body) == SAMPLE
+
+def test_codec_instance_is_passed_through():
+    """
+        a JsonCodec instance can be supplied as the json_codec config value
+    """
+    codec = JsonCodec()
+    assert getJsonCodec(codec) is codec
+
+def test_sad_unknown_codec():
+    """
+        asking for an unknown backend raises a JsonCodecError
+    """
+    with pytest.raises(JsonCodecError) as excinfo:
+        getJsonCodec('simdjson')
+    assert 'Unknown json_codec' in str(excinfo.value)
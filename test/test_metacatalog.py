@@ -0,0 +1,75 @@
+import sys, os
+import json
+import time
+import pytest
+
+from jirpa.metacatalog import MetadataCatalog, MetadataCatalogError, makeMetadataCatalog
+from jirpa.metacatalog import REFERENCE_TABLES
+
+###############################################################################################
+
+URL  = 'https://jira.example.com'
+USER = 'tester'
+
+def sample_snapshot(version='8.5.0', url=URL, user=USER):
+    return {'url'       : url,
+            'user'      : user,
+            'version'   : version,
+            'reference' : {table : [] for table in REFERENCE_TABLES},
+            'fields'    : {'standard_fields' : {'JEST' : {'Bug' : {'Summary' : {'create' : {}}}}}},
+           }
+
+def test_saved_snapshot_is_loaded_for_same_server_version(tmp_path):
+    catalog = MetadataCatalog(str(tmp_path / 'meta.json'))
+    assert catalog.load(URL, USER, '8.5.0') is None
+    catalog.save(sample_snapshot())
+    snapshot = catalog.load(URL, USER, '8.5.0')
+    assert snapshot['fields']['standard_fields']['JEST']['Bug']['Summary'] == {'create' : {}}
+    assert MetadataCatalog(catalog.path).load(URL, USER, '8.5.0') is not None
+
+def test_snapshot_not_used_for_other_version_user_or_url(tmp_path):
+    catalog = MetadataCatalog(str(tmp_path / 'meta.json'))
+    catalog.save(sample_snapshot())
+    assert catalog.load(URL, USER, '8.6.0') is None
+    assert catalog.load(URL, 'someone', '8.5.0') is None
+    assert catalog.load('https://other.example.com', USER, '8.5.0') is None
+
+def test_expired_snapshot_is_not_used(tmp_path):
+    catalog = MetadataCatalog(str(tmp_path / 'meta.json'), ttl=60)
+    catalog.save(sample_snapshot())
+    assert catalog.load(URL, USER, '8.5.0') is not None
+    with open(catalog.path) as cf:
+        content = json.load(cf)
+    for snapshot in content['snapshots'].values():
+        snapshot['saved_at'] = time.time() - 120
+    with open(catalog.path, 'w') as cf:
+        json.dump(content, cf)
+    assert catalog.load(URL, USER, '8.5.0') is None
+
+def test_invalidate_drops_one_or_all_snapshots(tmp_path):
+    catalog = MetadataCatalog(str(tmp_path / 'meta.json'))
+    catalog.save(sample_snapshot())
+    catalog.save(sample_snapshot(user='someone'))
+    catalog.invalidate(URL, USER)
+    assert catalog.load(URL, USER, '8.5.0') is None
+    assert catalog.load(URL, 'someone', '8.5.0') is not None
+    catalog.invalidate()
+    assert not os.path.exists(catalog.path)
+    assert catalog.load(URL, 'someone', '8.5.0') is None
+
+def test_unreadable_catalog_detected(tmp_path):
+    path = tmp_path / 'meta.json'
+    path.write_text('{not json')
+    catalog = makeMetadataCatalog(str(path))
+    with pytest.raises(MetadataCatalogError):
+        catalog.load(URL, USER, '8.5.0')
+    assert makeMetadataCatalog(None) is None
+    assert makeMetadataCatalog(catalog) is catalog
+
+def test_unserializable_snapshot_leaves_catalog_as_it_was(tmp_path):
+    catalog = MetadataCatalog(str(tmp_path / 'meta.json'))
+    catalog.save(sample_snapshot())
+    with pytest.raises(MetadataCatalogError):
+        catalog.save(sample_snapshot(user='someone', version={'not', 'json'}))
+    assert catalog.load(URL, USER, '8.5.0') is not None
+    assert os.listdir(tmp_path) == ['meta.json']
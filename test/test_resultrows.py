@@ -0,0 +1,24 @@
+import sys, os
+import pytest
+
+from jirpa.resultrows import RowProjection
+
+###############################################################################################
+
+JIRA_ITEM = {'id' : '10001', 'key' : 'JEST-1',
+             'fields' : {'summary'           : 'First issue',
+                         'status'            : {'id' : '1', 'name' : 'Open'},
+                         'components'        : [{'id' : '1', 'name' : 'Front'}, {'id' : '2', 'name' : 'Back'}],
+                         'labels'            : ['alpha', 'beta'],
+                         'customfield_10020' : None,
+                         'customfield_10021' : {'id' : '7', 'value' : 'red'},
+                        }}
+
+def test_row_has_decoded_values_in_column_order():
+    projection = RowProjection(['Status', 'key', 'Summary', 'Component/s', 'Labels', 'id'],
+                               [['status'], [], ['summary'], ['components'], ['labels'], []])
+    assert projection.row(JIRA_ITEM) == ('Open', 'JEST-1', 'First issue', ['Front', 'Back'], 'alpha,beta', '10001')
+
+def test_shared_display_name_takes_the_first_field_with_a_value():
+    projection = RowProjection(['Color', 'Due Date'], [['customfield_10020', 'customfield_10021'], ['duedate']])
+    assert projection.rows([JIRA_ITEM, JIRA_ITEM]) == [('red', None), ('red', None)]
@@ -0,0 +1,86 @@
+
+import sys, os
+import pytest
+import time
+from email.utils import formatdate
+
+from jirpa.retry import RetryPolicy, DEFAULT_RETRY_BUDGET
+
+###############################################################################################
+
+def test_get_is_retried_with_backoff_after_throttling():
+    """
+        a throttled GET without any server hint gets a jittered backoff delay
+        that doesn't exceed the exponential ceiling for the attempt
+    """
+    policy = RetryPolicy({'retry_backoff' : 1.0})
+    for attempt in range(4):
+        delay, reason = policy.delayFor('GET', 503, {}, attempt)
+        assert 0 <= delay <= 2 ** attempt
+        assert 'backoff' in reason
+
+def test_retry_after_seconds_is_honored():
+    """
+        the Retry-After header value (in seconds) sets the delay
+    """
+    policy = RetryPolicy({'retry_backoff' : 0.1})
+    delay, reason = policy.delayFor('GET', 429, {'Retry-After' : '7'}, 0)
+    assert 7 <= delay <= 7.1
+    assert 'Retry-After' in reason
+
+def test_retry_after_http_date_is_honored():
+    """
+        the Retry-After header can also be an HTTP-date
+    """
+    policy = RetryPolicy({'retry_backoff' : 0.1})
+    later = formatdate(time.time() + 30, usegmt=True)
+    delay, reason = policy.delayFor('GET', 429, {'Retry-After' : later}, 0)
+    assert 28 <= delay <= 31
+
+def test_rate_limit_reset_is_honored():
+    """
+        an exhausted X-RateLimit-Remaining with an X-RateLimit-Reset time sets the delay
+    """
+    policy = RetryPolicy({'retry_backoff' : 0.1})
+    headers = {'X-RateLimit-Remaining' : '0', 'X-RateLimit-Reset' : str(int(time.time() + 20))}
+    delay, reason = policy.delayFor('GET', 429, headers, 0)
+    assert 18 <= delay <= 21
+    assert 'X-RateLimit-Reset' in reason
+
+def test_post_is_only_retried_with_server_hint():
+    """
+        a non idempotent POST is retried only when the server says when to come back
+    """
+    policy = RetryPolicy({})
+    assert policy.delayFor('POST', 503, {}, 0) == (None, None)
+    delay, reason = policy.delayFor('POST', 429, {'Retry-After' : '1'}, 0)
+    assert delay >= 1
+    assert policy.delayFor('POST', 502, {}, 0) == (None, None)
+
+def test_retry_budgets_per_verb():
+    """
+        retries stop once the per-verb budget is exhausted, budgets are configurable
+    """
+    policy = RetryPolicy({'retry_budget' : {'get' : 2}})
+    assert policy.budget('GET') == 2
+    assert policy.budget('PUT') == DEFAULT_RETRY_BUDGET['PUT']
+    assert policy.delayFor('GET', 429, {}, 1)[0] is not None
+    assert policy.delayFor('GET', 429, {}, 2) == (None, None)
+
+    no_retries = RetryPolicy({'retry_budget' : 0})
+    assert no_retries.delayFor('GET', 429, {'Retry-After' : '1'}, 0) == (None, None)
+
+def test_excessive_server_delay_is_not_waited_on():
+    """
+        a Retry-After beyond retry_max_delay is returned to the caller rather than waited out
+    """
+    policy = RetryPolicy({'retry_max_delay' : 10})
+    assert policy.delayFor('GET', 429, {'Retry-After' : '3600'}, 0) == (None, None)
+
+def test_success_and_client_errors_are_not_retried():
+    """
+        only throttled and transient gateway failures are retried
+    """
+    policy = RetryPolicy({})
+    for status in [200, 201, 204, 400, 401, 404, 500]:
+        assert policy.delayFor('GET', status, {}, 0) == (None, None)
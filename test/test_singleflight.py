@@ -0,0 +1,90 @@
+
+import sys, os
+import copy
+import time
+import threading
+import pytest
+
+from jirpa.singleflight import SingleFlight
+
+###############################################################################################
+
+def run_concurrently(count, target):
+    results = [None] * count
+    def runner(ix):
+        try:
+            results[ix] = target()
+        except Exception as exc:
+            results[ix] = exc
+    threads = [threading.Thread(target=runner, args=(ix,)) for ix in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_callers_share_one_execution():
+    """
+        callers with the same key arriving while the first is running get its result
+    """
+    flight = SingleFlight()
+    executions = []
+    def slow_fetch():
+        executions.append(1)
+        time.sleep(0.2)
+        return {'answer' : 42}
+
+    results = run_concurrently(8, lambda: flight.do(('issue/JEST-1', ''), slow_fetch))
+    assert len(executions) == 1
+    assert all(result is results[0] for result in results)
+    stats = flight.statistics()
+    assert stats['executed'] == 1
+    assert stats['shared'] == 7
+    assert stats['in_flight'] == 0
+
+def test_different_keys_execute_separately():
+    """
+        calls with different keys are not collapsed
+    """
+    flight = SingleFlight()
+    results = run_concurrently(4, lambda: flight.do(threading.get_ident(), lambda: 'x'))
+    assert results == ['x'] * 4
+    assert flight.statistics()['executed'] == 4
+
+def test_nothing_is_remembered_after_completion():
+    """
+        a call after the previous one has finished executes again
+    """
+    flight = SingleFlight()
+    counter = []
+    flight.do('k', lambda: counter.append(1))
+    flight.do('k', lambda: counter.append(1))
+    assert len(counter) == 2
+
+def test_exception_is_shared_with_waiting_callers():
+    """
+        every caller waiting on a failing call gets the exception
+    """
+    flight = SingleFlight()
+    def failing_fetch():
+        time.sleep(0.2)
+        raise ValueError('no such issue')
+
+    results = run_concurrently(4, lambda: flight.do('k', failing_fetch))
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.statistics()['in_flight'] == 0
+
+def test_waiting_callers_get_their_own_copy_when_shared():
+    """
+        with share=copy.deepcopy a caller modifying its result doesn't affect another's
+    """
+    flight = SingleFlight(share=copy.deepcopy)
+    def slow_fetch():
+        time.sleep(0.2)
+        return {'fields' : {'summary' : 'original'}}
+
+    results = run_concurrently(4, lambda: flight.do('k', slow_fetch))
+    assert flight.statistics()['shared'] == 3
+    assert len({id(result) for result in results}) == 4
+    results[0]['fields']['summary'] = 'modified'
+    assert [result['fields']['summary'] for result in results[1:]] == ['original'] * 3
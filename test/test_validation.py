@@ -0,0 +1,70 @@
+import sys, os
+import pytest
+
+from jirpa.jiraissue    import IssueTypeDescriptor, isAllowableValue
+from jirpa.validation   import WorkItemValidator
+
+from helper_pak import StandInProxy, field
+
+###############################################################################################
+
+STANDARD_FIELDS = {'Summary'    : field('Summary',    {'required' : True,
+                                                       'schema' : {'type' : 'string', 'system' : 'summary'}}),
+                   'Issue Type' : field('Issue Type', {'required' : True,
+                                                       'schema' : {'type' : 'issuetype', 'system' : 'issuetype'}}),
+                   'Priority'   : field('Priority',   {'required' : True, 'hasDefaultValue' : True,
+                                                       'schema' : {'type' : 'priority', 'system' : 'priority'},
+                                                       'allowedValues' : [{'name' : 'High'}, {'name' : 'Low'}]}),
+                   'Due Date'   : field('Due Date',   {'schema' : {'type' : 'date', 'system' : 'duedate'}}),
+                  }
+CUSTOM_FIELDS   = {'Color'        : field('Color', {'schema' : {'type' : 'array', 'customId' : 10020,
+                                                                'custom' : 'com.atlassian.jira.plugin.system.customfieldtypes:multiselect'},
+                                                    'allowedValues' : [{'value' : 'red'}, {'value' : 'blue'}]}),
+                   'Story Points' : field('Story Points', {'required' : True,
+                                                           'schema' : {'type' : 'number', 'customId' : 10010,
+                                                                       'custom' : 'float'}}),
+                  }
+
+def validator():
+    proxy = StandInProxy(STANDARD_FIELDS, CUSTOM_FIELDS)
+    return WorkItemValidator(proxy, 'JEST', 'Story', IssueTypeDescriptor.forIssue(proxy, 'JEST', 'Story'))
+
+###############################################################################################
+
+def test_list_values_are_allowable_when_every_item_is_allowed():
+    allowed = frozenset(['red', 'blue'])
+    assert isAllowableValue(['red', 'blue'], allowed) is True
+    assert isAllowableValue(['red', 'green'], allowed) is False
+    assert isAllowableValue('red, blue', allowed) is True
+    assert isAllowableValue('green', allowed) is False
+
+def test_valid_work_items_have_no_problems():
+    work_items = [{'Summary' : f'Item {ix}', 'Story Points' : ix, 'Color' : 'red,blue',
+                   'Due Date' : '2021-05-01'} for ix in range(50)]
+    report = validator().validate(work_items)
+    assert report.valid
+    assert report.invalidRows() == []
+    assert report.validRows() == list(range(50))
+    assert work_items[0] == {'Summary' : 'Item 0', 'Story Points' : 0, 'Color' : 'red,blue',
+                             'Due Date' : '2021-05-01'}
+
+def test_problems_are_reported_by_row():
+    work_items = [{'Summary' : 'fine', 'Story Points' : 3},
+                  {'Summary' : 'bad priority', 'Story Points' : 3, 'Priority' : 'Urgent'},
+                  {'Summary' : 'bad shapes', 'Story Points' : 'lots', 'Due Date' : '05/01/2021'},
+                  {'Story Points' : 1, 'Flavor' : 'vanilla'},
+                  {'Summary' : 'bad color', 'Story Points' : 2, 'Color' : ['red', 'green']},
+                 ]
+    report = validator().validate(work_items)
+    assert not report.valid
+    assert report.invalidRows() == [1, 2, 3, 4]
+    assert report.validRows() == [0]
+    assert report.errors[1] == ['"Urgent" not an allowed value for the Priority field, '
+                                "the allowed values for priority are ['High', 'Low']"]
+    assert len(report.errors[2]) == 2
+    assert 'Due Date' in report.errors[2][0] and 'Story Points' in report.errors[2][1]
+    assert report.errors[3] == ['Unrecognized field |Flavor|, unable to accurately realize '
+                                'postable data for this field in |create| mode',
+                                'The Summary field is required']
+    assert 'Color' in report.errors[4][0]
+    assert str(report).startswith('4 of 5 work items have problems')